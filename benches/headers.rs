@@ -0,0 +1,46 @@
+// ------------------------------------------------------------------------
+// Gufo HTTP: Header name parsing benchmarks
+// ------------------------------------------------------------------------
+// Copyright (C) 2024-25, Gufo Labs
+// See LICENSE.md for details
+// ------------------------------------------------------------------------
+// Parsing header names against the lookup in the shared cache.
+// Run: cargo bench --bench headers
+use criterion::{Criterion, black_box, criterion_group, criterion_main};
+use reqwest::header::HeaderName;
+use std::{
+    collections::HashMap,
+    sync::{Mutex, PoisonError},
+};
+
+const NAMES: [&str; 4] = ["content-type", "user-agent", "x-request-id", "x-gufo-trace"];
+
+fn parse(c: &mut Criterion) {
+    c.bench_function("header_name_parse", |b| {
+        b.iter(|| {
+            for name in NAMES {
+                black_box(HeaderName::from_bytes(black_box(name).as_bytes()).unwrap());
+            }
+        })
+    });
+}
+
+fn cached(c: &mut Criterion) {
+    let cache: Mutex<HashMap<Box<str>, HeaderName>> = Mutex::new(
+        NAMES
+            .iter()
+            .map(|&n| (n.into(), HeaderName::from_bytes(n.as_bytes()).unwrap()))
+            .collect(),
+    );
+    c.bench_function("header_name_cached", |b| {
+        b.iter(|| {
+            for name in NAMES {
+                let names = cache.lock().unwrap_or_else(PoisonError::into_inner);
+                black_box(names.get(black_box(name)).unwrap().clone());
+            }
+        })
+    });
+}
+
+criterion_group!(benches, parse, cached);
+criterion_main!(benches);
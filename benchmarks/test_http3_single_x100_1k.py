@@ -0,0 +1,85 @@
+# ---------------------------------------------------------------------
+# Gufo HTTP: Benchmarks
+# ---------------------------------------------------------------------
+# Copyright (C) 2024-25, Gufo Labs
+# See LICENSE.md for details
+# ---------------------------------------------------------------------
+
+# Python modules
+import asyncio
+import random
+from typing import Iterable
+
+# Third-party modules
+import pytest
+
+# Gufo HTTP modules
+from gufo.http import HTTP3
+from gufo.http.async_client import HttpClient as AsyncHttpClient
+from gufo.http.httpd import Httpd, HttpdMode
+from gufo.http.sync_client import HttpClient as SyncHttpClient
+
+HTTPD_PATH = "/usr/sbin/nginx"
+HTTPD_HOST = "local.gufolabs.com"
+HTTPD_ADDRESS = "127.0.0.1"
+HTTPD_PORT = random.randint(52000, 53999)
+
+pytestmark = pytest.mark.skipif(not HTTP3, reason="HTTP/3 support is not compiled in")
+
+
+@pytest.fixture(scope="session")
+def httpd() -> Iterable[Httpd]:
+    with Httpd(
+        path=HTTPD_PATH,
+        address=HTTPD_ADDRESS,
+        port=HTTPD_PORT,
+        host=HTTPD_HOST,
+        mode=HttpdMode.HTTP3,
+    ) as httpd:
+        yield httpd
+
+
+def test_gufo_http_sync(httpd: Httpd, benchmark) -> None:
+    url = f"{httpd.prefix}/bench-1k.txt"
+
+    @benchmark
+    def bench():
+        with SyncHttpClient(validate_cert=False) as client:
+            resp = client.get(url)
+            _ = resp.content
+
+
+def test_gufo_http_sync_http3(httpd: Httpd, benchmark) -> None:
+    url = f"{httpd.prefix}/bench-1k.txt"
+
+    @benchmark
+    def bench():
+        with SyncHttpClient(validate_cert=False, http3=True) as client:
+            resp = client.get(url)
+            _ = resp.content
+
+
+def test_gufo_http_async(httpd: Httpd, benchmark) -> None:
+    url = f"{httpd.prefix}/bench-1k.txt"
+
+    @benchmark
+    def bench():
+        async def inner():
+            async with AsyncHttpClient(validate_cert=False) as client:
+                resp = await client.get(url)
+                _ = resp.content
+
+        asyncio.run(inner())
+
+
+def test_gufo_http_async_http3(httpd: Httpd, benchmark) -> None:
+    url = f"{httpd.prefix}/bench-1k.txt"
+
+    @benchmark
+    def bench():
+        async def inner():
+            async with AsyncHttpClient(validate_cert=False, http3=True) as client:
+                resp = await client.get(url)
+                _ = resp.content
+
+        asyncio.run(inner())
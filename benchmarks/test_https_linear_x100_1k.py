@@ -72,6 +72,70 @@ def test_gufo_http_async(httpd: Httpd, benchmark) -> None:
         asyncio.run(inner())
 
 
+def test_gufo_http_sync_reconnect_full(httpd: Httpd, benchmark) -> None:
+    url = f"{httpd.prefix}/bench-1k.txt"
+
+    @benchmark
+    def bench():
+        # New connection and full handshake for each request
+        with SyncHttpClient(
+            validate_cert=False,
+            pool_max_idle_per_host=0,
+            tls_session_cache_size=0,
+        ) as client:
+            for _ in range(REPEATS):
+                resp = client.get(url)
+                _ = resp.content
+
+
+def test_gufo_http_sync_reconnect_resumed(httpd: Httpd, benchmark) -> None:
+    url = f"{httpd.prefix}/bench-1k.txt"
+
+    @benchmark
+    def bench():
+        # New connection for each request, resumed TLS session
+        with SyncHttpClient(validate_cert=False, pool_max_idle_per_host=0) as client:
+            for _ in range(REPEATS):
+                resp = client.get(url)
+                _ = resp.content
+
+
+def test_gufo_http_async_reconnect_full(httpd: Httpd, benchmark) -> None:
+    url = f"{httpd.prefix}/bench-1k.txt"
+
+    @benchmark
+    def bench():
+        async def inner():
+            # New connection and full handshake for each request
+            async with AsyncHttpClient(
+                validate_cert=False,
+                pool_max_idle_per_host=0,
+                tls_session_cache_size=0,
+            ) as client:
+                for _ in range(REPEATS):
+                    resp = await client.get(url)
+                    _ = resp.content
+
+        asyncio.run(inner())
+
+
+def test_gufo_http_async_reconnect_resumed(httpd: Httpd, benchmark) -> None:
+    url = f"{httpd.prefix}/bench-1k.txt"
+
+    @benchmark
+    def bench():
+        async def inner():
+            # New connection for each request, resumed TLS session
+            async with AsyncHttpClient(
+                validate_cert=False, pool_max_idle_per_host=0
+            ) as client:
+                for _ in range(REPEATS):
+                    resp = await client.get(url)
+                    _ = resp.content
+
+        asyncio.run(inner())
+
+
 def test_requests_sync(httpd: Httpd, benchmark) -> None:
     url = f"{httpd.prefix}/bench-1k.txt"
 
@@ -0,0 +1,138 @@
+# ---------------------------------------------------------------------
+# Gufo HTTP: Benchmarks
+# ---------------------------------------------------------------------
+# Copyright (C) 2024-25, Gufo Labs
+# See LICENSE.md for details
+# ---------------------------------------------------------------------
+
+# Python modules
+import asyncio
+import random
+from typing import Iterable
+
+# Third-party modules
+import aiohttp
+import httpx
+import pytest
+
+# Gufo HTTP modules
+from gufo.http import RequestMethod
+from gufo.http.async_client import HttpClient as AsyncHttpClient
+from gufo.http.httpd import Httpd
+
+HTTPD_PATH = "/usr/sbin/nginx"
+HTTPD_HOST = "local.gufolabs.com"
+HTTPD_ADDRESS = "127.0.0.1"
+HTTPD_PORT = random.randint(52000, 53999)
+# 10k requests with at most 100 in flight.
+# Test httpd accepts up to 768 connections,
+# so 10k concurrent requests are not measured.
+REPEATS = 10_000
+CONCURRENCY = 100  # Must divide repeats
+PER_TASK = REPEATS // CONCURRENCY
+
+
+@pytest.fixture(scope="session")
+def httpd() -> Iterable[Httpd]:
+    with Httpd(
+        path=HTTPD_PATH,
+        address=HTTPD_ADDRESS,
+        port=HTTPD_PORT,
+        host=HTTPD_HOST,
+    ) as httpd:
+        yield httpd
+
+
+async def run_async(fn):
+    tasks = [asyncio.create_task(fn()) for _ in range(CONCURRENCY)]
+    await asyncio.gather(*tasks)
+
+
+def test_gufo_http_async(httpd: Httpd, benchmark) -> None:
+    url = f"{httpd.prefix}/bench-1k.txt"
+
+    async def run():
+        async with AsyncHttpClient() as client:
+
+            async def do_request():
+                for _ in range(PER_TASK):
+                    resp = await client.get(url)
+                    _ = resp.content
+
+            await run_async(do_request)
+
+    @benchmark
+    def bench():
+        asyncio.run(run())
+
+
+def test_gufo_http_async_coalesce(httpd: Httpd, benchmark) -> None:
+    url = f"{httpd.prefix}/bench-1k.txt"
+
+    async def run():
+        async with AsyncHttpClient(coalesce=True) as client:
+
+            async def do_request():
+                for _ in range(PER_TASK):
+                    resp = await client.get(url)
+                    _ = resp.content
+
+            await run_async(do_request)
+
+    @benchmark
+    def bench():
+        asyncio.run(run())
+
+
+def test_gufo_http_async_batch(httpd: Httpd, benchmark) -> None:
+    url = f"{httpd.prefix}/bench-1k.txt"
+
+    async def run():
+        async with AsyncHttpClient() as client:
+            for r in await client.batch(
+                [(RequestMethod.GET, url, None, None)] * REPEATS,
+                concurrency=CONCURRENCY,
+            ):
+                _ = r.content
+
+    @benchmark
+    def bench():
+        asyncio.run(run())
+
+
+def test_httpx_async(httpd: Httpd, benchmark) -> None:
+    url = f"{httpd.prefix}/bench-1k.txt"
+
+    async def run():
+        async with httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=CONCURRENCY)
+        ) as client:
+
+            async def do_request():
+                for _ in range(PER_TASK):
+                    resp = await client.get(url)
+                    _ = resp.text
+
+            await run_async(do_request)
+
+    @benchmark
+    def bench():
+        asyncio.run(run())
+
+
+def test_aiohttp_async(httpd: Httpd, benchmark) -> None:
+    url = f"{httpd.prefix}/bench-1k.txt"
+
+    async def run():
+        async with aiohttp.ClientSession() as client:
+
+            async def do_request():
+                for _ in range(PER_TASK):
+                    resp = await client.get(url)
+                    await resp.read()
+
+            await run_async(do_request)
+
+    @benchmark
+    def bench():
+        asyncio.run(run())
@@ -5,93 +5,77 @@
 // See LICENSE.md for details
 // ------------------------------------------------------------------------
 use crate::auth::{AuthMethod, BasicAuth, BearerAuth, GetAuthMethod};
-use crate::error::GufoHttpError;
-use crate::headers::Headers;
-use crate::method::{BROTLI, DEFLATE, GZIP, RequestMethod, ZSTD};
-use crate::proxy::Proxy;
+use crate::batch::{self, AsyncBatch, AsyncBatchIterator};
+use crate::body::{async_body, content_type};
+use crate::dispatch::{Canceller, Dispatcher};
+use crate::error::{GufoHttpError, HttpResult};
+use crate::headers::{Headers, merge_headers, parse_headers};
+use crate::method::RequestMethod;
+use crate::pool::{PoolStats, Tracked};
+use crate::resolver::{Resolver, resolved_into_py};
 use crate::response::Response;
+use crate::stream::AsyncStreamResponse;
+use crate::tls::TlsStats;
+use crate::transport::AsyncTransport;
+use bytes::Bytes;
 use pyo3::{
     exceptions::{PyTypeError, PyValueError},
     prelude::*,
-    types::{PyAny, PyBytes, PyDict, PyList, PyString},
+    types::{PyAny, PyDict, PyString},
 };
 use pyo3_async_runtimes::tokio::future_into_py;
-use reqwest::{
-    header::{HeaderMap, HeaderName, HeaderValue},
-    redirect::Policy,
+use reqwest::header::{CONTENT_TYPE, HeaderMap, HeaderValue, USER_AGENT};
+use std::{
+    path::PathBuf,
+    sync::{Arc, Mutex, PoisonError},
+    time::Duration,
 };
-use std::time::Duration;
+use tokio::{fs::File, io::AsyncWriteExt};
 
 #[pyclass(module = "gufo.http.async_client")]
 pub struct AsyncClient {
+    // Shared with transport
     client: reqwest::Client,
     auth: AuthMethod,
+    stats: Arc<PoolStats>,
+    // Shared with transport
+    resolver: Resolver,
+    // Shared with transport
+    tls_stats: Arc<TlsStats>,
+    // Default headers
+    headers: HeaderMap,
+    // Request timeout
+    timeout: Duration,
+    // Deliver results of requests in coalesced batches
+    coalesce: bool,
+    // Dispatcher of the last used loop
+    dispatcher: Mutex<Option<Py<Dispatcher>>>,
 }
 
 #[pymethods]
 impl AsyncClient {
-    #[allow(clippy::too_many_arguments)]
     #[new]
     fn new(
-        validate_cert: bool,
-        connect_timeout: u64,
+        transport: &Bound<'_, AsyncTransport>,
         timeout: u64,
-        max_redirect: Option<usize>,
         headers: Option<&Bound<'_, PyDict>>,
-        compression: Option<u8>,
         user_agent: Option<&Bound<'_, PyString>>,
         auth: Option<&Bound<'_, PyAny>>,
-        proxy: Option<&Bound<'_, PyList>>,
+        coalesce: bool,
     ) -> PyResult<Self> {
-        let builder = reqwest::Client::builder();
-        // Set up redirect policy
-        let mut builder = builder.redirect(match max_redirect {
-            Some(x) => Policy::limited(x),
-            None => Policy::none(),
-        });
+        let transport = transport.get();
         // Set headers
-        if let Some(h) = headers {
-            let mut map = HeaderMap::with_capacity(h.len());
-            for (k, v) in h {
-                map.insert(
-                    HeaderName::from_bytes(
-                        k.downcast::<PyString>()?.as_borrowed().to_string().as_ref(),
-                    )
-                    .map_err(|e| PyValueError::new_err(e.to_string()))?,
-                    HeaderValue::from_bytes(v.downcast::<PyBytes>()?.as_bytes())
-                        .map_err(|e| PyValueError::new_err(e.to_string()))?,
-                );
-            }
-            builder = builder.default_headers(map);
-        }
-        // Set compression
-        if let Some(c) = compression {
-            if c | DEFLATE == DEFLATE {
-                builder = builder.deflate(true);
-            }
-            if c | GZIP == GZIP {
-                builder = builder.gzip(true);
-            }
-            if c | BROTLI == BROTLI {
-                builder = builder.brotli(true);
-            }
-            if c | ZSTD == ZSTD {
-                builder = builder.zstd(true);
-            }
-        }
-        // Set up certificate validation
-        if !validate_cert {
-            builder = builder.danger_accept_invalid_certs(true);
-        }
-        // Set timeouts
-        builder = builder
-            .connect_timeout(Duration::from_nanos(connect_timeout))
-            .timeout(Duration::from_nanos(timeout));
-        // Disable proxies
-        builder = builder.no_proxy();
+        let mut map = match headers {
+            Some(h) => parse_headers(h)?,
+            None => HeaderMap::new(),
+        };
         // Set user agent
         if let Some(ua) = user_agent {
-            builder = builder.user_agent(ua.as_borrowed().to_string());
+            map.insert(
+                USER_AGENT,
+                HeaderValue::from_str(ua.to_str()?)
+                    .map_err(|e| PyValueError::new_err(e.to_string()))?,
+            );
         }
         // Auth
         let auth = match auth {
@@ -108,48 +92,232 @@ impl AsyncClient {
             }
             None => AuthMethod::None,
         };
-        // Proxy
-        if let Some(proxy) = proxy {
-            for p in proxy {
-                match p.extract::<Proxy>() {
-                    Ok(p) => {
-                        builder = builder.proxy(p.into());
-                    }
-                    Err(_) => {
-                        return Err(PyTypeError::new_err("proxy must contain Proxy instances"));
-                    }
-                }
+        Ok(AsyncClient {
+            client: transport.client.clone(),
+            auth,
+            stats: transport.stats.clone(),
+            resolver: transport.resolver.clone(),
+            tls_stats: transport.tls_stats.clone(),
+            headers: map,
+            timeout: Duration::from_nanos(timeout),
+            coalesce,
+            dispatcher: Mutex::new(None),
+        })
+    }
+    fn pool_stats<'a>(&self, py: Python<'a>) -> PyResult<Bound<'a, PyDict>> {
+        self.stats.to_dict(py)
+    }
+    fn tls_stats<'a>(&self, py: Python<'a>) -> PyResult<Bound<'a, PyDict>> {
+        self.tls_stats.to_dict(py)
+    }
+    fn dns_stats<'a>(&self, py: Python<'a>) -> PyResult<Bound<'a, PyDict>> {
+        self.resolver.stats_to_dict(py)
+    }
+    fn resolve_many<'a>(&self, py: Python<'a>, hosts: Vec<String>) -> PyResult<Bound<'a, PyAny>> {
+        self.resolver.check_cache()?;
+        let resolver = self.resolver.clone();
+        // Create future
+        future_into_py(py, async move {
+            let resolved = resolver.lookup_many(hosts).await;
+            Python::attach(|py| resolved_into_py(py, resolved))
+        })
+    }
+    fn request<'a>(
+        &self,
+        py: Python<'a>,
+        method: &RequestMethod,
+        url: &str,
+        headers: Option<&Bound<'a, PyAny>>,
+        body: Option<&Bound<'a, PyAny>>,
+        timeout: Option<u64>,
+        parse_json: bool,
+    ) -> PyResult<Bound<'a, PyAny>> {
+        let req = self.build_request(method, url, headers, body, timeout)?;
+        let stats = self.stats.clone();
+        let task = async move {
+            let resp = fetch(req, stats).await?;
+            if !parse_json {
+                return Ok(resp);
             }
+            // Parsing is CPU-bound, keep the reactor running
+            tokio::task::spawn_blocking(move || resp.with_json())
+                .await
+                .map_err(|e| GufoHttpError::Request(e.to_string()))
+        };
+        if self.coalesce {
+            return self.coalesced(py, task);
         }
-        // Build client
-        let client = builder
-            .build()
-            .map_err(|x| PyValueError::new_err(x.to_string()))?;
-        Ok(AsyncClient { client, auth })
+        // Create future.
+        // Cancelling the future drops the request and closes the connection.
+        future_into_py(py, async move { Ok(task.await?) })
     }
-    fn request<'a>(
+    fn batch<'a>(
+        &self,
+        py: Python<'a>,
+        requests: &Bound<'a, PyAny>,
+        concurrency: usize,
+    ) -> PyResult<Bound<'a, PyAny>> {
+        let reqs = batch::prepare(requests, concurrency, |item| {
+            self.build_request(
+                &item.method,
+                &item.url,
+                item.headers.as_ref(),
+                item.body.as_ref(),
+                None,
+            )
+        })?;
+        let mut results = Vec::with_capacity(reqs.len());
+        results.resize_with(reqs.len(), || None);
+        let mut batch = AsyncBatch::new(reqs, concurrency, self.stats.clone());
+        // Create future
+        future_into_py(py, async move {
+            while let Some((idx, r)) = batch.next().await? {
+                results[idx] = Some(r);
+            }
+            Python::attach(|py| batch::collect(py, results))
+        })
+    }
+    fn as_completed(
+        &self,
+        requests: &Bound<'_, PyAny>,
+        concurrency: usize,
+    ) -> PyResult<AsyncBatchIterator> {
+        let reqs = batch::prepare(requests, concurrency, |item| {
+            self.build_request(
+                &item.method,
+                &item.url,
+                item.headers.as_ref(),
+                item.body.as_ref(),
+                None,
+            )
+        })?;
+        // Requests are started on first iteration
+        Ok(AsyncBatchIterator::new(AsyncBatch::new(
+            reqs,
+            concurrency,
+            self.stats.clone(),
+        )))
+    }
+    #[allow(clippy::too_many_arguments)]
+    fn download<'a>(
         &self,
         py: Python<'a>,
         method: &RequestMethod,
         url: &str,
-        headers: Option<&Bound<'a, PyDict>>,
-        body: Option<&Bound<'a, PyBytes>>,
+        path: PathBuf,
+        headers: Option<&Bound<'a, PyAny>>,
+        body: Option<&Bound<'a, PyAny>>,
+        timeout: Option<u64>,
     ) -> PyResult<Bound<'a, PyAny>> {
-        // Build request for method
-        let mut req = self.client.request((*method).into(), url);
-        // Add headers, under GIL
-        if let Some(h) = headers {
-            for (k, v) in h {
-                req = req.header(
-                    HeaderName::from_bytes(
-                        k.downcast::<PyString>()?.as_borrowed().to_string().as_ref(),
-                    )
-                    .map_err(|e| GufoHttpError::ValueError(e.to_string()))?,
-                    HeaderValue::from_bytes(v.downcast::<PyBytes>()?.as_bytes())
-                        .map_err(|e| GufoHttpError::ValueError(e.to_string()))?,
-                )
+        let req = self.build_request(method, url, headers, body, timeout)?;
+        let stats = self.stats.clone();
+        // Create future
+        future_into_py(py, async move {
+            // Send request and wait for response
+            let mut resp = send(req, &stats).await?;
+            // Get status
+            let status: u16 = resp.status().into();
+            // Wrap headers
+            let headers = Headers::new(resp.headers().clone());
+            // Write body to file, chunk by chunk
+            let mut file = File::create(&path).await.map_err(GufoHttpError::Io)?;
+            while let Some(chunk) = resp.chunk().await.map_err(GufoHttpError::from)? {
+                file.write_all(chunk.as_ref())
+                    .await
+                    .map_err(GufoHttpError::Io)?;
+            }
+            // Wait for pending writes
+            file.flush().await.map_err(GufoHttpError::Io)?;
+            // Return response without body
+            Ok(Response::new(status, headers, Bytes::new()))
+        })
+    }
+    fn stream<'a>(
+        &self,
+        py: Python<'a>,
+        method: &RequestMethod,
+        url: &str,
+        headers: Option<&Bound<'a, PyAny>>,
+        body: Option<&Bound<'a, PyAny>>,
+        timeout: Option<u64>,
+    ) -> PyResult<Bound<'a, PyAny>> {
+        let req = self.build_request(method, url, headers, body, timeout)?;
+        let stats = self.stats.clone();
+        // Create future
+        future_into_py(py, async move {
+            // Send request and wait for response headers,
+            // body will be read on demand
+            let resp = send(req, &stats).await?;
+            Ok(AsyncStreamResponse::new(resp))
+        })
+    }
+}
+
+impl AsyncClient {
+    // Spawn request on tokio runtime and return the future of current loop.
+    // The result is passed to the future via the loop's dispatcher.
+    fn coalesced<'a>(
+        &self,
+        py: Python<'a>,
+        task: impl Future<Output = HttpResult<Response>> + Send + 'static,
+    ) -> PyResult<Bound<'a, PyAny>> {
+        let dispatcher = self.dispatcher(py)?;
+        let fut = dispatcher.get().create_future(py)?;
+        let waiter = fut.clone().unbind();
+        let handle = pyo3_async_runtimes::tokio::get_runtime().spawn(async move {
+            let r = task.await.map_err(PyErr::from);
+            Dispatcher::complete(&dispatcher, waiter, r);
+        });
+        // Abort request when the future is cancelled
+        fut.call_method1(
+            "add_done_callback",
+            (Canceller::new(handle.abort_handle()),),
+        )?;
+        Ok(fut)
+    }
+    // Get dispatcher for the running loop
+    fn dispatcher(&self, py: Python<'_>) -> PyResult<Py<Dispatcher>> {
+        let event_loop = pyo3_async_runtimes::get_running_loop(py)?;
+        let mut current = self
+            .dispatcher
+            .lock()
+            .unwrap_or_else(PoisonError::into_inner);
+        if let Some(d) = current.as_ref() {
+            if d.get().is_bound(&event_loop) {
+                return Ok(d.clone_ref(py));
             }
         }
+        let d = Py::new(py, Dispatcher::new(event_loop))?;
+        *current = Some(d.clone_ref(py));
+        Ok(d)
+    }
+    // Prepare request, under GIL
+    fn build_request<'a>(
+        &self,
+        method: &RequestMethod,
+        url: &str,
+        headers: Option<&Bound<'a, PyAny>>,
+        body: Option<&Bound<'a, PyAny>>,
+        timeout: Option<u64>,
+    ) -> PyResult<reqwest::RequestBuilder> {
+        // Build request for method.
+        // Request timeout overrides the client's one.
+        let mut req = self
+            .client
+            .request((*method).into(), url)
+            .timeout(timeout.map(Duration::from_nanos).unwrap_or(self.timeout));
+        // Set body's content type, explicit headers override it
+        if let Some(ct) = body.and_then(content_type) {
+            req = req.header(CONTENT_TYPE, ct);
+        }
+        // Add headers, request headers override default ones
+        if let Some(h) = headers {
+            let mut map = self.headers.clone();
+            merge_headers(&mut map, h)?;
+            req = req.headers(map);
+        } else if !self.headers.is_empty() {
+            req = req.headers(self.headers.clone());
+        }
         // Add auth
         match &self.auth {
             AuthMethod::None => {}
@@ -158,27 +326,41 @@ impl AsyncClient {
         }
         // Add body
         if let Some(b) = body {
-            // Zero-copy mapping
-            // body will always outlive our function
-            let bytes: &'static [u8] = unsafe { std::mem::transmute(b.as_bytes()) };
-            req = req.body(bytes);
+            req = req.body(async_body(b)?);
         }
-        // Create future
-        future_into_py(py, async move {
-            // Send request and wait for response
-            let resp = req.send().await.map_err(GufoHttpError::from)?;
-            // Get status
-            let status: u16 = resp.status().into();
-            // Wrap headers
-            let headers = Headers::new(resp.headers().clone());
-            // Read body
-            let buf = resp.bytes().await.map_err(GufoHttpError::from)?;
-            // Return response
-            Ok(Response::new(
-                status,
-                headers,
-                Python::attach(|py| PyBytes::new(py, buf.as_ref()).into()),
-            ))
-        })
+        Ok(req)
     }
 }
+
+// Send request and wait for response headers.
+// The request is in progress until the response is dropped.
+async fn send(
+    req: reqwest::RequestBuilder,
+    stats: &Arc<PoolStats>,
+) -> HttpResult<Tracked<reqwest::Response>> {
+    let (client, req) = req.build_split();
+    let req = req?;
+    let in_use = stats.acquire(req.url());
+    let resp = client.execute(req).await?;
+    Ok(Tracked {
+        inner: resp,
+        in_use,
+    })
+}
+
+// Send request and read the whole response.
+pub async fn fetch(req: reqwest::RequestBuilder, stats: Arc<PoolStats>) -> HttpResult<Response> {
+    // Send request and wait for response
+    let Tracked {
+        inner: resp,
+        in_use: _in_use,
+    } = send(req, &stats).await?;
+    // Get status
+    let status: u16 = resp.status().into();
+    // Wrap headers
+    let headers = Headers::new(resp.headers().clone());
+    // Read body
+    let buf = resp.bytes().await?;
+    // Return response
+    Ok(Response::new(status, headers, buf))
+}
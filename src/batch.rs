@@ -0,0 +1,360 @@
+// ------------------------------------------------------------------------
+// Gufo HTTP: Batch requests
+// ------------------------------------------------------------------------
+// Copyright (C) 2024-25, Gufo Labs
+// See LICENSE.md for details
+// ------------------------------------------------------------------------
+use crate::error::GufoHttpError;
+use crate::method::RequestMethod;
+use crate::pool::PoolStats;
+use crate::response::Response;
+use crate::{async_client, sync_client};
+use pyo3::{
+    exceptions::{PyRuntimeError, PyStopAsyncIteration, PyTypeError, PyValueError},
+    prelude::*,
+    types::{PyList, PyTuple},
+};
+use pyo3_async_runtimes::tokio::future_into_py;
+use std::{
+    io,
+    sync::{
+        Arc, Mutex, OnceLock, PoisonError,
+        atomic::{AtomicBool, AtomicUsize, Ordering},
+        mpsc,
+    },
+};
+use tokio::task::JoinSet;
+
+// Result of the single request: index in batch and response or error
+pub type BatchResult = (usize, PyResult<Response>);
+
+// Single request of the batch: (method, url, headers, body)
+// headers and body may be None.
+pub struct BatchItem<'py> {
+    pub method: RequestMethod,
+    pub url: String,
+    pub headers: Option<Bound<'py, PyAny>>,
+    pub body: Option<Bound<'py, PyAny>>,
+}
+
+impl<'py> BatchItem<'py> {
+    fn parse(item: &Bound<'py, PyAny>) -> PyResult<Self> {
+        let item = match item.downcast::<PyTuple>() {
+            Ok(t) if t.len() == 4 => t,
+            _ => {
+                return Err(PyTypeError::new_err(
+                    "batch item must be a tuple of (method, url, headers, body)",
+                ));
+            }
+        };
+        let headers = item.get_item(2)?;
+        let body = item.get_item(3)?;
+        Ok(BatchItem {
+            method: item.get_item(0)?.extract()?,
+            url: item.get_item(1)?.extract()?,
+            headers: if headers.is_none() {
+                None
+            } else {
+                Some(headers)
+            },
+            body: if body.is_none() { None } else { Some(body) },
+        })
+    }
+}
+
+// Prepare requests, under GIL.
+// Malformed items raise an error immediately,
+// while the errors of building requests are reported per item.
+pub fn prepare<'py, R>(
+    requests: &Bound<'py, PyAny>,
+    concurrency: usize,
+    mut build: impl FnMut(BatchItem<'py>) -> PyResult<R>,
+) -> PyResult<Vec<PyResult<R>>> {
+    if concurrency == 0 {
+        return Err(PyValueError::new_err("concurrency must be positive"));
+    }
+    requests
+        .try_iter()?
+        .map(|item| Ok(build(BatchItem::parse(&item?)?)))
+        .collect()
+}
+
+// Convert results into the list of responses and exceptions,
+// ordered as requests.
+pub fn collect(py: Python<'_>, results: Vec<Option<PyResult<Response>>>) -> PyResult<Py<PyList>> {
+    let items = results
+        .into_iter()
+        .map(|r| match r {
+            Some(r) => result_into_py(py, r),
+            None => Err(PyRuntimeError::new_err("missed batch result")),
+        })
+        .collect::<PyResult<Vec<_>>>()?;
+    Ok(PyList::new(py, items)?.unbind())
+}
+
+// Convert result into Response or exception instance.
+pub fn result_into_py(py: Python<'_>, r: PyResult<Response>) -> PyResult<Py<PyAny>> {
+    Ok(match r {
+        Ok(resp) => Py::new(py, resp)?.into_any(),
+        Err(e) => e.into_value(py).into_any(),
+    })
+}
+
+// Batch of requests for asynchronous client.
+// Requests are spawned on the tokio runtime,
+// no more than `concurrency` at a time.
+// Dropping the batch aborts running requests.
+pub struct AsyncBatch {
+    // Requests not started yet
+    pending: std::vec::IntoIter<(usize, PyResult<reqwest::RequestBuilder>)>,
+    running: JoinSet<BatchResult>,
+    concurrency: usize,
+    stats: Arc<PoolStats>,
+}
+
+impl AsyncBatch {
+    pub fn new(
+        requests: Vec<PyResult<reqwest::RequestBuilder>>,
+        concurrency: usize,
+        stats: Arc<PoolStats>,
+    ) -> Self {
+        AsyncBatch {
+            pending: requests
+                .into_iter()
+                .enumerate()
+                .collect::<Vec<_>>()
+                .into_iter(),
+            running: JoinSet::new(),
+            concurrency,
+            stats,
+        }
+    }
+    // Wait for the next completed request.
+    // Returns None when all requests are completed.
+    // Must be called within tokio runtime.
+    pub async fn next(&mut self) -> PyResult<Option<BatchResult>> {
+        // Start pending requests
+        while self.running.len() < self.concurrency {
+            match self.pending.next() {
+                Some((idx, Ok(req))) => {
+                    let stats = self.stats.clone();
+                    self.running.spawn(async move {
+                        let r = async_client::fetch(req, stats).await;
+                        (idx, r.map_err(PyErr::from))
+                    });
+                }
+                // Failed to build request, report immediately
+                Some((idx, Err(e))) => return Ok(Some((idx, Err(e)))),
+                None => break,
+            }
+        }
+        match self.running.join_next().await {
+            Some(Ok(r)) => Ok(Some(r)),
+            Some(Err(e)) => Err(PyRuntimeError::new_err(e.to_string())),
+            None => Ok(None),
+        }
+    }
+}
+
+// Asynchronous iterator over the batch results,
+// yields (index, response or exception) in order of completion.
+#[pyclass]
+pub struct AsyncBatchIterator(Arc<tokio::sync::Mutex<AsyncBatch>>);
+
+impl AsyncBatchIterator {
+    pub fn new(batch: AsyncBatch) -> Self {
+        AsyncBatchIterator(Arc::new(tokio::sync::Mutex::new(batch)))
+    }
+}
+
+#[pymethods]
+impl AsyncBatchIterator {
+    fn __aiter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
+        slf
+    }
+    fn __anext__<'a>(&self, py: Python<'a>) -> PyResult<Bound<'a, PyAny>> {
+        let batch = self.0.clone();
+        future_into_py(py, async move {
+            match batch.lock().await.next().await? {
+                Some((idx, r)) => Python::attach(|py| Ok((idx, result_into_py(py, r)?))),
+                None => Err(PyStopAsyncIteration::new_err(())),
+            }
+        })
+    }
+}
+
+// Maximal number of batch worker threads per process
+const MAX_WORKERS: usize = 256;
+
+type Job = Box<dyn FnOnce() + Send + 'static>;
+
+// Worker threads, shared by all batches of blocking client.
+// Threads are started on demand, up to MAX_WORKERS,
+// and wait for the next job when idle.
+struct WorkerPool {
+    tx: Mutex<mpsc::Sender<Job>>,
+    rx: Mutex<mpsc::Receiver<Job>>,
+    // Started threads
+    threads: AtomicUsize,
+    // Threads waiting for the job, not claimed by submitted ones
+    idle: AtomicUsize,
+}
+
+fn workers() -> &'static WorkerPool {
+    static WORKERS: OnceLock<WorkerPool> = OnceLock::new();
+    WORKERS.get_or_init(|| {
+        let (tx, rx) = mpsc::channel();
+        WorkerPool {
+            tx: Mutex::new(tx),
+            rx: Mutex::new(rx),
+            threads: AtomicUsize::new(0),
+            idle: AtomicUsize::new(0),
+        }
+    })
+}
+
+impl WorkerPool {
+    // Run job on idle thread, or on the new one.
+    // Jobs are queued when all MAX_WORKERS threads are busy.
+    fn submit(&'static self, job: Job) -> io::Result<()> {
+        let claimed = self
+            .idle
+            .fetch_update(Ordering::AcqRel, Ordering::Acquire, |n| n.checked_sub(1))
+            .is_ok();
+        if !claimed
+            && self
+                .threads
+                .fetch_update(Ordering::AcqRel, Ordering::Acquire, |n| {
+                    (n < MAX_WORKERS).then_some(n + 1)
+                })
+                .is_ok()
+        {
+            let r = std::thread::Builder::new()
+                .name("gufo-http-batch".into())
+                .spawn(move || self.run());
+            if let Err(e) = r {
+                self.threads.fetch_sub(1, Ordering::AcqRel);
+                return Err(e);
+            }
+        }
+        let _ = self
+            .tx
+            .lock()
+            .unwrap_or_else(PoisonError::into_inner)
+            .send(job);
+        Ok(())
+    }
+    // Thread loop, runs until the process exit
+    fn run(&self) {
+        loop {
+            let job = self
+                .rx
+                .lock()
+                .unwrap_or_else(PoisonError::into_inner)
+                .recv();
+            let Ok(job) = job else {
+                break;
+            };
+            job();
+            self.idle.fetch_add(1, Ordering::AcqRel);
+        }
+    }
+}
+
+// Batch of requests for blocking client.
+// Requests are processed by no more than `concurrency`
+// shared worker threads, results are delivered
+// via the channel as soon as completed.
+// Dropping the batch stops workers from taking new requests.
+pub struct SyncBatch {
+    results: mpsc::Receiver<BatchResult>,
+    cancelled: Arc<AtomicBool>,
+}
+
+type SyncQueue = Arc<Mutex<std::vec::IntoIter<(usize, reqwest::blocking::RequestBuilder)>>>;
+
+impl SyncBatch {
+    pub fn new(
+        requests: Vec<PyResult<reqwest::blocking::RequestBuilder>>,
+        concurrency: usize,
+        stats: Arc<PoolStats>,
+    ) -> PyResult<Self> {
+        let (tx, rx) = mpsc::channel();
+        let mut queue = Vec::with_capacity(requests.len());
+        for (idx, req) in requests.into_iter().enumerate() {
+            match req {
+                Ok(req) => queue.push((idx, req)),
+                // Failed to build request, report immediately
+                Err(e) => {
+                    let _ = tx.send((idx, Err(e)));
+                }
+            }
+        }
+        let workers = concurrency.min(queue.len()).min(MAX_WORKERS);
+        let queue: SyncQueue = Arc::new(Mutex::new(queue.into_iter()));
+        let cancelled = Arc::new(AtomicBool::new(false));
+        for _ in 0..workers {
+            let queue = queue.clone();
+            let tx = tx.clone();
+            let cancelled = cancelled.clone();
+            let stats = stats.clone();
+            workers()
+                .submit(Box::new(move || {
+                    while !cancelled.load(Ordering::Relaxed) {
+                        let job = queue.lock().unwrap_or_else(PoisonError::into_inner).next();
+                        let Some((idx, req)) = job else {
+                            break;
+                        };
+                        let r = sync_client::fetch(req, &stats).map_err(PyErr::from);
+                        if tx.send((idx, r)).is_err() {
+                            // Batch is dropped
+                            break;
+                        }
+                    }
+                }))
+                .map_err(GufoHttpError::Io)?;
+        }
+        Ok(SyncBatch {
+            results: rx,
+            cancelled,
+        })
+    }
+    // Wait for the next completed request.
+    // Returns None when all requests are completed.
+    // Blocks, must be called with GIL released.
+    pub fn next(&self) -> Option<BatchResult> {
+        self.results.recv().ok()
+    }
+}
+
+impl Drop for SyncBatch {
+    fn drop(&mut self) {
+        self.cancelled.store(true, Ordering::Relaxed);
+    }
+}
+
+// Iterator over the batch results,
+// yields (index, response or exception) in order of completion.
+#[pyclass]
+pub struct SyncBatchIterator(Mutex<SyncBatch>);
+
+impl SyncBatchIterator {
+    pub fn new(batch: SyncBatch) -> Self {
+        SyncBatchIterator(Mutex::new(batch))
+    }
+}
+
+#[pymethods]
+impl SyncBatchIterator {
+    fn __iter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
+        slf
+    }
+    fn __next__(&self, py: Python<'_>) -> PyResult<Option<(usize, Py<PyAny>)>> {
+        // Release GIL, wait for the next completed request
+        let r = py.detach(|| self.0.lock().unwrap_or_else(PoisonError::into_inner).next());
+        match r {
+            Some((idx, r)) => Ok(Some((idx, result_into_py(py, r)?))),
+            None => Ok(None),
+        }
+    }
+}
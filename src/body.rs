@@ -0,0 +1,265 @@
+// ------------------------------------------------------------------------
+// Gufo HTTP: Request body
+// ------------------------------------------------------------------------
+// Copyright (C) 2024-25, Gufo Labs
+// See LICENSE.md for details
+// ------------------------------------------------------------------------
+use crate::error::GufoHttpError;
+use crate::json::JsonBody;
+use crate::stream::DEFAULT_CHUNK_SIZE;
+use bytes::{Buf, Bytes};
+use futures_util::stream::{self, Stream};
+use memmap2::Mmap;
+use pyo3::{
+    exceptions::{PyRuntimeError, PyStopAsyncIteration, PyTypeError},
+    prelude::*,
+    pybacked::PyBackedBytes,
+    types::{PyBytes, PyIterator, PyString},
+};
+use pyo3_async_runtimes::{TaskLocals, into_future_with_locals, tokio::get_current_locals};
+use reqwest::header::HeaderValue;
+use std::{
+    fs::File,
+    io::{self, Read},
+    path::{Path, PathBuf},
+};
+
+// Source of the request body
+enum BodySource {
+    // Zero-copy bytes, holding the reference to Python object
+    Bytes(Bytes),
+    // Serialized JSON
+    Json(Bytes),
+    // File path
+    Path(PathBuf),
+    // Binary file-like object with `read()`
+    File(Py<PyAny>),
+    // Iterator of bytes
+    Iter(Py<PyIterator>),
+    // Asynchronous iterator of bytes
+    AsyncIter(Py<PyAny>),
+}
+
+impl BodySource {
+    fn new(body: &Bound<'_, PyAny>, allow_async: bool) -> PyResult<Self> {
+        if let Ok(b) = body.downcast::<PyBytes>() {
+            // Zero-copy, the request owns the reference,
+            // so the body may be released by the caller
+            // while the request is in progress.
+            let owner = PyBackedBytes::from(b.clone());
+            return Ok(BodySource::Bytes(Bytes::from_owner(owner)));
+        }
+        if let Ok(j) = body.downcast::<JsonBody>() {
+            return Ok(BodySource::Json(j.get().bytes()));
+        }
+        // str is iterable, but has no sense as body
+        if !body.is_instance_of::<PyString>() {
+            if body.hasattr("__fspath__")? {
+                return Ok(BodySource::Path(body.extract()?));
+            }
+            if body.hasattr("read")? {
+                return Ok(BodySource::File(body.clone().unbind()));
+            }
+            if allow_async && body.hasattr("__aiter__")? {
+                return Ok(BodySource::AsyncIter(
+                    body.call_method0("__aiter__")?.unbind(),
+                ));
+            }
+            if let Ok(iter) = body.try_iter() {
+                return Ok(BodySource::Iter(iter.unbind()));
+            }
+        }
+        Err(PyTypeError::new_err(
+            "body must be bytes, JsonBody, path, file object or iterable of bytes",
+        ))
+    }
+}
+
+// Convert Python object into the body for asynchronous client.
+pub fn async_body(body: &Bound<'_, PyAny>) -> PyResult<reqwest::Body> {
+    Ok(match BodySource::new(body, true)? {
+        BodySource::Bytes(b) => b.into(),
+        BodySource::Json(b) => b.into(),
+        BodySource::Path(path) => match open_file(&path)? {
+            FileBody::Mapped(b) => b.into(),
+            FileBody::Stream(file) => tokio::fs::File::from_std(file).into(),
+        },
+        BodySource::File(src) => reqwest::Body::wrap_stream(sync_stream(ChunkSource::File(src))),
+        BodySource::Iter(src) => reqwest::Body::wrap_stream(sync_stream(ChunkSource::Iter(src))),
+        BodySource::AsyncIter(src) => {
+            reqwest::Body::wrap_stream(async_stream(src, get_current_locals(body.py())?))
+        }
+    })
+}
+
+// Convert Python object into the body for blocking client.
+pub fn sync_body(body: &Bound<'_, PyAny>) -> PyResult<reqwest::blocking::Body> {
+    Ok(match BodySource::new(body, false)? {
+        BodySource::Bytes(b) => b.into(),
+        BodySource::Json(b) => b.into(),
+        BodySource::Path(path) => match open_file(&path)? {
+            FileBody::Mapped(b) => b.into(),
+            // From<File> takes Content-Length from metadata,
+            // which is 0 for special files, so send it chunked.
+            FileBody::Stream(file) => reqwest::blocking::Body::new(file),
+        },
+        BodySource::File(src) => {
+            reqwest::blocking::Body::new(PyReader::new(ChunkSource::File(src)))
+        }
+        BodySource::Iter(src) => {
+            reqwest::blocking::Body::new(PyReader::new(ChunkSource::Iter(src)))
+        }
+        BodySource::AsyncIter(_) => unreachable!(),
+    })
+}
+
+// Content type implied by the body, if any
+pub fn content_type(body: &Bound<'_, PyAny>) -> Option<HeaderValue> {
+    body.is_instance_of::<JsonBody>()
+        .then(|| HeaderValue::from_static("application/json"))
+}
+
+// File passed by path
+enum FileBody {
+    // Regular file, memory-mapped
+    Mapped(Bytes),
+    // Pipe, device or other special file, read as stream
+    Stream(File),
+}
+
+// Open file passed by path.
+// Regular files are mapped into memory.
+// The mapping is owned by Bytes and unmapped when the request is sent,
+// so the file content is passed to the socket without copying
+// and with known Content-Length.
+// The file must not be truncated while the request is in progress.
+// Special files have no meaningful size, so they are streamed.
+fn open_file(path: &Path) -> PyResult<FileBody> {
+    let file = File::open(path).map_err(GufoHttpError::Io)?;
+    let meta = file.metadata().map_err(GufoHttpError::Io)?;
+    if !meta.is_file() {
+        return Ok(FileBody::Stream(file));
+    }
+    if meta.len() == 0 {
+        // Empty mappings are not allowed
+        return Ok(FileBody::Mapped(Bytes::new()));
+    }
+    let mmap = unsafe { Mmap::map(&file) }.map_err(GufoHttpError::Io)?;
+    Ok(FileBody::Mapped(Bytes::from_owner(mmap)))
+}
+
+// Synchronous source of the body chunks.
+enum ChunkSource {
+    File(Py<PyAny>),
+    Iter(Py<PyIterator>),
+}
+
+impl ChunkSource {
+    // Get next chunk, under GIL.
+    // Returns None on the end of data.
+    fn next_chunk(&self, py: Python<'_>) -> PyResult<Option<Bytes>> {
+        let chunk = match self {
+            ChunkSource::File(src) => {
+                let chunk = src.bind(py).call_method1("read", (DEFAULT_CHUNK_SIZE,))?;
+                if chunk.is_empty()? {
+                    return Ok(None);
+                }
+                chunk
+            }
+            ChunkSource::Iter(src) => match src.bind(py).clone().next() {
+                Some(chunk) => chunk?,
+                None => return Ok(None),
+            },
+        };
+        to_bytes(&chunk).map(Some)
+    }
+}
+
+fn to_bytes(chunk: &Bound<'_, PyAny>) -> PyResult<Bytes> {
+    match chunk.downcast::<PyBytes>() {
+        Ok(b) => Ok(Bytes::copy_from_slice(b.as_bytes())),
+        Err(_) => Err(PyTypeError::new_err("body chunk must be bytes")),
+    }
+}
+
+// Stream of chunks from synchronous source.
+// Python code may block, so it is called
+// on the blocking pool to keep the reactor running.
+fn sync_stream(src: ChunkSource) -> impl Stream<Item = PyResult<Bytes>> + Send + 'static {
+    stream::try_unfold(src, |src| async move {
+        let (src, chunk) = tokio::task::spawn_blocking(move || {
+            let chunk = Python::attach(|py| src.next_chunk(py));
+            (src, chunk)
+        })
+        .await
+        .map_err(|e| PyRuntimeError::new_err(e.to_string()))?;
+        Ok(chunk?.map(|chunk| (chunk, src)))
+    })
+}
+
+// Stream of chunks from Python's asynchronous iterator.
+// Awaitables are scheduled on the caller's event loop.
+fn async_stream(
+    src: Py<PyAny>,
+    locals: TaskLocals,
+) -> impl Stream<Item = PyResult<Bytes>> + Send + 'static {
+    stream::try_unfold(src, move |src| {
+        let locals = locals.clone();
+        async move {
+            let fut = Python::attach(|py| {
+                into_future_with_locals(&locals, src.bind(py).call_method0("__anext__")?)
+            })?;
+            match fut.await {
+                Ok(chunk) => {
+                    let chunk = Python::attach(|py| to_bytes(chunk.bind(py)))?;
+                    Ok(Some((chunk, src)))
+                }
+                Err(e) if Python::attach(|py| e.is_instance_of::<PyStopAsyncIteration>(py)) => {
+                    Ok(None)
+                }
+                Err(e) => Err(e),
+            }
+        }
+    })
+}
+
+// std::io::Read adapter for blocking client.
+// Read is called from the requesting thread with GIL released,
+// so GIL is acquired for every chunk.
+struct PyReader {
+    src: ChunkSource,
+    pending: Bytes,
+    done: bool,
+}
+
+impl PyReader {
+    fn new(src: ChunkSource) -> Self {
+        PyReader {
+            src,
+            pending: Bytes::new(),
+            done: false,
+        }
+    }
+}
+
+impl Read for PyReader {
+    fn read(&mut self, buf: &mut [u8]) -> io::Result<usize> {
+        while self.pending.is_empty() {
+            if self.done {
+                return Ok(0);
+            }
+            match Python::attach(|py| self.src.next_chunk(py)) {
+                Ok(Some(chunk)) => self.pending = chunk,
+                Ok(None) => self.done = true,
+                Err(e) => {
+                    self.done = true;
+                    return Err(io::Error::other(e));
+                }
+            }
+        }
+        let n = buf.len().min(self.pending.len());
+        buf[..n].copy_from_slice(&self.pending[..n]);
+        self.pending.advance(n);
+        Ok(n)
+    }
+}
@@ -0,0 +1,117 @@
+// ------------------------------------------------------------------------
+// Gufo HTTP: Coalesced delivery of results to asyncio loop
+// ------------------------------------------------------------------------
+// Copyright (C) 2024-25, Gufo Labs
+// See LICENSE.md for details
+// ------------------------------------------------------------------------
+use crate::response::Response;
+use pyo3::{intern, prelude::*};
+use std::sync::{Mutex, MutexGuard, PoisonError};
+use tokio::task::AbortHandle;
+
+type Completed = (Py<PyAny>, PyResult<Response>);
+
+// Delivers results of requests to asyncio futures of the loop.
+// Results completed before the loop gets to the delivery
+// are delivered by the single callback, so the loop
+// is woken up once per bunch of requests instead of once per request.
+#[pyclass(module = "gufo.http.async_client", frozen)]
+pub struct Dispatcher {
+    event_loop: Py<PyAny>,
+    completed: Mutex<Vec<Completed>>,
+}
+
+impl Dispatcher {
+    pub fn new(event_loop: Bound<'_, PyAny>) -> Self {
+        Dispatcher {
+            event_loop: event_loop.unbind(),
+            completed: Mutex::new(Vec::new()),
+        }
+    }
+    // Check if dispatcher is bound to the loop
+    pub fn is_bound(&self, event_loop: &Bound<'_, PyAny>) -> bool {
+        self.event_loop.bind(event_loop.py()).is(event_loop)
+    }
+    // Create future of the loop
+    pub fn create_future<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyAny>> {
+        self.event_loop
+            .bind(py)
+            .call_method0(intern!(py, "create_future"))
+    }
+    // Pass the result to the future.
+    // Called from tokio task, without GIL.
+    pub fn complete(slf: &Py<Self>, fut: Py<PyAny>, r: PyResult<Response>) {
+        let dispatcher = slf.get();
+        let schedule = {
+            let mut completed = dispatcher.lock();
+            completed.push((fut, r));
+            // Delivery is already scheduled otherwise
+            completed.len() == 1
+        };
+        if schedule {
+            Python::attach(|py| {
+                let scheduled = slf.getattr(py, intern!(py, "deliver")).and_then(|cb| {
+                    dispatcher.event_loop.call_method1(
+                        py,
+                        intern!(py, "call_soon_threadsafe"),
+                        (cb,),
+                    )
+                });
+                if scheduled.is_err() {
+                    // Loop is closed, nobody waits for results
+                    dispatcher.lock().clear();
+                }
+            });
+        }
+    }
+    fn lock(&self) -> MutexGuard<'_, Vec<Completed>> {
+        self.completed
+            .lock()
+            .unwrap_or_else(PoisonError::into_inner)
+    }
+}
+
+#[pymethods]
+impl Dispatcher {
+    // Deliver all completed results.
+    // Called by the loop.
+    fn deliver(&self, py: Python<'_>) -> PyResult<()> {
+        let completed = std::mem::take(&mut *self.lock());
+        for (fut, r) in completed {
+            let fut = fut.bind(py);
+            // Future may be cancelled
+            if fut.call_method0(intern!(py, "done"))?.is_truthy()? {
+                continue;
+            }
+            match r {
+                Ok(resp) => fut.call_method1(intern!(py, "set_result"), (Py::new(py, resp)?,))?,
+                Err(e) => fut.call_method1(intern!(py, "set_exception"), (e.into_value(py),))?,
+            };
+        }
+        Ok(())
+    }
+}
+
+// Future's done callback, aborts the task
+// when the future is cancelled.
+#[pyclass(module = "gufo.http.async_client", frozen)]
+pub struct Canceller(AbortHandle);
+
+impl Canceller {
+    pub fn new(handle: AbortHandle) -> Self {
+        Canceller(handle)
+    }
+}
+
+#[pymethods]
+impl Canceller {
+    fn __call__(&self, fut: &Bound<'_, PyAny>) -> PyResult<()> {
+        if fut
+            .call_method0(intern!(fut.py(), "cancelled"))?
+            .is_truthy()?
+        {
+            self.0.abort();
+        }
+        Ok(())
+    }
+}
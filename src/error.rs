@@ -6,7 +6,7 @@
 // ------------------------------------------------------------------------
 use pyo3::{
     DowncastError, PyErr, create_exception,
-    exceptions::{PyConnectionError, PyException, PyTimeoutError, PyValueError},
+    exceptions::{PyConnectionError, PyException, PyOSError, PyTimeoutError, PyValueError},
 };
 
 pub type HttpResult<T> = Result<T, GufoHttpError>;
@@ -19,6 +19,7 @@ pub enum GufoHttpError {
     ValueError(String),
     Timeout,
     Downcast,
+    Io(std::io::Error),
 }
 
 create_exception!(
@@ -41,6 +42,12 @@ impl From<GufoHttpError> for PyErr {
             GufoHttpError::ValueError(x) => PyValueError::new_err(x),
             GufoHttpError::Timeout => PyTimeoutError::new_err("timed out"),
             GufoHttpError::Downcast => PyValueError::new_err("downcast error"),
+            // OSError(errno, strerror) is mapped to the proper subclass,
+            // like FileNotFoundError
+            GufoHttpError::Io(x) => match x.raw_os_error() {
+                Some(errno) => PyOSError::new_err((errno, x.to_string())),
+                None => PyOSError::new_err(x.to_string()),
+            },
         }
     }
 }
@@ -65,3 +72,18 @@ impl From<DowncastError<'_, '_>> for GufoHttpError {
         GufoHttpError::Downcast
     }
 }
+
+// Errors from reading response body via std::io::Read.
+// reqwest wraps its own errors into io::Error.
+impl From<std::io::Error> for GufoHttpError {
+    fn from(value: std::io::Error) -> Self {
+        if value.kind() == std::io::ErrorKind::TimedOut {
+            return GufoHttpError::Timeout;
+        }
+        let msg = value.to_string();
+        match value.into_inner().map(|e| e.downcast::<reqwest::Error>()) {
+            Some(Ok(e)) => GufoHttpError::from(*e),
+            _ => GufoHttpError::Request(msg),
+        }
+    }
+}
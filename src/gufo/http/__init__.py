@@ -9,6 +9,7 @@
 
 Attributes:
     __version__: Current version.
+    HTTP3: True if HTTP/3 support is compiled in.
 """
 
 # Gufo Labs modules
@@ -16,16 +17,24 @@ from ._fast import (
     BROTLI,
     DEFLATE,
     GZIP,
+    HTTP3,
+    AsyncStreamResponse,
     AuthBase,
     BasicAuth,
     BearerAuth,
     Headers,
     HttpError,
+    JsonBody,
     Proxy,
     RedirectError,
     RequestError,
+    RequestHeaders,
     RequestMethod,
     Response,
+    ResponseBody,
+    SyncStreamResponse,
+    TlsConfig,
+    configure_runtime,
 )
 
 __version__: str = "0.7.0"
@@ -33,15 +42,23 @@ __all__ = [
     "BROTLI",
     "DEFLATE",
     "GZIP",
+    "HTTP3",
+    "AsyncStreamResponse",
     "AuthBase",
     "BasicAuth",
     "BearerAuth",
     "Headers",
     "HttpError",
+    "JsonBody",
     "Proxy",
     "RedirectError",
     "RequestError",
+    "RequestHeaders",
     "RequestMethod",
     "Response",
+    "ResponseBody",
+    "SyncStreamResponse",
+    "TlsConfig",
     "__version__",
+    "configure_runtime",
 ]
@@ -15,8 +15,27 @@ Attributes:
 """
 
 # Python modules
+import os
 from enum import Enum
-from typing import Dict, Iterable, List, Optional, Tuple
+from types import TracebackType
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+SyncRequestBody = Union[bytes, "JsonBody", os.PathLike[str], BinaryIO, Iterable[bytes]]
+AsyncRequestBody = Union[SyncRequestBody, AsyncIterable[bytes]]
+RequestHeadersType = Union[Dict[str, bytes], "RequestHeaders"]
 
 # Exceptions
 class HttpError(Exception):
@@ -72,12 +91,13 @@ DEFLATE: int
 GZIP: int
 BROTLI: int
 ZSTD: int
+HTTP3: bool
 
 class Headers(object):
     """
     Request headers.
 
-    Dict-like structure.
+    Dict-like structure, header names are case-insensitive.
 
     !!! note
 
@@ -85,10 +105,76 @@ class Headers(object):
     """
     def __contains__(self: "Headers", k: str) -> bool: ...
     def __getitem__(self: "Headers", k: str) -> bytes: ...
+    def __len__(self: "Headers") -> int: ...
+    def __iter__(self: "Headers") -> Iterator[str]: ...
     def get(self: "Headers", k: str, default: Optional[bytes]) -> Optional[bytes]: ...
+    def get_all(self: "Headers", k: str) -> List[bytes]: ...
     def keys(self: "Headers") -> Iterable[str]: ...
     def values(self: "Headers") -> Iterable[bytes]: ...
     def items(self: "Headers") -> Iterable[Tuple[str, bytes]]: ...
+    def to_dict(
+        self: "Headers", decode: bool = False, multi: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Convert headers to dict in one call.
+
+        Names are in lowercase. Multiple values of the same header
+        are joined with `, `. `set-cookie` values may contain
+        commas, so they are always returned as list.
+
+        Args:
+            decode: Decode values to `str` as ISO-8859-1.
+            multi: Return all values as list.
+
+        Returns:
+            Dict of name -> value.
+        """
+
+class RequestHeaders(object):
+    """
+    Request headers, parsed and validated once.
+
+    May be passed as `headers` to requests instead of dict,
+    to send the same headers repeatedly. Header names are
+    case-insensitive, `len()` counts distinct names.
+
+    Args:
+        headers: Dict of header name -> value.
+    """
+    def __init__(self: "RequestHeaders", headers: Dict[str, bytes]) -> None: ...
+    def __len__(self: "RequestHeaders") -> int: ...
+
+class JsonBody(object):
+    """
+    Request body, serialized to JSON.
+
+    Serialized natively once, may be passed as `body`
+    to send the same document repeatedly.
+    Sets `Content-Type` to `application/json`,
+    unless it is set in request headers.
+
+    Args:
+        obj: None, bool, int, float, str, list, tuple
+            or dict with str keys, possibly nested.
+
+    Raises:
+        TypeError: if object is not serializable.
+        ValueError: if float is out of range or nesting is too deep.
+    """
+    def __init__(self: "JsonBody", obj: object) -> None: ...
+    def __len__(self: "JsonBody") -> int: ...
+    def __bytes__(self: "JsonBody") -> bytes: ...
+
+class ResponseBody(object):
+    """
+    Read-only response body.
+
+    Supports buffer protocol, so the body may be
+    accessed via `memoryview` without copying.
+    """
+    def __buffer__(self: "ResponseBody", flags: int, /) -> memoryview: ...
+    def __len__(self: "ResponseBody") -> int: ...
+    def __bytes__(self: "ResponseBody") -> bytes: ...
 
 class Response(object):
     """HTTP Response wrapper."""
@@ -100,7 +186,78 @@ class Response(object):
         """Response headers."""
     @property
     def content(self: "Response") -> bytes:
-        """Response binary content."""
+        """
+        Response binary content.
+
+        Copied from the body on first access.
+        """
+    @property
+    def body(self: "Response") -> ResponseBody:
+        """Response body, zero-copy."""
+    def json(self: "Response") -> object:
+        """
+        Parse response body as JSON.
+
+        The body is parsed without holding GIL,
+        Python objects are built at the end.
+        Integers are of arbitrary precision, like in `json` module.
+
+        Returns:
+            Parsed document.
+
+        Raises:
+            ValueError: if the body is not a valid JSON.
+        """
+
+class AsyncStreamResponse(object):
+    """
+    HTTP Response with the body read on demand.
+
+    Body is consumed by chunks via `iter_bytes()`.
+    """
+    @property
+    def status(self: "AsyncStreamResponse") -> int:
+        """Response status."""
+    @property
+    def headers(self: "AsyncStreamResponse") -> Headers:
+        """Response headers."""
+    def iter_bytes(self: "AsyncStreamResponse") -> AsyncIterator[bytes]:
+        """Iterate over body chunks."""
+    async def close(self: "AsyncStreamResponse") -> None:
+        """Drop the unread rest of the body."""
+    async def __aenter__(self: "AsyncStreamResponse") -> "AsyncStreamResponse": ...
+    async def __aexit__(
+        self: "AsyncStreamResponse",
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None: ...
+
+class SyncStreamResponse(object):
+    """
+    HTTP Response with the body read on demand.
+
+    Body is consumed by chunks via `iter_bytes()`.
+    """
+    @property
+    def status(self: "SyncStreamResponse") -> int:
+        """Response status."""
+    @property
+    def headers(self: "SyncStreamResponse") -> Headers:
+        """Response headers."""
+    def iter_bytes(
+        self: "SyncStreamResponse", chunk_size: int = 65536
+    ) -> Iterator[bytes]:
+        """Iterate over body chunks of `chunk_size` bytes."""
+    def close(self: "SyncStreamResponse") -> None:
+        """Drop the unread rest of the body."""
+    def __enter__(self: "SyncStreamResponse") -> "SyncStreamResponse": ...
+    def __exit__(
+        self: "SyncStreamResponse",
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None: ...
 
 class Proxy(object):
     """
@@ -111,44 +268,237 @@ class Proxy(object):
     """
     def __init__(self: "Proxy", url: str) -> None: ...
 
-class AsyncClient(object):
+class TlsConfig(object):
+    """
+    TLS settings.
+
+    Certificates are parsed once and shared between
+    the clients using the config.
+
+    Args:
+        ca_certs: Path to PEM file with trusted CA certificates.
+            Use the bundled root certificates if not set.
+        client_cert: Path to PEM file with the client certificate
+            chain for mutual TLS. Requires `client_key`.
+        client_key: Path to PEM file with the client private key.
+        min_version: Minimal TLS version, `"1.2"` or `"1.3"`.
+    """
     def __init__(
-        self: "AsyncClient",
+        self: "TlsConfig",
+        ca_certs: Optional[Union[str, "os.PathLike[str]"]] = None,
+        client_cert: Optional[Union[str, "os.PathLike[str]"]] = None,
+        client_key: Optional[Union[str, "os.PathLike[str]"]] = None,
+        min_version: Optional[str] = None,
+    ) -> None: ...
+
+def configure_runtime(
+    *,
+    worker_threads: Optional[int] = None,
+    max_blocking_threads: Optional[int] = None,
+    thread_stack_size: Optional[int] = None,
+    current_thread: bool = False,
+) -> None:
+    """
+    Configure the runtime of the asynchronous client.
+
+    Asynchronous client runs I/O on the tokio runtime.
+    By default, the runtime is started on first request
+    with one worker thread per CPU core. The function must be
+    called before the first request of asynchronous client.
+    Synchronous client is not affected.
+
+    Example:
+        ``` python
+        from gufo.http import configure_runtime
+
+        configure_runtime(worker_threads=2)
+        ```
+
+    Args:
+        worker_threads: Number of worker threads.
+            Defaults to number of CPU cores.
+        max_blocking_threads: Limit of threads for blocking
+            operations, like reading request body from
+            file objects and iterators.
+        thread_stack_size: Stack size of runtime threads, in bytes.
+        current_thread: Run all I/O on the single thread.
+            Can't be used along with `worker_threads`.
+
+    Raises:
+        ValueError: on invalid settings.
+        RuntimeError: when runtime is already started.
+    """
+
+SyncBatchRequest = Tuple[
+    RequestMethod, str, Optional[RequestHeadersType], Optional[SyncRequestBody]
+]
+AsyncBatchRequest = Tuple[
+    RequestMethod,
+    str,
+    Optional[RequestHeadersType],
+    Optional[AsyncRequestBody],
+]
+
+class AsyncTransport(object):
+    def __init__(
+        self: "AsyncTransport",
         validate_cert: bool,
         connect_timeout_ns: int,
-        timeout_ns: int,
         max_redirects: Optional[int],
-        headers: Optional[Dict[str, bytes]],
         compression: Optional[int],
+        proxy: Optional[List[Proxy]],
+        pool_max_idle_per_host: Optional[int],
+        pool_idle_timeout_ns: Optional[int],
+        tcp_keepalive_ns: Optional[int],
+        http2_prior_knowledge: bool,
+        http2_adaptive_window: bool,
+        http2_initial_stream_window_size: Optional[int],
+        http2_initial_connection_window_size: Optional[int],
+        http2_max_frame_size: Optional[int],
+        http2_keep_alive_interval_ns: Optional[int],
+        http2_keep_alive_timeout_ns: Optional[int],
+        http2_keep_alive_while_idle: bool,
+        http3: bool,
+        dns_ttl_ns: Optional[int],
+        dns_negative_ttl_ns: int,
+        dns_cache_size: int,
+        resolve: Optional[Dict[str, str]],
+        tls_session_cache_size: int,
+        tls_session_tickets: bool,
+        tls_config: TlsConfig,
+    ) -> None: ...
+    def pool_stats(self: "AsyncTransport") -> Dict[str, Dict[str, int]]: ...
+    def tls_stats(self: "AsyncTransport") -> Dict[str, int]: ...
+    def dns_stats(self: "AsyncTransport") -> Dict[str, int]: ...
+
+class AsyncClient(object):
+    def __init__(
+        self: "AsyncClient",
+        transport: AsyncTransport,
+        timeout_ns: int,
+        headers: Optional[Dict[str, bytes]],
         user_agent: Optional[str],
         auth: Optional[AuthBase],
-        proxy: Optional[List[Proxy]],
+        coalesce: bool,
     ) -> None: ...
+    def pool_stats(self: "AsyncClient") -> Dict[str, Dict[str, int]]: ...
+    def tls_stats(self: "AsyncClient") -> Dict[str, int]: ...
+    def dns_stats(self: "AsyncClient") -> Dict[str, int]: ...
+    async def resolve_many(
+        self: "AsyncClient", hosts: List[str]
+    ) -> Dict[str, List[str]]: ...
     async def request(
         self: "AsyncClient",
         method: RequestMethod,
         url: str,
-        headers: Optional[Dict[str, bytes]],
-        body: Optional[bytes],
+        headers: Optional[RequestHeadersType],
+        body: Optional[AsyncRequestBody],
+        timeout_ns: Optional[int],
+        parse_json: bool,
+    ) -> Response: ...
+    async def batch(
+        self: "AsyncClient",
+        requests: Iterable[AsyncBatchRequest],
+        concurrency: int,
+    ) -> List[Union[Response, Exception]]: ...
+    def as_completed(
+        self: "AsyncClient",
+        requests: Iterable[AsyncBatchRequest],
+        concurrency: int,
+    ) -> AsyncIterator[Tuple[int, Union[Response, Exception]]]: ...
+    async def download(
+        self: "AsyncClient",
+        method: RequestMethod,
+        url: str,
+        path: Union[str, os.PathLike[str]],
+        headers: Optional[RequestHeadersType],
+        body: Optional[AsyncRequestBody],
+        timeout_ns: Optional[int],
     ) -> Response: ...
+    async def stream(
+        self: "AsyncClient",
+        method: RequestMethod,
+        url: str,
+        headers: Optional[RequestHeadersType],
+        body: Optional[AsyncRequestBody],
+        timeout_ns: Optional[int],
+    ) -> AsyncStreamResponse: ...
 
-class SyncClient(object):
+class SyncTransport(object):
     def __init__(
-        self: "SyncClient",
+        self: "SyncTransport",
         validate_cert: bool,
         connect_timeout_ns: int,
-        timeout_ns: int,
         max_redirects: Optional[int],
-        headers: Optional[Dict[str, bytes]],
         compression: Optional[int],
+        proxy: Optional[List[Proxy]],
+        pool_max_idle_per_host: Optional[int],
+        pool_idle_timeout_ns: Optional[int],
+        tcp_keepalive_ns: Optional[int],
+        http2_prior_knowledge: bool,
+        http2_adaptive_window: bool,
+        http2_initial_stream_window_size: Optional[int],
+        http2_initial_connection_window_size: Optional[int],
+        http2_max_frame_size: Optional[int],
+        http3: bool,
+        dns_ttl_ns: Optional[int],
+        dns_negative_ttl_ns: int,
+        dns_cache_size: int,
+        resolve: Optional[Dict[str, str]],
+        tls_session_cache_size: int,
+        tls_session_tickets: bool,
+        tls_config: TlsConfig,
+    ) -> None: ...
+    def pool_stats(self: "SyncTransport") -> Dict[str, Dict[str, int]]: ...
+    def tls_stats(self: "SyncTransport") -> Dict[str, int]: ...
+    def dns_stats(self: "SyncTransport") -> Dict[str, int]: ...
+
+class SyncClient(object):
+    def __init__(
+        self: "SyncClient",
+        transport: SyncTransport,
+        timeout_ns: int,
+        headers: Optional[Dict[str, bytes]],
         user_agent: Optional[str],
         auth: Optional[AuthBase],
-        proxy: Optional[List[Proxy]],
     ) -> None: ...
+    def pool_stats(self: "SyncClient") -> Dict[str, Dict[str, int]]: ...
+    def tls_stats(self: "SyncClient") -> Dict[str, int]: ...
+    def dns_stats(self: "SyncClient") -> Dict[str, int]: ...
+    def resolve_many(self: "SyncClient", hosts: List[str]) -> Dict[str, List[str]]: ...
     def request(
         self: "SyncClient",
         method: RequestMethod,
         url: str,
-        headers: Optional[Dict[str, bytes]],
-        body: Optional[bytes],
+        headers: Optional[RequestHeadersType],
+        body: Optional[SyncRequestBody],
+        timeout_ns: Optional[int],
+        parse_json: bool,
     ) -> Response: ...
+    def batch(
+        self: "SyncClient",
+        requests: Iterable[SyncBatchRequest],
+        concurrency: int,
+    ) -> List[Union[Response, Exception]]: ...
+    def as_completed(
+        self: "SyncClient",
+        requests: Iterable[SyncBatchRequest],
+        concurrency: int,
+    ) -> Iterator[Tuple[int, Union[Response, Exception]]]: ...
+    def download(
+        self: "SyncClient",
+        method: RequestMethod,
+        url: str,
+        path: Union[str, os.PathLike[str]],
+        headers: Optional[RequestHeadersType],
+        body: Optional[SyncRequestBody],
+        timeout_ns: Optional[int],
+    ) -> Response: ...
+    def stream(
+        self: "SyncClient",
+        method: RequestMethod,
+        url: str,
+        headers: Optional[RequestHeadersType],
+        body: Optional[SyncRequestBody],
+        timeout_ns: Optional[int],
+    ) -> SyncStreamResponse: ...
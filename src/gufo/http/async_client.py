@@ -8,8 +8,20 @@
 """Asynchronous client."""
 
 # Python modules
+import os
 from types import TracebackType
-from typing import Dict, List, Optional, Type
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    BinaryIO,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
 from . import __version__
 
@@ -19,18 +31,231 @@ from ._fast import (
     DEFLATE,
     GZIP,
     AsyncClient,
+    AsyncStreamResponse,
+    AsyncTransport,
     AuthBase,
+    JsonBody,
     Proxy,
+    RequestHeaders,
     RequestMethod,
     Response,
+    TlsConfig,
 )
-from .util import merge_dict
+from .util import NO_JSON, merge_dict, to_body, to_ns
 
 MAX_REDIRECTS = 10
 DEFAULT_CONNECT_TIMEOUT = 30.0
 DEFAULT_TIMEOUT = 3600.0
+DEFAULT_POOL_IDLE_TIMEOUT = 90.0
+DEFAULT_DNS_NEGATIVE_TTL = 5.0
+DEFAULT_DNS_CACHE_SIZE = 65536
+DEFAULT_TLS_SESSION_CACHE_SIZE = 256
 NS = 1_000_000_000.0
 
+DEFAULT_CONCURRENCY = 64
+
+CertPath = Union[str, "os.PathLike[str]"]
+RequestBody = Union[
+    bytes,
+    JsonBody,
+    "os.PathLike[str]",
+    BinaryIO,
+    Iterable[bytes],
+    AsyncIterable[bytes],
+]
+RequestHeadersType = Union[Dict[str, bytes], RequestHeaders]
+BatchRequest = Tuple[
+    RequestMethod, str, Optional[RequestHeadersType], Optional[RequestBody]
+]
+
+
+class Transport(object):
+    """Connection pool and connection settings.
+
+    Transport may be shared between several HttpClient
+    instances with different headers, authentication,
+    and timeouts. Clients sharing transport reuse
+    established connections.
+
+    Example:
+        ``` python
+        transport = Transport(validate_cert=False)
+        c1 = HttpClient(transport=transport, auth=BasicAuth("u1", "p1"))
+        c2 = HttpClient(transport=transport, auth=BasicAuth("u2", "p2"))
+        ```
+
+    Args:
+        max_redirects: Set up redirects policy:
+
+            * **None**: Disable automatic redirect processing.
+            * **0**: Deny redirects. Will raise `RedirectError`
+                on 3xx response.
+            * **>0**: Follow redirects automatically. Will raise
+                `RedirectError` when redirects limit exceeded.
+
+        compression: Acceptable compression methods,
+            must be a combination of `DEFLATE`, `GZIP`, `BROTLI`, and `ZSTD`.
+            Set to `None` to disable compression support.
+        validate_cert: Set to `False` to disable TLS certificate
+            validation. Otherwise, raise `ConnectionError`
+            on invalid certificates.
+        connect_timeout: Timeout to establish connection, in seconds.
+        proxy: Optional list of Proxy istances.
+        pool_max_idle_per_host: Maximal number of idle connections
+            kept per host. Set to `None` for no limit.
+        pool_idle_timeout: Close idle connections after timeout,
+            in seconds. Set to `None` to keep idle connections forever.
+        tcp_keepalive: Send TCP keepalive probes after the connection
+            is idle for given time, in seconds. Set to `None` to disable.
+        http2_prior_knowledge: Use HTTP/2 without negotiation.
+            Allows HTTP/2 over plain TCP (h2c). Servers must
+            support HTTP/2.
+        http2_adaptive_window: Adjust HTTP/2 flow control windows
+            to the measured bandwidth-delay product. Overrides
+            the initial window sizes.
+        http2_initial_stream_window_size: HTTP/2 initial window size
+            of the stream, in bytes. Set to `None` to use the default.
+        http2_initial_connection_window_size: HTTP/2 initial window
+            size of the connection, in bytes. Set to `None` to use
+            the default.
+        http2_max_frame_size: Maximal HTTP/2 frame size, in bytes.
+            Set to `None` to use the default.
+        http2_keep_alive_interval: Send HTTP/2 PING frames
+            at given interval, in seconds. Set to `None` to disable.
+        http2_keep_alive_timeout: Close the connection when PING
+            is not acknowledged within timeout, in seconds.
+        http2_keep_alive_while_idle: Send HTTP/2 PING frames
+            when there are no requests in progress.
+        http3: Use HTTP/3 (QUIC) without negotiation.
+            Servers must support HTTP/3. Resumed TLS sessions
+            skip the certificate exchange, but early data (0-RTT)
+            is not sent.
+            Available only when `HTTP3` is True.
+        dns_ttl: Cache resolved addresses for given time, in seconds.
+            Set to `None` to disable the cache.
+        dns_negative_ttl: Cache failed lookups for given time,
+            in seconds. Set to `0` to disable. Used only
+            when `dns_ttl` is set.
+        dns_cache_size: Maximal number of hosts in the DNS cache.
+        resolve: Optional dict of host -> IP address. Pinned
+            addresses are used instead of resolving the host.
+        tls_session_cache_size: Maximal number of cached TLS sessions.
+            Cached sessions are resumed by the following connections,
+            skipping the full handshake. Set to `0` to disable
+            the session resumption.
+        tls_session_tickets: Resume TLS 1.2 sessions by tickets.
+            Otherwise, only session ids are used. TLS 1.3 sessions
+            are always resumed by tickets.
+        ca_certs: Path to PEM file with trusted CA certificates.
+            Replaces the bundled root certificates.
+        client_cert: Path to PEM file with the client certificate
+            chain for mutual TLS. Requires `client_key`.
+        client_key: Path to PEM file with the client private key.
+        tls_min_version: Minimal TLS version, `"1.2"` or `"1.3"`.
+        tls_config: Shared TlsConfig. `ca_certs`, `client_cert`,
+            `client_key`, and `tls_min_version` are taken from
+            config and ignored.
+    """
+
+    def __init__(
+        self: "Transport",
+        /,
+        max_redirects: Optional[int] = MAX_REDIRECTS,
+        compression: Optional[int] = DEFLATE | GZIP | BROTLI,
+        validate_cert: bool = True,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        proxy: Optional[List[Proxy]] = None,
+        pool_max_idle_per_host: Optional[int] = None,
+        pool_idle_timeout: Optional[float] = DEFAULT_POOL_IDLE_TIMEOUT,
+        tcp_keepalive: Optional[float] = None,
+        http2_prior_knowledge: bool = False,
+        http2_adaptive_window: bool = False,
+        http2_initial_stream_window_size: Optional[int] = None,
+        http2_initial_connection_window_size: Optional[int] = None,
+        http2_max_frame_size: Optional[int] = None,
+        http2_keep_alive_interval: Optional[float] = None,
+        http2_keep_alive_timeout: Optional[float] = None,
+        http2_keep_alive_while_idle: bool = False,
+        http3: bool = False,
+        dns_ttl: Optional[float] = None,
+        dns_negative_ttl: float = DEFAULT_DNS_NEGATIVE_TTL,
+        dns_cache_size: int = DEFAULT_DNS_CACHE_SIZE,
+        resolve: Optional[Dict[str, str]] = None,
+        tls_session_cache_size: int = DEFAULT_TLS_SESSION_CACHE_SIZE,
+        tls_session_tickets: bool = True,
+        ca_certs: Optional[CertPath] = None,
+        client_cert: Optional[CertPath] = None,
+        client_key: Optional[CertPath] = None,
+        tls_min_version: Optional[str] = None,
+        tls_config: Optional[TlsConfig] = None,
+    ) -> None:
+        if tls_config is None:
+            tls_config = TlsConfig(
+                ca_certs=ca_certs,
+                client_cert=client_cert,
+                client_key=client_key,
+                min_version=tls_min_version,
+            )
+        self._transport = AsyncTransport(
+            validate_cert,
+            int(connect_timeout * NS),
+            max_redirects,
+            compression,
+            proxy,
+            pool_max_idle_per_host,
+            None if pool_idle_timeout is None else int(pool_idle_timeout * NS),
+            None if tcp_keepalive is None else int(tcp_keepalive * NS),
+            http2_prior_knowledge,
+            http2_adaptive_window,
+            http2_initial_stream_window_size,
+            http2_initial_connection_window_size,
+            http2_max_frame_size,
+            to_ns(http2_keep_alive_interval),
+            to_ns(http2_keep_alive_timeout),
+            http2_keep_alive_while_idle,
+            http3,
+            to_ns(dns_ttl),
+            int(dns_negative_ttl * NS),
+            dns_cache_size,
+            resolve,
+            tls_session_cache_size,
+            tls_session_tickets,
+            tls_config,
+        )
+
+    def pool_stats(self: "Transport") -> Dict[str, Dict[str, int]]:
+        """Get per-host request statistics.
+
+        Statistics are shared by all clients using transport.
+        See `HttpClient.pool_stats()` for details.
+
+        Returns:
+            Dict of host -> statistics.
+        """
+        return self._transport.pool_stats()
+
+    def tls_stats(self: "Transport") -> Dict[str, int]:
+        """Get TLS handshake statistics.
+
+        Statistics are shared by all clients using transport.
+        See `HttpClient.tls_stats()` for details.
+
+        Returns:
+            Dict of counter -> value.
+        """
+        return self._transport.tls_stats()
+
+    def dns_stats(self: "Transport") -> Dict[str, int]:
+        """Get DNS cache statistics.
+
+        Statistics are shared by all clients using transport.
+        See `HttpClient.dns_stats()` for details.
+
+        Returns:
+            Dict of counter -> value.
+        """
+        return self._transport.dns_stats()
+
 
 class HttpClient(object):
     """Asynchronous HTTP client.
@@ -59,6 +284,70 @@ class HttpClient(object):
         timeout: Request timeout, in seconds.
         auth: Authentication settings.
         proxy: Optional list of Proxy istances.
+        pool_max_idle_per_host: Maximal number of idle connections
+            kept per host. Set to `None` for no limit.
+        pool_idle_timeout: Close idle connections after timeout,
+            in seconds. Set to `None` to keep idle connections forever.
+        tcp_keepalive: Send TCP keepalive probes after the connection
+            is idle for given time, in seconds. Set to `None` to disable.
+        http2_prior_knowledge: Use HTTP/2 without negotiation.
+            Allows HTTP/2 over plain TCP (h2c). Servers must
+            support HTTP/2.
+        http2_adaptive_window: Adjust HTTP/2 flow control windows
+            to the measured bandwidth-delay product. Overrides
+            the initial window sizes.
+        http2_initial_stream_window_size: HTTP/2 initial window size
+            of the stream, in bytes. Set to `None` to use the default.
+        http2_initial_connection_window_size: HTTP/2 initial window
+            size of the connection, in bytes. Set to `None` to use
+            the default.
+        http2_max_frame_size: Maximal HTTP/2 frame size, in bytes.
+            Set to `None` to use the default.
+        http2_keep_alive_interval: Send HTTP/2 PING frames
+            at given interval, in seconds. Set to `None` to disable.
+        http2_keep_alive_timeout: Close the connection when PING
+            is not acknowledged within timeout, in seconds.
+        http2_keep_alive_while_idle: Send HTTP/2 PING frames
+            when there are no requests in progress.
+        http3: Use HTTP/3 (QUIC) without negotiation.
+            Servers must support HTTP/3. Resumed TLS sessions
+            skip the certificate exchange, but early data (0-RTT)
+            is not sent.
+            Available only when `HTTP3` is True.
+        dns_ttl: Cache resolved addresses for given time, in seconds.
+            Set to `None` to disable the cache.
+        dns_negative_ttl: Cache failed lookups for given time,
+            in seconds. Set to `0` to disable. Used only
+            when `dns_ttl` is set.
+        dns_cache_size: Maximal number of hosts in the DNS cache.
+        resolve: Optional dict of host -> IP address. Pinned
+            addresses are used instead of resolving the host.
+        tls_session_cache_size: Maximal number of cached TLS sessions.
+            Cached sessions are resumed by the following connections,
+            skipping the full handshake. Set to `0` to disable
+            the session resumption.
+        tls_session_tickets: Resume TLS 1.2 sessions by tickets.
+            Otherwise, only session ids are used. TLS 1.3 sessions
+            are always resumed by tickets.
+        ca_certs: Path to PEM file with trusted CA certificates.
+            Replaces the bundled root certificates.
+        client_cert: Path to PEM file with the client certificate
+            chain for mutual TLS. Requires `client_key`.
+        client_key: Path to PEM file with the client private key.
+        tls_min_version: Minimal TLS version, `"1.2"` or `"1.3"`.
+        tls_config: Shared TlsConfig. `ca_certs`, `client_cert`,
+            `client_key`, and `tls_min_version` are taken from
+            config and ignored.
+        transport: Use shared Transport. `max_redirects`, `compression`,
+            `validate_cert`, `connect_timeout`, `proxy`, `pool_*`,
+            `tcp_keepalive`, `http2_*`, `http3`, `dns_*`, `resolve`,
+            `ca_certs`, `client_*`, and `tls_*` settings are taken
+            from transport and ignored.
+        coalesce: Deliver the responses of `request()` and its
+            shortcuts to the event loop in batches. Responses
+            completed while the loop is busy are passed
+            by a single loop wakeup, reducing the per-request
+            overhead for many concurrent requests.
     """
 
     user_agent = f"Gufo HTTP/{__version__}"
@@ -76,17 +365,70 @@ class HttpClient(object):
         user_agent: Optional[str] = None,
         auth: Optional[AuthBase] = None,
         proxy: Optional[List[Proxy]] = None,
+        pool_max_idle_per_host: Optional[int] = None,
+        pool_idle_timeout: Optional[float] = DEFAULT_POOL_IDLE_TIMEOUT,
+        tcp_keepalive: Optional[float] = None,
+        http2_prior_knowledge: bool = False,
+        http2_adaptive_window: bool = False,
+        http2_initial_stream_window_size: Optional[int] = None,
+        http2_initial_connection_window_size: Optional[int] = None,
+        http2_max_frame_size: Optional[int] = None,
+        http2_keep_alive_interval: Optional[float] = None,
+        http2_keep_alive_timeout: Optional[float] = None,
+        http2_keep_alive_while_idle: bool = False,
+        http3: bool = False,
+        dns_ttl: Optional[float] = None,
+        dns_negative_ttl: float = DEFAULT_DNS_NEGATIVE_TTL,
+        dns_cache_size: int = DEFAULT_DNS_CACHE_SIZE,
+        resolve: Optional[Dict[str, str]] = None,
+        tls_session_cache_size: int = DEFAULT_TLS_SESSION_CACHE_SIZE,
+        tls_session_tickets: bool = True,
+        ca_certs: Optional[CertPath] = None,
+        client_cert: Optional[CertPath] = None,
+        client_key: Optional[CertPath] = None,
+        tls_min_version: Optional[str] = None,
+        tls_config: Optional[TlsConfig] = None,
+        transport: Optional[Transport] = None,
+        coalesce: bool = False,
     ) -> None:
+        if transport is None:
+            transport = Transport(
+                max_redirects=max_redirects,
+                compression=compression,
+                validate_cert=validate_cert,
+                connect_timeout=connect_timeout,
+                proxy=proxy,
+                pool_max_idle_per_host=pool_max_idle_per_host,
+                pool_idle_timeout=pool_idle_timeout,
+                tcp_keepalive=tcp_keepalive,
+                http2_prior_knowledge=http2_prior_knowledge,
+                http2_adaptive_window=http2_adaptive_window,
+                http2_initial_stream_window_size=http2_initial_stream_window_size,
+                http2_initial_connection_window_size=http2_initial_connection_window_size,
+                http2_max_frame_size=http2_max_frame_size,
+                http2_keep_alive_interval=http2_keep_alive_interval,
+                http2_keep_alive_timeout=http2_keep_alive_timeout,
+                http2_keep_alive_while_idle=http2_keep_alive_while_idle,
+                http3=http3,
+                dns_ttl=dns_ttl,
+                dns_negative_ttl=dns_negative_ttl,
+                dns_cache_size=dns_cache_size,
+                resolve=resolve,
+                tls_session_cache_size=tls_session_cache_size,
+                tls_session_tickets=tls_session_tickets,
+                ca_certs=ca_certs,
+                client_cert=client_cert,
+                client_key=client_key,
+                tls_min_version=tls_min_version,
+                tls_config=tls_config,
+            )
         self._client = AsyncClient(
-            validate_cert,
-            int(connect_timeout * NS),
+            transport._transport,
             int(timeout * NS),
-            max_redirects,
             merge_dict(self.headers, headers),
-            compression,
             user_agent or self.user_agent,
             auth,
-            proxy,
+            coalesce,
         )
 
     async def __aenter__(self: "HttpClient") -> "HttpClient":
@@ -108,21 +450,140 @@ class HttpClient(object):
     ) -> None:
         """Asynchronous context manager exit."""
 
+    def pool_stats(self: "HttpClient") -> Dict[str, Dict[str, int]]:
+        """Get per-host request statistics.
+
+        Statistics are collected per host, identified
+        as `scheme://host:port`, and shared by all clients
+        using the same transport:
+
+        * `in_use`: Requests in flight, until the response body
+            is read or the stream is closed.
+        * `requests`: Total requests.
+
+        The connection pool is not exposed, so neither open
+        nor idle connections are counted. With HTTP/1.1 each
+        request in flight holds its own connection, while
+        HTTP/2 requests may share a single one.
+
+        Example:
+            ``` python
+            await client.get("https://example.com/")
+            client.pool_stats()
+            # {"https://example.com:443": {"in_use": 0, "requests": 1}}
+            ```
+
+        Returns:
+            Dict of host -> statistics.
+        """
+        return self._client.pool_stats()
+
+    def tls_stats(self: "HttpClient") -> Dict[str, int]:
+        """Get TLS handshake statistics.
+
+        Statistics are shared by all clients using the same
+        transport:
+
+        * `handshakes`: Total handshakes.
+        * `offered`: Handshakes offering the cached session.
+            The server may refuse it and perform the full handshake,
+            so this is an upper bound of resumed sessions.
+
+        Example:
+            ``` python
+            for _ in range(3):
+                await client.get("https://example.com/")
+            client.tls_stats()
+            # {"handshakes": 1, "offered": 0}
+            ```
+
+        Returns:
+            Dict of counter -> value.
+        """
+        return self._client.tls_stats()
+
+    def dns_stats(self: "HttpClient") -> Dict[str, int]:
+        """Get DNS cache statistics.
+
+        Statistics are shared by all clients using the same
+        transport:
+
+        * `hits`: Lookups served from the cache,
+            including cached failures.
+        * `misses`: Lookups passed to the system resolver.
+
+        Both counters are zero when the cache is disabled.
+        Pinned addresses are not counted.
+
+        Example:
+            ``` python
+            await client.resolve_many(["example.com"])
+            await client.get("https://example.com/")
+            client.dns_stats()
+            # {"hits": 1, "misses": 1}
+            ```
+
+        Returns:
+            Dict of counter -> value.
+        """
+        return self._client.dns_stats()
+
+    async def resolve_many(
+        self: "HttpClient", hosts: Iterable[str], /
+    ) -> Dict[str, List[str]]:
+        """Resolve hosts concurrently.
+
+        Warms up the DNS cache, so the following requests
+        to the hosts skip the resolver. Pinned addresses
+        are returned as is.
+
+        Example:
+            ``` python
+            await client.resolve_many(["example.com", "example.org"])
+            # {"example.com": ["192.0.2.10"], "example.org": ["192.0.2.20"]}
+            ```
+
+        Args:
+            hosts: Iterable of host names.
+
+        Returns:
+            Dict of host -> list of IP addresses. Hosts
+            failed to resolve have empty lists.
+
+        Raises:
+            ValueError: DNS cache is disabled, `dns_ttl` is not set.
+        """
+        return await self._client.resolve_many(list(hosts))
+
     async def request(
         self: "HttpClient",
         method: RequestMethod,
         url: str,
         /,
-        body: Optional[bytes] = None,
-        headers: Optional[Dict[str, bytes]] = None,
+        body: Optional[RequestBody] = None,
+        headers: Optional[RequestHeadersType] = None,
+        timeout: Optional[float] = None,
+        parse: Optional[str] = None,
     ) -> Response:
         """Send HTTP request and receive a response.
 
+        Cancelling the awaiting task drops the request
+        immediately and closes its connection.
+
         Args:
             method: Request method
             url: Request url
-            body: Request body
-            headers: Optional request headers
+            body: Request body. Either bytes, file path,
+                binary file object, iterable or asynchronous iterable
+                of bytes. Files passed by path are memory-mapped,
+                file objects and iterables are streamed.
+            headers: Optional request headers, dict or
+                `RequestHeaders`
+            timeout: Request timeout, in seconds.
+                Overrides the client's `timeout`.
+            parse: Set to `json` to parse the body as JSON
+                in the background. Parsed document is returned
+                by `Response.json()`.
 
         Returns:
             Response instance.
@@ -132,20 +593,232 @@ class HttpClient(object):
             ConnectionError: when failed to establish connection.
             RedirectError: when redirects limit reached.
             RequestError: on other errors related with request processing.
+            ValueError: on unsupported `parse` mode.
+        """
+        if parse is not None and parse != "json":
+            msg = f"unsupported parse mode: {parse}"
+            raise ValueError(msg)
+        return await self._client.request(
+            method, url, headers, body, to_ns(timeout), parse == "json"
+        )
+
+    async def download(
+        self: "HttpClient",
+        url: str,
+        path: Union[str, "os.PathLike[str]"],
+        /,
+        headers: Optional[RequestHeadersType] = None,
+        timeout: Optional[float] = None,
+    ) -> Response:
+        """Send HTTP GET request and write response body to file.
+
+        The body is written to file chunk by chunk,
+        so the memory usage doesn't depend on the body size.
+        The body is written regardless of the response status.
+        Existing file is truncated.
+
+        Args:
+            url: Request url
+            path: File path.
+            headers: Optional request headers, dict or
+                `RequestHeaders`
+            timeout: Request timeout, in seconds.
+                Overrides the client's `timeout`.
+
+        Returns:
+            Response instance with empty content.
+
+        Raises:
+            TimeoutError: on timeouts.
+            ConnectionError: when failed to establish connection.
+            RedirectError: when redirects limit reached.
+            RequestError: on other errors related with request processing.
+            OSError: when failed to write file.
+        """
+        return await self._client.download(
+            RequestMethod.GET, url, path, headers, None, to_ns(timeout)
+        )
+
+    async def stream(
+        self: "HttpClient",
+        method: RequestMethod,
+        url: str,
+        /,
+        body: Optional[RequestBody] = None,
+        headers: Optional[RequestHeadersType] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncStreamResponse:
+        """Send HTTP request and receive a response with streaming body.
+
+        Returns as soon as the response headers are received.
+        The body is read on demand, chunk by chunk,
+        so the memory usage doesn't depend on the body size.
+
+        Example:
+            ``` python
+            async with await client.stream(RequestMethod.GET, url) as resp:
+                async for chunk in resp.iter_bytes():
+                    ...
+            ```
+
+        Args:
+            method: Request method
+            url: Request url
+            body: Request body
+            headers: Optional request headers, dict or
+                `RequestHeaders`
+            timeout: Request timeout, in seconds.
+                Overrides the client's `timeout`.
+
+        Returns:
+            AsyncStreamResponse instance.
+
+        Raises:
+            TimeoutError: on timeouts.
+            ConnectionError: when failed to establish connection.
+            RedirectError: when redirects limit reached.
+            RequestError: on other errors related with request processing.
+        """
+        return await self._client.stream(method, url, headers, body, to_ns(timeout))
+
+    async def batch(
+        self: "HttpClient",
+        requests: Iterable[BatchRequest],
+        /,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> List[Union[Response, Exception]]:
+        """Send many requests concurrently and receive all responses.
+
+        Requests are processed on the internal runtime,
+        no more than `concurrency` at a time.
+        Failed requests do not affect others.
+
+        Example:
+            ``` python
+            results = await client.batch(
+                [(RequestMethod.GET, url, None, None) for url in urls],
+                concurrency=16,
+            )
+            for r in results:
+                if isinstance(r, Exception):
+                    ...
+            ```
+
+        Args:
+            requests: Iterable of `(method, url, headers, body)` tuples.
+                `headers` and `body` may be None.
+            concurrency: Maximal number of requests in progress.
+
+        Returns:
+            List of the Response instances or the exceptions,
+            in order of `requests`.
+
+        Raises:
+            TypeError: on malformed request tuple.
+            ValueError: when `concurrency` is not positive.
         """
-        return await self._client.request(method, url, headers, body)
+        return await self._client.batch(requests, concurrency)
+
+    def as_completed(
+        self: "HttpClient",
+        requests: Iterable[BatchRequest],
+        /,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> AsyncIterator[Tuple[int, Union[Response, Exception]]]:
+        """Send many requests concurrently and iterate over results.
+
+        Like `batch()`, but results are yielded as soon
+        as requests are completed, in order of completion.
+        Requests are started on the first iteration.
+        Dropping the iterator cancels requests in progress.
+
+        Example:
+            ``` python
+            async for idx, r in client.as_completed(requests):
+                if isinstance(r, Exception):
+                    ...
+            ```
+
+        Args:
+            requests: Iterable of `(method, url, headers, body)` tuples.
+                `headers` and `body` may be None.
+            concurrency: Maximal number of requests in progress.
+
+        Returns:
+            Iterator of `(index, result)` tuples, where `index` is
+            the position of the request in `requests`, and result
+            is either Response instance or exception.
+
+        Raises:
+            TypeError: on malformed request tuple.
+            ValueError: when `concurrency` is not positive.
+        """
+        return self._client.as_completed(requests, concurrency)
+
+    async def warmup(
+        self: "HttpClient",
+        urls: Iterable[str],
+        /,
+        connections_per_host: int = 1,
+    ) -> Dict[str, int]:
+        """Establish connections in advance.
+
+        Sends `connections_per_host` concurrent HEAD requests
+        to each url, leaving established connections
+        in the idle pool for the following requests.
+        Responses are ignored. Connections are kept
+        according to `pool_*` settings. Warm-up is best-effort:
+        fast responses may let the requests share a connection,
+        and HTTP/2 requests are multiplexed over the single one.
+
+        Example:
+            ``` python
+            await client.warmup(
+                ["https://a:443", "https://b:8443"], connections_per_host=4
+            )
+            ```
+
+        Args:
+            urls: Iterable of urls, usually `scheme://host:port`.
+            connections_per_host: Number of connections per url.
+
+        Returns:
+            Dict of url -> number of successful requests.
+
+        Raises:
+            ValueError: when `connections_per_host` is not positive.
+        """
+        if connections_per_host < 1:
+            msg = "connections_per_host must be positive"
+            raise ValueError(msg)
+        targets = [url for url in urls for _ in range(connections_per_host)]
+        r = dict.fromkeys(targets, 0)
+        if not targets:
+            return r
+        results = await self._client.batch(
+            [(RequestMethod.HEAD, url, None, None) for url in targets],
+            len(targets),
+        )
+        for url, result in zip(targets, results):
+            if isinstance(result, Response):
+                r[url] += 1
+        return r
 
     async def get(
         self: "HttpClient",
         url: str,
         /,
-        headers: Optional[Dict[str, bytes]] = None,
+        headers: Optional[RequestHeadersType] = None,
+        timeout: Optional[float] = None,
     ) -> Response:
         """Send HTTP GET request and receive a response.
 
         Args:
             url: Request url
-            headers: Optional request headers
+            headers: Optional request headers, dict or
+                `RequestHeaders`
+            timeout: Request timeout, in seconds.
+                Overrides the client's `timeout`.
 
         Returns:
             Response instance.
@@ -156,19 +829,25 @@ class HttpClient(object):
             RedirectError: when redirects limit reached.
             RequestError: on other errors related with request processing.
         """
-        return await self._client.request(RequestMethod.GET, url, headers, None)
+        return await self._client.request(
+            RequestMethod.GET, url, headers, None, to_ns(timeout), False
+        )
 
     async def head(
         self: "HttpClient",
         url: str,
         /,
-        headers: Optional[Dict[str, bytes]] = None,
+        headers: Optional[RequestHeadersType] = None,
+        timeout: Optional[float] = None,
     ) -> Response:
         """Send HTTP HEAD request and receive a response.
 
         Args:
             url: Request url
-            headers: Optional request headers
+            headers: Optional request headers, dict or
+                `RequestHeaders`
+            timeout: Request timeout, in seconds.
+                Overrides the client's `timeout`.
 
         Returns:
             Response instance.
@@ -179,13 +858,16 @@ class HttpClient(object):
             RedirectError: when redirects limit reached.
             RequestError: on other errors related with request processing.
         """
-        return await self._client.request(RequestMethod.HEAD, url, headers, None)
+        return await self._client.request(
+            RequestMethod.HEAD, url, headers, None, to_ns(timeout), False
+        )
 
     async def options(
         self: "HttpClient",
         url: str,
         /,
-        headers: Optional[Dict[str, bytes]] = None,
+        headers: Optional[RequestHeadersType] = None,
+        timeout: Optional[float] = None,
     ) -> Response:
         """Send HTTP OPTIONS request and receive a response.
 
@@ -193,7 +875,10 @@ class HttpClient(object):
 
         Args:
             url: Request url, use `*` to get options for server.
-            headers: Optional request headers.
+            headers: Optional request headers, dict or
+                `RequestHeaders`.
+            timeout: Request timeout, in seconds.
+                Overrides the client's `timeout`.
 
         Returns:
             Response instance.
@@ -204,19 +889,25 @@ class HttpClient(object):
             RedirectError: when redirects limit reached.
             RequestError: on other errors related with request processing.
         """
-        return await self._client.request(RequestMethod.OPTIONS, url, headers, None)
+        return await self._client.request(
+            RequestMethod.OPTIONS, url, headers, None, to_ns(timeout), False
+        )
 
     async def delete(
         self: "HttpClient",
         url: str,
         /,
-        headers: Optional[Dict[str, bytes]] = None,
+        headers: Optional[RequestHeadersType] = None,
+        timeout: Optional[float] = None,
     ) -> Response:
         """Send HTTP DELETE request and receive a response.
 
         Args:
             url: Request url, use `*` to get options for server.
-            headers: Optional request headers.
+            headers: Optional request headers, dict or
+                `RequestHeaders`.
+            timeout: Request timeout, in seconds.
+                Overrides the client's `timeout`.
 
         Returns:
             Response instance.
@@ -227,21 +918,32 @@ class HttpClient(object):
             RedirectError: when redirects limit reached.
             RequestError: on other errors related with request processing.
         """
-        return await self._client.request(RequestMethod.DELETE, url, headers, None)
+        return await self._client.request(
+            RequestMethod.DELETE, url, headers, None, to_ns(timeout), False
+        )
 
     async def post(
         self: "HttpClient",
         url: str,
-        body: bytes,
+        body: Optional[RequestBody] = None,
         /,
-        headers: Optional[Dict[str, bytes]] = None,
+        headers: Optional[RequestHeadersType] = None,
+        timeout: Optional[float] = None,
+        json: object = NO_JSON,
     ) -> Response:
         """Send HTTP POST request and receive a response.
 
         Args:
             url: Request url, use `*` to get options for server.
             body: Request body.
-            headers: Optional request headers.
+            headers: Optional request headers, dict or
+                `RequestHeaders`.
+            timeout: Request timeout, in seconds.
+                Overrides the client's `timeout`.
+            json: Object to send as JSON body, instead of `body`.
+                Serialized natively, sets `Content-Type`
+                to `application/json` unless set in `headers`.
+                `None` is sent as JSON `null`.
 
         Returns:
             Response instance.
@@ -251,22 +953,40 @@ class HttpClient(object):
             ConnectionError: when failed to establish connection.
             RedirectError: when redirects limit reached.
             RequestError: on other errors related with request processing.
+            ValueError: if both `body` and `json` are set.
+            TypeError: if `json` is not serializable.
         """
-        return await self._client.request(RequestMethod.POST, url, headers, body)
+        return await self._client.request(
+            RequestMethod.POST,
+            url,
+            headers,
+            to_body(body, json),
+            to_ns(timeout),
+            False,
+        )
 
     async def put(
         self: "HttpClient",
         url: str,
-        body: bytes,
+        body: Optional[RequestBody] = None,
         /,
-        headers: Optional[Dict[str, bytes]] = None,
+        headers: Optional[RequestHeadersType] = None,
+        timeout: Optional[float] = None,
+        json: object = NO_JSON,
     ) -> Response:
         """Send HTTP PUT request and receive a response.
 
         Args:
             url: Request url, use `*` to get options for server.
             body: Request body.
-            headers: Optional request headers.
+            headers: Optional request headers, dict or
+                `RequestHeaders`.
+            timeout: Request timeout, in seconds.
+                Overrides the client's `timeout`.
+            json: Object to send as JSON body, instead of `body`.
+                Serialized natively, sets `Content-Type`
+                to `application/json` unless set in `headers`.
+                `None` is sent as JSON `null`.
 
         Returns:
             Response instance.
@@ -276,22 +996,40 @@ class HttpClient(object):
             ConnectionError: when failed to establish connection.
             RedirectError: when redirects limit reached.
             RequestError: on other errors related with request processing.
+            ValueError: if both `body` and `json` are set.
+            TypeError: if `json` is not serializable.
         """
-        return await self._client.request(RequestMethod.PUT, url, headers, body)
+        return await self._client.request(
+            RequestMethod.PUT,
+            url,
+            headers,
+            to_body(body, json),
+            to_ns(timeout),
+            False,
+        )
 
     async def patch(
         self: "HttpClient",
         url: str,
-        body: bytes,
+        body: Optional[RequestBody] = None,
         /,
-        headers: Optional[Dict[str, bytes]] = None,
+        headers: Optional[RequestHeadersType] = None,
+        timeout: Optional[float] = None,
+        json: object = NO_JSON,
     ) -> Response:
         """Send HTTP PATCH request and receive a response.
 
         Args:
             url: Request url, use `*` to get options for server.
             body: Request body.
-            headers: Optional request headers.
+            headers: Optional request headers, dict or
+                `RequestHeaders`.
+            timeout: Request timeout, in seconds.
+                Overrides the client's `timeout`.
+            json: Object to send as JSON body, instead of `body`.
+                Serialized natively, sets `Content-Type`
+                to `application/json` unless set in `headers`.
+                `None` is sent as JSON `null`.
 
         Returns:
             Response instance.
@@ -301,8 +1039,17 @@ class HttpClient(object):
             ConnectionError: when failed to establish connection.
             RedirectError: when redirects limit reached.
             RequestError: on other errors related with request processing.
+            ValueError: if both `body` and `json` are set.
+            TypeError: if `json` is not serializable.
         """
-        return await self._client.request(RequestMethod.PATCH, url, headers, body)
+        return await self._client.request(
+            RequestMethod.PATCH,
+            url,
+            headers,
+            to_body(body, json),
+            to_ns(timeout),
+            False,
+        )
 
 
 __all__ = ["HttpClient"]
@@ -13,12 +13,15 @@ Attributes:
 
 # Python modules
 import argparse
+import os
+import shutil
 import sys
+import tempfile
 from enum import IntEnum
 from http import HTTPStatus
 from typing import List, NoReturn, Optional
 
-from gufo.http import HttpError
+from gufo.http import HttpError, Response
 
 # Gufo HTTP modules
 from gufo.http.sync_client import HttpClient
@@ -47,6 +50,46 @@ class Cli(object):
             print(msg)
         sys.exit(1)
 
+    @staticmethod
+    def download(client: HttpClient, url: str, path: str) -> Response:
+        """
+        Download response body to file.
+
+        The body is written to the temporary file in the same
+        directory, which replaces `path` only on successful response.
+        So the existing file is left intact on errors.
+        Special files, like `/dev/stdout`, are written directly.
+
+        Args:
+            client: HttpClient instance.
+            url: Request url.
+            path: Output path.
+
+        Returns:
+            Response instance.
+        """
+        if os.path.exists(path) and not os.path.isfile(path):
+            return client.download(url, path)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(path)), prefix=".gufo-http-"
+        )
+        os.close(fd)
+        try:
+            r = client.download(url, tmp_path)
+            if r.status == HTTPStatus.OK.value:
+                # mkstemp creates file readable by owner only
+                if os.path.exists(path):
+                    shutil.copymode(path, tmp_path)
+                else:
+                    umask = os.umask(0)
+                    os.umask(umask)
+                    os.chmod(tmp_path, 0o666 & ~umask)
+                os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+        return r
+
     def run(self: "Cli", args: List[str]) -> ExitCode:
         """
         Parse command-line arguments and run appropriate command.
@@ -72,18 +115,18 @@ class Cli(object):
         # Fetch
         with HttpClient() as client:
             try:
-                r = client.get(url)
+                if output_path:
+                    # Write body directly to file
+                    r = self.download(client, url, output_path)
+                else:
+                    r = client.get(url)
             except (HttpError, ConnectionError, TimeoutError) as e:
                 self.die(f"ERROR: {e}")
+            except OSError as e:
+                self.die(f"ERROR: {e.strerror or e}")
             if r.status != HTTPStatus.OK.value:
                 self.die(f"Invalid response code: {r.status}")
-            if output_path:
-                try:
-                    with open(output_path, "w") as fp:
-                        fp.write(r.content.decode())
-                except OSError as e:
-                    self.die(f"ERROR: {e.args[1]}")
-            else:
+            if not output_path:
                 print(r.content.decode())
         return ExitCode.OK
 
@@ -32,10 +32,13 @@ class HttpdMode(Enum):
     Attributes:
         HTTP: HTTP Mode.
         HTTPS: HTTPS Mode.
+        HTTP3: HTTPS Mode with HTTP/3 (QUIC) on the same port.
+            Requires nginx with QUIC support.
     """
 
     HTTP = 0
     HTTPS = 1
+    HTTP3 = 2
 
 
 class Httpd(object):
@@ -43,6 +46,10 @@ class Httpd(object):
 
     Attributes:
         prefix: URL prefix.
+        ca_cert: Path to the CA certificate, issued server and
+            client certificates. HTTPS modes only.
+        client_cert: Path to the client certificate. HTTPS modes only.
+        client_key: Path to the client private key. HTTPS modes only.
 
     Args:
         path: nginx binary path. Auto-detect if None.
@@ -51,7 +58,9 @@ class Httpd(object):
         host: Server hostname.
         start_timeout: Maximum time to wait for nginx to start.
         check_config: Check nginx config on startup.
-        mode: HTTP or HTTPS
+        mode: HTTP, HTTPS, or HTTP3
+        verify_client: Require client certificate, issued by `ca_cert`.
+            HTTPS modes only.
     """
 
     def __init__(
@@ -63,6 +72,7 @@ class Httpd(object):
         start_timeout: float = 5.0,
         check_config: bool = True,
         mode: HttpdMode = HttpdMode.HTTP,
+        verify_client: bool = False,
     ) -> None:
         self._path = path or self._get_nginx_path()
         self._address = address
@@ -72,6 +82,10 @@ class Httpd(object):
         self._start_timeout = start_timeout
         self._check_config = check_config
         self._mode = mode
+        self._verify_client = verify_client
+        self.ca_cert: Optional[Path] = None
+        self.client_cert: Optional[Path] = None
+        self.client_key: Optional[Path] = None
         proto = "http" if mode == HttpdMode.HTTP else "https"
         self.prefix = f"{proto}://{host}:{port}"
 
@@ -152,6 +166,14 @@ http {{
             return 200 '{{"status":true}}';
         }}
 
+        location /headers/multi {{
+            add_header X-Gufo-HTTP "TEST1";
+            add_header X-Gufo-HTTP "TEST2";
+            add_header Set-Cookie "a=1; Expires=Wed, 21 Oct 2026 07:28:00 GMT";
+            add_header Set-Cookie "b=2";
+            return 200 '{{"status":true}}';
+        }}
+
         location /headers/check {{
             if ($http_x_gufo_http != "TEST") {{
                 return 403 '{{"status":false}}';
@@ -159,6 +181,23 @@ http {{
             return 200 '{{"status":true}}';
         }}
 
+        location /json {{
+            default_type application/json;
+            return 200 '{{"z":[1,-2,1.5,"a"],"a":{{"t":true,"n":null}}}}';
+        }}
+
+        location /json/numbers {{
+            default_type application/json;
+            return 200 '[123456789012345678901234567890,-123456789012345678901234567890,18446744073709551615,-9223372036854775808,0.1,1e19]';
+        }}
+
+        location /json/check {{
+            if ($http_content_type != "application/json") {{
+                return 415;
+            }}
+            return 200 "OK";
+        }}
+
         location /cookie/get {{
             add_header Set-Cookie "gufo-http=test; Path=/";
             return 200 '{{"status":true}}';
@@ -242,6 +281,14 @@ http {{
             return 401;
         }}
 
+        location /upload/ {{
+            root {root};
+            dav_methods PUT;
+            create_full_put_path on;
+            client_max_body_size 0;
+            client_body_temp_path {root}/.upload;
+        }}
+
         location / {{
             root {root};
         }}
@@ -256,6 +303,23 @@ http {{
         user = getuser()
         user_cfg = f"user {user};" if user == "root" else ""
         pid = root / ".nginx.pid"
+        http3 = self._mode == HttpdMode.HTTP3
+        quic_cfg = (
+            f"""listen {self._port} quic reuseport;
+        http3 on;
+        ssl_early_data on;
+        add_header Alt-Svc 'h3=":{self._port}"; ma=86400';"""
+            if http3
+            else ""
+        )
+        # 0-RTT requires session tickets
+        tickets = "on" if http3 else "off"
+        verify_cfg = (
+            f"""ssl_client_certificate {cert_root}/ca.pem;
+        ssl_verify_client on;"""
+            if self._verify_client
+            else ""
+        )
         return f"""daemon off;
 {user_cfg}
 worker_processes auto;
@@ -284,9 +348,11 @@ http {{
 
     server {{
         listen {self._port} ssl http2;
+        {quic_cfg}
         server_name {self._host} localhost 127.0.0.1 {self._hostname};
-        ssl_certificate {cert_root}/cert.pem;
-        ssl_certificate_key {cert_root}/key.pem;
+        ssl_certificate {cert_root}/server.pem;
+        ssl_certificate_key {cert_root}/server-key.pem;
+        {verify_cfg}
 
         # Global SSL settings
         ssl_protocols TLSv1.3 TLSv1.2;
@@ -298,7 +364,7 @@ http {{
         ssl_stapling_verify on;
         ssl_session_cache shared:le_nginx_SSL:10m;
         ssl_session_timeout 1440m;
-        ssl_session_tickets off;
+        ssl_session_tickets {tickets};
         ssl_ciphers "ECDHE-ECDSA-AES128-GCM-SHA256:ECDHE-RSA-AES128-GCM-SHA256:ECDHE-ECDSA-AES256-GCM-SHA384:ECDHE-RSA-AES256-GCM-SHA384:ECDHE-ECDSA-CHACHA20-POLY1305:ECDHE-RSA-CHACHA20-POLY1305:DHE-RSA-AES128-GCM-SHA256:DHE-RSA-AES256-GCM-SHA384";
 
         location / {{
@@ -326,30 +392,8 @@ http {{
         with open(cfg_path, "w") as fp:
             fp.write(cfg)
         # Generate certificates
-        if self._mode == HttpdMode.HTTPS:
-            cert_root = dn / "ssl"
-            cert_path = cert_root / "cert.pem"
-            key_path = cert_root / "key.pem"
-            os.mkdir(cert_root)
-            subprocess.check_call(
-                [
-                    "openssl",
-                    "req",
-                    "-x509",
-                    "-newkey",
-                    "rsa:4096",
-                    "-keyout",
-                    str(key_path),
-                    "-out",
-                    str(cert_path),
-                    "-sha256",
-                    "-days",
-                    "90",
-                    "-nodes",
-                    "-subj",
-                    f"/C=IT/ST=Milano/L=Milano/O=GufoLabs/OU=Gufo HTTP/CN={self._host}",
-                ],
-            )
+        if self._mode != HttpdMode.HTTP:
+            self._gen_certs(dn / "ssl")
         # Write data
         os.mkdir(data_path)
         # index.html
@@ -389,6 +433,93 @@ http {{
         self._wait()
         self._consume_stdout()
 
+    def _gen_certs(self: "Httpd", cert_root: Path) -> None:
+        """Generate CA, server, and client certificates."""
+        os.mkdir(cert_root)
+        subj = "/C=IT/ST=Milano/L=Milano/O=GufoLabs/OU=Gufo HTTP"
+        # CA
+        ca_path = cert_root / "ca.pem"
+        ca_key_path = cert_root / "ca-key.pem"
+        subprocess.check_call(
+            [
+                "openssl",
+                "req",
+                "-x509",
+                "-newkey",
+                "rsa:2048",
+                "-keyout",
+                str(ca_key_path),
+                "-out",
+                str(ca_path),
+                "-sha256",
+                "-days",
+                "90",
+                "-nodes",
+                "-subj",
+                f"{subj}/CN=Gufo HTTP Test CA",
+                "-addext",
+                "keyUsage=critical,keyCertSign,cRLSign",
+            ],
+        )
+        # Server and client certificates, issued by CA
+        issued = [
+            (
+                "server",
+                self._host,
+                [
+                    f"subjectAltName=DNS:{self._host},DNS:localhost,IP:127.0.0.1",
+                    "extendedKeyUsage=serverAuth",
+                ],
+            ),
+            ("client", "client", ["extendedKeyUsage=clientAuth"]),
+        ]
+        for name, cn, ext in issued:
+            key_path = cert_root / f"{name}-key.pem"
+            csr_path = cert_root / f"{name}.csr"
+            ext_path = cert_root / f"{name}.ext"
+            with open(ext_path, "w") as fp:
+                fp.write("\n".join(["basicConstraints=CA:FALSE", *ext, ""]))
+            subprocess.check_call(
+                [
+                    "openssl",
+                    "req",
+                    "-new",
+                    "-newkey",
+                    "rsa:2048",
+                    "-keyout",
+                    str(key_path),
+                    "-out",
+                    str(csr_path),
+                    "-nodes",
+                    "-subj",
+                    f"{subj}/CN={cn}",
+                ],
+            )
+            subprocess.check_call(
+                [
+                    "openssl",
+                    "x509",
+                    "-req",
+                    "-in",
+                    str(csr_path),
+                    "-CA",
+                    str(ca_path),
+                    "-CAkey",
+                    str(ca_key_path),
+                    "-CAcreateserial",
+                    "-out",
+                    str(cert_root / f"{name}.pem"),
+                    "-sha256",
+                    "-days",
+                    "90",
+                    "-extfile",
+                    str(ext_path),
+                ],
+            )
+        self.ca_cert = ca_path
+        self.client_cert = cert_root / "client.pem"
+        self.client_key = cert_root / "client-key.pem"
+
     def _wait(self: "Httpd") -> None:
         """Wait until nginx is ready."""
         if self._proc is None:
@@ -7,7 +7,15 @@
 """Various utilities."""
 
 # Python modules
-from typing import Dict, Optional
+from typing import Dict, Optional, TypeVar, Union
+
+# Gufo HTTP modules
+from ._fast import JsonBody
+
+T = TypeVar("T")
+
+# Default of `json` argument, so JSON null may be sent
+NO_JSON = object()
 
 
 def merge_dict(
@@ -35,3 +43,40 @@ def merge_dict(
     r.update(x)
     r.update(y)
     return r
+
+
+def to_ns(seconds: Optional[float]) -> Optional[int]:
+    """Convert optional timeout to nanoseconds.
+
+    Args:
+        seconds: Timeout in seconds.
+
+    Returns:
+        * None, if seconds is None.
+        * Timeout in nanoseconds.
+    """
+    if seconds is None:
+        return None
+    return int(seconds * 1_000_000_000)
+
+
+def to_body(body: Optional[T], json: object = NO_JSON) -> Union[T, JsonBody, None]:
+    """Get request body from either `body` or `json` argument.
+
+    Args:
+        body: Request body.
+        json: Object to be serialized to JSON.
+
+    Returns:
+        * `body`, if `json` is not set.
+        * `JsonBody`, otherwise.
+
+    Raises:
+        ValueError: if both `body` and `json` are set.
+    """
+    if json is NO_JSON:
+        return body
+    if body is not None:
+        msg = "body and json are mutually exclusive"
+        raise ValueError(msg)
+    return JsonBody(json)
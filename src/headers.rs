@@ -4,16 +4,41 @@
 // Copyright (C) 2024-25, Gufo Labs
 // See LICENSE.md for details
 // ------------------------------------------------------------------------
-use pyo3::{exceptions::PyKeyError, prelude::*, types::PyBytes};
-use reqwest::header::HeaderMap;
+use crate::error::GufoHttpError;
+use pyo3::{
+    exceptions::PyKeyError,
+    prelude::*,
+    types::{PyBytes, PyDict, PyList, PyString},
+};
+use reqwest::header::{self, HeaderMap, HeaderName, HeaderValue};
+use std::{borrow::Cow, sync::Arc};
 
+// Response headers.
+// Immutable, so shared by clones without copying.
 #[derive(Clone)]
-#[pyclass]
-pub struct Headers(HeaderMap);
+#[pyclass(frozen)]
+pub struct Headers(Arc<HeaderMap>);
 
 impl Headers {
     pub fn new(headers: HeaderMap) -> Self {
-        Self(headers)
+        Self(Arc::new(headers))
+    }
+    // Borrow the map for iterator.
+    // Returns the map and the reference keeping it alive.
+    //
+    // # Safety
+    //
+    // The returned map is valid only while the returned `Arc`
+    // is alive. The caller must store both together, must not
+    // expose the `'static` lifetime outside, and must drop
+    // everything borrowed from the map before the `Arc`.
+    // The map is never mutated, as `Headers` is immutable.
+    unsafe fn borrow(&self) -> (&'static HeaderMap, Arc<HeaderMap>) {
+        let owner = self.0.clone();
+        // SAFETY: The map lives on the heap until the last
+        // reference is dropped, the caller keeps one.
+        let map = unsafe { &*Arc::as_ptr(&owner) };
+        (map, owner)
     }
 }
 
@@ -28,6 +53,13 @@ impl Headers {
     fn __contains__(&self, key: &str) -> bool {
         self.0.contains_key(key)
     }
+    // Number of distinct header names
+    fn __len__(&self) -> usize {
+        self.0.keys_len()
+    }
+    fn __iter__(&self) -> KeysIterator {
+        self.keys()
+    }
     #[pyo3(signature = (key, default = None))]
     fn get<'a>(
         &'a self,
@@ -43,81 +75,211 @@ impl Headers {
             },
         }
     }
+    // All values of the header, in order of appearance
+    fn get_all<'a>(&self, key: &str, py: Python<'a>) -> PyResult<Bound<'a, PyList>> {
+        let r = PyList::empty(py);
+        for v in self.0.get_all(key) {
+            r.append(PyBytes::new(py, v.as_ref()))?;
+        }
+        Ok(r)
+    }
+    // Convert to dict in one pass.
+    // Names are lowercase, multiple values are joined with ", "
+    // or collected to list if `multi` is set.
+    // Set-Cookie values may contain commas, so they are
+    // always collected to list.
+    // Values are decoded as ISO-8859-1 if `decode` is set.
+    #[pyo3(signature = (decode = false, multi = false))]
+    fn to_dict<'a>(
+        &self,
+        decode: bool,
+        multi: bool,
+        py: Python<'a>,
+    ) -> PyResult<Bound<'a, PyDict>> {
+        let r = PyDict::new(py);
+        for name in self.0.keys() {
+            let values = self.0.get_all(name);
+            let value = if multi || name == header::SET_COOKIE {
+                let list = PyList::empty(py);
+                for v in values {
+                    list.append(to_py(py, v.as_bytes(), decode))?;
+                }
+                list.into_any()
+            } else {
+                let mut iter = values.iter();
+                let first = iter.next().map(|v| v.as_bytes()).unwrap_or_default();
+                match iter.next() {
+                    None => to_py(py, first, decode),
+                    Some(second) => {
+                        let mut buf = first.to_vec();
+                        for v in std::iter::once(second).chain(iter) {
+                            buf.extend_from_slice(b", ");
+                            buf.extend_from_slice(v.as_bytes());
+                        }
+                        to_py(py, &buf, decode)
+                    }
+                }
+            };
+            r.set_item(name.as_str(), value)?;
+        }
+        Ok(r)
+    }
     fn keys(&self) -> KeysIterator {
-        KeysIterator(
-            self.0
-                .keys()
-                .map(|x| x.to_string())
-                .collect::<Vec<_>>()
-                .into_iter(),
-        )
+        // SAFETY: The iterator keeps the owner and drops
+        // the borrowed iterator first.
+        let (map, _owner) = unsafe { self.borrow() };
+        KeysIterator {
+            iter: map.keys(),
+            _owner,
+        }
     }
     fn values(&self) -> ValuesIterator {
-        ValuesIterator(
-            self.0
-                .values()
-                .map(|x| x.as_ref().to_owned().into_boxed_slice())
-                .collect::<Vec<_>>()
-                .into_iter(),
-        )
+        // SAFETY: The iterator keeps the owner and drops
+        // the borrowed iterator first.
+        let (map, _owner) = unsafe { self.borrow() };
+        ValuesIterator {
+            iter: map.values(),
+            _owner,
+        }
     }
     fn items(&self) -> ItemsIterator {
-        ItemsIterator(
-            self.0
-                .iter()
-                .map(|(k, v)| (k.to_string(), v.as_ref().to_owned().into_boxed_slice()))
-                .collect::<Vec<_>>()
-                .into_iter(),
-        )
+        // SAFETY: The iterator keeps the owner and drops
+        // the borrowed iterator first.
+        let (map, _owner) = unsafe { self.borrow() };
+        ItemsIterator {
+            iter: map.iter(),
+            _owner,
+        }
+    }
+}
+
+// Header value as bytes or str
+fn to_py<'a>(py: Python<'a>, value: &[u8], decode: bool) -> Bound<'a, PyAny> {
+    if decode {
+        PyString::new(py, &latin1(value)).into_any()
+    } else {
+        PyBytes::new(py, value).into_any()
     }
 }
 
-// Keys iterator
-// Very ineffective as pyo3 doesn't support lifetime.
+// Decode ISO-8859-1, borrowing ASCII as is
+fn latin1(value: &[u8]) -> Cow<'_, str> {
+    match std::str::from_utf8(value) {
+        Ok(s) if value.is_ascii() => Cow::Borrowed(s),
+        _ => Cow::Owned(value.iter().map(|&b| char::from(b)).collect()),
+    }
+}
+
+// Keys iterator.
+// Walks the map directly, fields are dropped in order of declaration.
 #[pyclass]
-pub struct KeysIterator(std::vec::IntoIter<String>);
+pub struct KeysIterator {
+    iter: header::Keys<'static, HeaderValue>,
+    _owner: Arc<HeaderMap>,
+}
 
 #[pymethods]
 impl KeysIterator {
     fn __iter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
         slf
     }
-    fn __next__(mut slf: PyRefMut<'_, Self>) -> Option<String> {
-        slf.0.next()
+    fn __next__(&mut self) -> Option<&str> {
+        self.iter.next().map(|k| k.as_str())
     }
 }
 
-// Values iterator
-// Very ineffective as pyo3 doesn't support lifetime.
+// Values iterator.
+// Walks the map directly, fields are dropped in order of declaration.
 #[pyclass]
-pub struct ValuesIterator(std::vec::IntoIter<Box<[u8]>>);
+pub struct ValuesIterator {
+    iter: header::Values<'static, HeaderValue>,
+    _owner: Arc<HeaderMap>,
+}
 
 #[pymethods]
 impl ValuesIterator {
     fn __iter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
         slf
     }
-    fn __next__(mut slf: PyRefMut<'_, Self>, py: Python) -> Option<Py<PyAny>> {
-        slf.0.next().map(|boxed| {
-            let bytes = PyBytes::new(py, &boxed);
-            bytes.into()
-        })
+    fn __next__<'a>(&mut self, py: Python<'a>) -> Option<Bound<'a, PyBytes>> {
+        self.iter.next().map(|v| PyBytes::new(py, v.as_ref()))
     }
 }
-// Items iterator
-// Very ineffective as pyo3 doesn't support lifetime.
+
+// Items iterator.
+// Walks the map directly, fields are dropped in order of declaration.
 #[pyclass]
-pub struct ItemsIterator(std::vec::IntoIter<(String, Box<[u8]>)>);
+pub struct ItemsIterator {
+    iter: header::Iter<'static, HeaderValue>,
+    _owner: Arc<HeaderMap>,
+}
 
 #[pymethods]
 impl ItemsIterator {
     fn __iter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
         slf
     }
-    fn __next__(mut slf: PyRefMut<'_, Self>, py: Python) -> Option<(String, Py<PyAny>)> {
-        slf.0.next().map(|(k, v)| {
-            let bytes = PyBytes::new(py, &v);
-            (k, bytes.into())
-        })
+    fn __next__<'a>(&mut self, py: Python<'a>) -> Option<(&str, Bound<'a, PyBytes>)> {
+        self.iter
+            .next()
+            .map(|(k, v)| (k.as_str(), PyBytes::new(py, v.as_ref())))
+    }
+}
+
+// Request headers, parsed and validated once.
+// May be passed to requests instead of dict.
+#[pyclass(frozen)]
+pub struct RequestHeaders(HeaderMap);
+
+#[pymethods]
+impl RequestHeaders {
+    #[new]
+    fn new(headers: &Bound<'_, PyDict>) -> PyResult<Self> {
+        Ok(Self(parse_headers(headers)?))
+    }
+    // Number of distinct header names, same as Headers
+    fn __len__(&self) -> usize {
+        self.0.keys_len()
+    }
+}
+
+// Parse dict of name -> value
+pub fn parse_headers(headers: &Bound<'_, PyDict>) -> PyResult<HeaderMap> {
+    let mut map = HeaderMap::with_capacity(headers.len());
+    for (k, v) in headers {
+        map.insert(header_name(&k)?, header_value(&v)?);
+    }
+    Ok(map)
+}
+
+// Add request headers to the map, replacing existing ones.
+// Headers are either dict or RequestHeaders.
+pub fn merge_headers(map: &mut HeaderMap, headers: &Bound<'_, PyAny>) -> PyResult<()> {
+    if let Ok(h) = headers.downcast::<RequestHeaders>() {
+        // Already validated, cheap to clone
+        for (k, v) in &h.get().0 {
+            map.insert(k.clone(), v.clone());
+        }
+        return Ok(());
+    }
+    for (k, v) in headers.downcast::<PyDict>()? {
+        map.insert(header_name(&k)?, header_value(&v)?);
     }
+    Ok(())
+}
+
+// Standard names are static in http crate,
+// custom ones are validated and allocated.
+// Use RequestHeaders to parse headers once.
+fn header_name(key: &Bound<'_, PyAny>) -> PyResult<HeaderName> {
+    let key = key.downcast::<PyString>()?.to_str()?;
+    Ok(HeaderName::from_bytes(key.as_bytes())
+        .map_err(|e| GufoHttpError::ValueError(e.to_string()))?)
+}
+
+fn header_value(value: &Bound<'_, PyAny>) -> PyResult<HeaderValue> {
+    Ok(
+        HeaderValue::from_bytes(value.downcast::<PyBytes>()?.as_bytes())
+            .map_err(|e| GufoHttpError::ValueError(e.to_string()))?,
+    )
 }
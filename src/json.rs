@@ -0,0 +1,205 @@
+// ------------------------------------------------------------------------
+// Gufo HTTP: JSON processing
+// ------------------------------------------------------------------------
+// Copyright (C) 2025, Gufo Labs
+// See LICENSE.md for details
+// ------------------------------------------------------------------------
+use bytes::Bytes;
+use pyo3::{
+    IntoPyObjectExt,
+    exceptions::{PyTypeError, PyValueError},
+    prelude::*,
+    types::{PyBool, PyBytes, PyDict, PyFloat, PyInt, PyList, PyString, PyTuple},
+};
+use serde_json::Value;
+
+// Maximal nesting of serialized documents,
+// same as serde_json's parser limit
+const MAX_DEPTH: usize = 128;
+
+// Request body, serialized to JSON.
+// Immutable, may be reused between requests.
+#[pyclass(frozen)]
+pub struct JsonBody(Bytes);
+
+impl JsonBody {
+    // Serialized document, cheap to clone
+    pub fn bytes(&self) -> Bytes {
+        self.0.clone()
+    }
+}
+
+#[pymethods]
+impl JsonBody {
+    #[new]
+    fn new(obj: &Bound<'_, PyAny>) -> PyResult<Self> {
+        let mut buf = Vec::new();
+        serialize(obj, &mut buf, 0)?;
+        Ok(Self(buf.into()))
+    }
+    fn __len__(&self) -> usize {
+        self.0.len()
+    }
+    fn __bytes__<'a>(&self, py: Python<'a>) -> Bound<'a, PyBytes> {
+        PyBytes::new(py, self.0.as_ref())
+    }
+}
+
+// Parse JSON document.
+// Doesn't touch Python objects, so may be called without GIL.
+pub fn parse(buf: &[u8]) -> PyResult<Value> {
+    serde_json::from_slice(buf).map_err(|e| PyValueError::new_err(format!("invalid JSON: {e}")))
+}
+
+// Serialize Python object directly into the buffer.
+// Accepts None, bool, int, float, str, dict with str keys,
+// list and tuple.
+fn serialize(obj: &Bound<'_, PyAny>, buf: &mut Vec<u8>, depth: usize) -> PyResult<()> {
+    if depth > MAX_DEPTH {
+        return Err(PyValueError::new_err("JSON nesting is too deep"));
+    }
+    if obj.is_none() {
+        buf.extend_from_slice(b"null");
+    } else if let Ok(b) = obj.downcast::<PyBool>() {
+        // Checked before int, as bool is a subclass of int
+        let v: &[u8] = if b.is_true() { b"true" } else { b"false" };
+        buf.extend_from_slice(v);
+    } else if let Ok(i) = obj.downcast::<PyInt>() {
+        if let Ok(v) = i.extract::<i64>() {
+            write(buf, &v)?;
+        } else if let Ok(v) = i.extract::<u64>() {
+            write(buf, &v)?;
+        } else {
+            // Arbitrary precision, int.__repr__ is safe for subclasses
+            let r = obj
+                .py()
+                .get_type::<PyInt>()
+                .call_method1("__repr__", (i,))?;
+            buf.extend_from_slice(r.downcast::<PyString>()?.to_str()?.as_bytes());
+        }
+    } else if let Ok(f) = obj.downcast::<PyFloat>() {
+        let v = f.value();
+        if !v.is_finite() {
+            return Err(PyValueError::new_err(format!(
+                "out of range float values are not JSON compliant: {v}"
+            )));
+        }
+        write(buf, &v)?;
+    } else if let Ok(s) = obj.downcast::<PyString>() {
+        write(buf, s.to_str()?)?;
+    } else if let Ok(d) = obj.downcast::<PyDict>() {
+        buf.push(b'{');
+        for (n, (k, v)) in d.iter().enumerate() {
+            if n > 0 {
+                buf.push(b',');
+            }
+            let Ok(k) = k.downcast::<PyString>() else {
+                return Err(PyTypeError::new_err("JSON keys must be str"));
+            };
+            write(buf, k.to_str()?)?;
+            buf.push(b':');
+            serialize(&v, buf, depth + 1)?;
+        }
+        buf.push(b'}');
+    } else if let Ok(items) = obj.downcast::<PyList>() {
+        serialize_array(items.iter(), buf, depth)?;
+    } else if let Ok(items) = obj.downcast::<PyTuple>() {
+        serialize_array(items.iter(), buf, depth)?;
+    } else {
+        return Err(PyTypeError::new_err(format!(
+            "Object of type {} is not JSON serializable",
+            obj.get_type().name()?
+        )));
+    }
+    Ok(())
+}
+
+fn serialize_array<'py>(
+    items: impl Iterator<Item = Bound<'py, PyAny>>,
+    buf: &mut Vec<u8>,
+    depth: usize,
+) -> PyResult<()> {
+    buf.push(b'[');
+    for (n, item) in items.enumerate() {
+        if n > 0 {
+            buf.push(b',');
+        }
+        serialize(&item, buf, depth + 1)?;
+    }
+    buf.push(b']');
+    Ok(())
+}
+
+// Write scalar value, escaping strings
+fn write<T: serde::Serialize + ?Sized>(buf: &mut Vec<u8>, value: &T) -> PyResult<()> {
+    serde_json::to_writer(buf, value).map_err(|e| PyValueError::new_err(e.to_string()))
+}
+
+// Convert parsed document to Python objects.
+// The parser reads integers out of 64-bit range as floats,
+// losing precision. Such documents are rare, so they are
+// detected here and parsed by `json` module from `body` instead.
+pub fn to_py<'a>(py: Python<'a>, value: &Value, body: &[u8]) -> PyResult<Bound<'a, PyAny>> {
+    match convert(py, value) {
+        Ok(r) => Ok(r),
+        Err(ConvertError::Py(e)) => Err(e),
+        Err(ConvertError::Inexact) => py
+            .import("json")?
+            .call_method1("loads", (PyBytes::new(py, body),)),
+    }
+}
+
+enum ConvertError {
+    Py(PyErr),
+    // Number may be an integer out of 64-bit range
+    Inexact,
+}
+
+impl From<PyErr> for ConvertError {
+    fn from(e: PyErr) -> Self {
+        ConvertError::Py(e)
+    }
+}
+
+// Floats parsed from integers out of 64-bit range are integral
+// and out of range too. Float literals may match as well,
+// they are parsed by `json` module with the same result.
+fn is_inexact(v: f64) -> bool {
+    v.fract() == 0.0 && !(-9_223_372_036_854_775_808.0..18_446_744_073_709_551_616.0).contains(&v)
+}
+
+// Nesting is limited by parser, so recursion is safe.
+fn convert<'a>(py: Python<'a>, value: &Value) -> Result<Bound<'a, PyAny>, ConvertError> {
+    Ok(match value {
+        Value::Null => py.None().into_bound(py),
+        Value::Bool(b) => PyBool::new(py, *b).to_owned().into_any(),
+        Value::Number(n) => {
+            if let Some(i) = n.as_i64() {
+                i.into_bound_py_any(py)?
+            } else if let Some(u) = n.as_u64() {
+                u.into_bound_py_any(py)?
+            } else {
+                let v = n.as_f64().unwrap_or(f64::NAN);
+                if is_inexact(v) {
+                    return Err(ConvertError::Inexact);
+                }
+                v.into_bound_py_any(py)?
+            }
+        }
+        Value::String(s) => PyString::new(py, s).into_any(),
+        Value::Array(items) => {
+            let items = items
+                .iter()
+                .map(|item| convert(py, item))
+                .collect::<Result<Vec<_>, _>>()?;
+            PyList::new(py, items)?.into_any()
+        }
+        Value::Object(map) => {
+            let r = PyDict::new(py);
+            for (k, v) in map {
+                r.set_item(PyString::new(py, k), convert(py, v)?)?;
+            }
+            r.into_any()
+        }
+    })
+}
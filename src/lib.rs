@@ -8,12 +8,22 @@
 use pyo3::prelude::*;
 mod async_client;
 mod auth;
+mod batch;
+mod body;
+mod dispatch;
 mod error;
 mod headers;
+mod json;
 mod method;
+mod pool;
 mod proxy;
+mod resolver;
 mod response;
+mod runtime;
+mod stream;
 mod sync_client;
+mod tls;
+mod transport;
 
 /// Internal implementation in native codes.
 ///
@@ -26,6 +36,7 @@ mod sync_client;
 ///     DEFLATE: Deflate method for `compression` argument.
 ///     GZIP: GZIP method for `compression` argument.
 ///     BROTLI: Brotli method for `compression` argument.
+///     HTTP3: True if HTTP/3 support is compiled in.
 #[pymodule]
 #[pyo3(name = "_fast")]
 fn gufo_http(py: Python, m: &Bound<'_, PyModule>) -> PyResult<()> {
@@ -39,17 +50,30 @@ fn gufo_http(py: Python, m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add("GZIP", method::GZIP)?;
     m.add("BROTLI", method::BROTLI)?;
     m.add("ZSTD", method::ZSTD)?;
+    // Optional features
+    m.add("HTTP3", cfg!(feature = "http3"))?;
     // Auth
     m.add_class::<auth::AuthBase>()?;
     m.add_class::<auth::BasicAuth>()?;
     m.add_class::<auth::BearerAuth>()?;
     // Proxy
     m.add_class::<proxy::Proxy>()?;
+    // TLS
+    m.add_class::<tls::TlsConfig>()?;
     // Other
     m.add_class::<headers::Headers>()?;
+    m.add_class::<headers::RequestHeaders>()?;
+    m.add_class::<json::JsonBody>()?;
     m.add_class::<response::Response>()?;
+    m.add_class::<response::ResponseBody>()?;
+    m.add_class::<stream::AsyncStreamResponse>()?;
+    m.add_class::<stream::SyncStreamResponse>()?;
+    // Runtime
+    m.add_function(wrap_pyfunction!(runtime::configure_runtime, m)?)?;
     // Clients
     m.add_class::<async_client::AsyncClient>()?;
     m.add_class::<sync_client::SyncClient>()?;
+    m.add_class::<transport::AsyncTransport>()?;
+    m.add_class::<transport::SyncTransport>()?;
     Ok(())
 }
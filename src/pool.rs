@@ -0,0 +1,128 @@
+// ------------------------------------------------------------------------
+// Gufo HTTP: Connection pool statistics
+// ------------------------------------------------------------------------
+// Copyright (C) 2024-25, Gufo Labs
+// See LICENSE.md for details
+// ------------------------------------------------------------------------
+use pyo3::{prelude::*, types::PyDict};
+use reqwest::Url;
+use std::collections::HashMap;
+use std::ops::{Deref, DerefMut};
+use std::sync::{
+    Arc, PoisonError, RwLock,
+    atomic::{AtomicU64, AtomicUsize, Ordering},
+};
+
+// Per-host request statistics.
+// reqwest doesn't expose the state of the connection pool,
+// so only the requests in progress are tracked by the client,
+// not the open or idle connections.
+#[derive(Default)]
+pub struct PoolStats(RwLock<HashMap<String, Vec<Origin>>>);
+
+// Connections are pooled by scheme and authority,
+// so host's origins are told apart by scheme and port.
+struct Origin {
+    scheme: Box<str>,
+    port: u16,
+    stats: Arc<HostStats>,
+}
+
+#[derive(Default)]
+struct HostStats {
+    // Requests in progress
+    in_use: AtomicUsize,
+    // Total requests
+    requests: AtomicU64,
+}
+
+impl PoolStats {
+    // Start tracking the request
+    pub fn acquire(&self, url: &Url) -> InUse {
+        let stats = self.get_or_insert(url);
+        stats.in_use.fetch_add(1, Ordering::Relaxed);
+        stats.requests.fetch_add(1, Ordering::Relaxed);
+        InUse(stats)
+    }
+    // Counters of the origin.
+    // Allocates only when the origin is seen for the first time.
+    fn get_or_insert(&self, url: &Url) -> Arc<HostStats> {
+        let host = url.host_str().unwrap_or_default();
+        let scheme = url.scheme();
+        let port = url.port_or_known_default().unwrap_or_default();
+        if let Some(stats) = self
+            .0
+            .read()
+            .unwrap_or_else(PoisonError::into_inner)
+            .get(host)
+            .and_then(|origins| find(origins, scheme, port))
+        {
+            return stats;
+        }
+        let mut hosts = self.0.write().unwrap_or_else(PoisonError::into_inner);
+        let origins = hosts.entry(host.to_string()).or_default();
+        // May be inserted concurrently
+        if let Some(stats) = find(origins, scheme, port) {
+            return stats;
+        }
+        let stats = Arc::new(HostStats::default());
+        origins.push(Origin {
+            scheme: scheme.into(),
+            port,
+            stats: stats.clone(),
+        });
+        stats
+    }
+    // Convert to dict of scheme://host:port -> {"in_use": ..., "requests": ...}
+    pub fn to_dict<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyDict>> {
+        let r = PyDict::new(py);
+        for (host, origins) in self.0.read().unwrap_or_else(PoisonError::into_inner).iter() {
+            for origin in origins {
+                let item = PyDict::new(py);
+                item.set_item("in_use", origin.stats.in_use.load(Ordering::Relaxed))?;
+                item.set_item("requests", origin.stats.requests.load(Ordering::Relaxed))?;
+                r.set_item(
+                    format!("{}://{}:{}", origin.scheme, host, origin.port),
+                    item,
+                )?;
+            }
+        }
+        Ok(r)
+    }
+}
+
+fn find(origins: &[Origin], scheme: &str, port: u16) -> Option<Arc<HostStats>> {
+    origins
+        .iter()
+        .find(|o| o.port == port && &*o.scheme == scheme)
+        .map(|o| o.stats.clone())
+}
+
+// Request in progress, released on drop.
+pub struct InUse(Arc<HostStats>);
+
+impl Drop for InUse {
+    fn drop(&mut self) {
+        self.0.in_use.fetch_sub(1, Ordering::Relaxed);
+    }
+}
+
+// Value holding the request in progress until dropped.
+pub struct Tracked<T> {
+    pub inner: T,
+    pub in_use: InUse,
+}
+
+impl<T> Deref for Tracked<T> {
+    type Target = T;
+
+    fn deref(&self) -> &T {
+        &self.inner
+    }
+}
+
+impl<T> DerefMut for Tracked<T> {
+    fn deref_mut(&mut self) -> &mut T {
+        &mut self.inner
+    }
+}
@@ -0,0 +1,307 @@
+// ------------------------------------------------------------------------
+// Gufo HTTP: DNS resolver with cache
+// ------------------------------------------------------------------------
+// Copyright (C) 2024-25, Gufo Labs
+// See LICENSE.md for details
+// ------------------------------------------------------------------------
+use futures_util::future::join_all;
+use hickory_resolver::{TokioAsyncResolver, config::LookupIpStrategy, system_conf};
+use pyo3::{
+    exceptions::{PyTypeError, PyValueError},
+    prelude::*,
+    types::{PyDict, PyList},
+};
+use reqwest::dns::{Addrs, Name, Resolve, Resolving};
+use std::{
+    collections::HashMap,
+    io,
+    net::{IpAddr, SocketAddr},
+    sync::{
+        Arc, Mutex, MutexGuard, PoisonError,
+        atomic::{AtomicU64, Ordering},
+    },
+    time::{Duration, Instant},
+};
+use tokio::sync::OnceCell;
+
+// Resolved addresses, shared between cache and requests
+type Addresses = Arc<[SocketAddr]>;
+
+// Host name resolver.
+// Pinned addresses take precedence over the cache.
+// Cache misses are resolved by hickory-dns, like reqwest does by default.
+#[derive(Clone)]
+pub struct Resolver(Arc<ResolverInner>);
+
+struct ResolverInner {
+    overrides: HashMap<String, Addresses>,
+    cache: Option<DnsCache>,
+    // Created on first lookup, within the runtime
+    hickory: OnceCell<TokioAsyncResolver>,
+}
+
+impl Resolver {
+    pub fn new(overrides: HashMap<String, Addresses>, cache: Option<DnsCache>) -> Self {
+        Resolver(Arc::new(ResolverInner {
+            overrides,
+            cache,
+            hickory: OnceCell::new(),
+        }))
+    }
+    // Parse dict of host -> address.
+    // Ports are set by requests.
+    pub fn parse_overrides(
+        resolve: Option<&Bound<'_, PyDict>>,
+    ) -> PyResult<HashMap<String, Addresses>> {
+        let mut r = HashMap::new();
+        if let Some(resolve) = resolve {
+            for (host, addr) in resolve {
+                let host = host
+                    .extract::<String>()
+                    .map_err(|_| PyTypeError::new_err("resolve keys must be str"))?;
+                let addr = addr
+                    .extract::<String>()
+                    .map_err(|_| PyTypeError::new_err("resolve values must be str"))?
+                    .parse::<IpAddr>()
+                    .map_err(|e| PyValueError::new_err(format!("invalid address: {e}")))?;
+                r.insert(host, Arc::from([SocketAddr::new(addr, 0)]));
+            }
+        }
+        Ok(r)
+    }
+    // Resolver must replace the default one
+    pub fn is_enabled(&self) -> bool {
+        self.0.cache.is_some()
+    }
+    // Iterate over pinned addresses
+    pub fn overrides(&self) -> impl Iterator<Item = (&str, &[SocketAddr])> {
+        self.0
+            .overrides
+            .iter()
+            .map(|(host, addrs)| (host.as_str(), addrs.as_ref()))
+    }
+    // Resolve host
+    pub async fn lookup(&self, host: &str) -> io::Result<Addresses> {
+        if let Some(addrs) = self.0.overrides.get(host) {
+            return Ok(addrs.clone());
+        }
+        match &self.0.cache {
+            Some(cache) => cache.lookup(host, || self.resolve(host)).await,
+            None => self.resolve(host).await,
+        }
+    }
+    // Resolve host with hickory-dns.
+    // Configured from the system, looking up both IPv4 and IPv6
+    // addresses for "happy eyeballs", same as reqwest.
+    async fn resolve(&self, host: &str) -> io::Result<Addresses> {
+        let resolver = self
+            .0
+            .hickory
+            .get_or_try_init(|| async {
+                let (config, mut opts) =
+                    system_conf::read_system_conf().map_err(|e| io::Error::other(e.to_string()))?;
+                opts.ip_strategy = LookupIpStrategy::Ipv4AndIpv6;
+                Ok::<_, io::Error>(TokioAsyncResolver::tokio(config, opts))
+            })
+            .await?;
+        let addrs = resolver
+            .lookup_ip(host)
+            .await
+            .map_err(|e| io::Error::other(e.to_string()))?
+            .iter()
+            .map(|ip| SocketAddr::new(ip, 0))
+            .collect::<Vec<_>>();
+        if addrs.is_empty() {
+            return Err(not_found(host));
+        }
+        Ok(addrs.into())
+    }
+    // Warming up requires the cache
+    pub fn check_cache(&self) -> PyResult<()> {
+        match self.0.cache {
+            Some(_) => Ok(()),
+            None => Err(PyValueError::new_err(
+                "DNS cache is disabled, set dns_ttl to warm it up",
+            )),
+        }
+    }
+    // Resolve hosts concurrently.
+    // Failed hosts are resolved to empty lists.
+    pub async fn lookup_many(&self, hosts: Vec<String>) -> Vec<(String, Vec<IpAddr>)> {
+        let results = join_all(hosts.iter().map(|h| self.lookup(h))).await;
+        hosts
+            .into_iter()
+            .zip(results)
+            .map(|(host, r)| {
+                let addrs = match r {
+                    Ok(addrs) => addrs.iter().map(|a| a.ip()).collect(),
+                    Err(_) => Vec::new(),
+                };
+                (host, addrs)
+            })
+            .collect()
+    }
+    // Cache statistics as dict of {"hits": ..., "misses": ...}.
+    // Pinned addresses are not counted.
+    pub fn stats_to_dict<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyDict>> {
+        let (hits, misses) = match &self.0.cache {
+            Some(cache) => (
+                cache.hits.load(Ordering::Relaxed),
+                cache.misses.load(Ordering::Relaxed),
+            ),
+            None => (0, 0),
+        };
+        let r = PyDict::new(py);
+        r.set_item("hits", hits)?;
+        r.set_item("misses", misses)?;
+        Ok(r)
+    }
+}
+
+// Convert lookup_many results to dict of host -> list of addresses.
+pub fn resolved_into_py(
+    py: Python<'_>,
+    resolved: Vec<(String, Vec<IpAddr>)>,
+) -> PyResult<Py<PyDict>> {
+    let r = PyDict::new(py);
+    for (host, addrs) in resolved {
+        let addrs = addrs.iter().map(|a| a.to_string()).collect::<Vec<_>>();
+        r.set_item(host, PyList::new(py, addrs)?)?;
+    }
+    Ok(r.unbind())
+}
+
+impl Resolve for Resolver {
+    fn resolve(&self, name: Name) -> Resolving {
+        let resolver = self.clone();
+        Box::pin(async move {
+            let addrs = resolver.lookup(name.as_str()).await?;
+            Ok(Box::new(addrs.to_vec().into_iter()) as Addrs)
+        })
+    }
+}
+
+// Cache of resolved addresses.
+// Failed lookups are cached as well.
+// Concurrent misses of the same host share the single lookup.
+pub struct DnsCache {
+    ttl: Duration,
+    negative_ttl: Duration,
+    max_entries: usize,
+    entries: Mutex<HashMap<String, CacheEntry>>,
+    // Lookups in progress, None for failed lookup
+    inflight: Mutex<HashMap<String, Arc<OnceCell<Option<Addresses>>>>>,
+    // Lookups served from the cache or by the concurrent lookup,
+    // including failed ones
+    hits: AtomicU64,
+    // Lookups passed to the resolver
+    misses: AtomicU64,
+}
+
+struct CacheEntry {
+    // None for failed lookup
+    addrs: Option<Addresses>,
+    expires: Instant,
+}
+
+impl DnsCache {
+    pub fn new(ttl: Duration, negative_ttl: Duration, max_entries: usize) -> Self {
+        DnsCache {
+            ttl,
+            negative_ttl,
+            max_entries,
+            entries: Mutex::new(HashMap::new()),
+            inflight: Mutex::new(HashMap::new()),
+            hits: AtomicU64::new(0),
+            misses: AtomicU64::new(0),
+        }
+    }
+    async fn lookup<F, Fut>(&self, host: &str, resolve: F) -> io::Result<Addresses>
+    where
+        F: FnOnce() -> Fut,
+        Fut: Future<Output = io::Result<Addresses>>,
+    {
+        if let Some(addrs) = self.get(host) {
+            self.hits.fetch_add(1, Ordering::Relaxed);
+            return addrs.ok_or_else(|| not_found(host));
+        }
+        let cell = self
+            .inflight
+            .lock()
+            .unwrap_or_else(PoisonError::into_inner)
+            .entry(host.to_string())
+            .or_default()
+            .clone();
+        let mut resolved = false;
+        let flag = &mut resolved;
+        let addrs = cell
+            .get_or_init(|| async move {
+                *flag = true;
+                let addrs = resolve().await.ok();
+                // Cache before leaving in-flight lookups,
+                // so the following ones hit the cache.
+                self.put(host, addrs.clone());
+                self.inflight
+                    .lock()
+                    .unwrap_or_else(PoisonError::into_inner)
+                    .remove(host);
+                addrs
+            })
+            .await
+            .clone();
+        let counter = if resolved { &self.misses } else { &self.hits };
+        counter.fetch_add(1, Ordering::Relaxed);
+        addrs.ok_or_else(|| not_found(host))
+    }
+    // Get unexpired entry
+    fn get(&self, host: &str) -> Option<Option<Addresses>> {
+        let entries = self.lock();
+        let entry = entries.get(host)?;
+        if entry.expires <= Instant::now() {
+            return None;
+        }
+        Some(entry.addrs.clone())
+    }
+    fn put(&self, host: &str, addrs: Option<Addresses>) {
+        let now = Instant::now();
+        let ttl = if addrs.is_some() {
+            self.ttl
+        } else {
+            self.negative_ttl
+        };
+        if ttl.is_zero() {
+            return;
+        }
+        let mut entries = self.lock();
+        if entries.len() >= self.max_entries && !entries.contains_key(host) {
+            // Drop expired entries, then the closest to expiration
+            entries.retain(|_, e| e.expires > now);
+            if entries.len() >= self.max_entries {
+                let victim = entries
+                    .iter()
+                    .min_by_key(|(_, e)| e.expires)
+                    .map(|(h, _)| h.clone());
+                if let Some(victim) = victim {
+                    entries.remove(&victim);
+                }
+            }
+        }
+        entries.insert(
+            host.to_string(),
+            CacheEntry {
+                addrs,
+                expires: now + ttl,
+            },
+        );
+    }
+    fn lock(&self) -> MutexGuard<'_, HashMap<String, CacheEntry>> {
+        self.entries.lock().unwrap_or_else(PoisonError::into_inner)
+    }
+}
+
+fn not_found(host: &str) -> io::Error {
+    io::Error::new(
+        io::ErrorKind::NotFound,
+        format!("failed to lookup address for {host}"),
+    )
+}
@@ -1,28 +1,118 @@
 // ------------------------------------------------------------------------
 // Gufo HTTP: SyncResponse impmentation
 // ------------------------------------------------------------------------
-// Copyright (C) 2024, Gufo Labs
+// Copyright (C) 2024-25, Gufo Labs
 // See LICENSE.md for details
 // ------------------------------------------------------------------------
-use crate::headers::Headers;
-use pyo3::{prelude::*, types::PyBytes};
+use crate::{headers::Headers, json};
+use bytes::Bytes;
+use pyo3::{ffi, prelude::*, types::PyBytes};
+use serde_json::Value;
+use std::ffi::{c_int, c_void};
+use std::sync::{Mutex, OnceLock, PoisonError};
 
 #[pyclass]
 pub struct Response {
     #[pyo3(get)]
     status: u16,
     #[pyo3(get)]
-    content: Py<PyBytes>,
-    #[pyo3(get)]
     headers: Headers,
+    body: Bytes,
+    // `bytes` copy of the body, created on demand
+    content: OnceLock<Py<PyBytes>>,
+    // Body parsed in advance, consumed by json()
+    parsed: Mutex<Option<Value>>,
 }
 
 impl Response {
-    pub fn new(status: u16, headers: Headers, content: Py<PyBytes>) -> Self {
+    pub fn new(status: u16, headers: Headers, body: Bytes) -> Self {
         Response {
             status,
             headers,
-            content,
+            body,
+            content: OnceLock::new(),
+            parsed: Mutex::new(None),
         }
     }
+    // Parse body as JSON in advance.
+    // Errors are ignored here and raised by json().
+    pub fn with_json(mut self) -> Self {
+        self.parsed = Mutex::new(json::parse(&self.body).ok());
+        self
+    }
+}
+
+#[pymethods]
+impl Response {
+    #[getter]
+    fn content(&self, py: Python<'_>) -> Py<PyBytes> {
+        self.content
+            .get_or_init(|| PyBytes::new(py, self.body.as_ref()).unbind())
+            .clone_ref(py)
+    }
+    #[getter]
+    fn body(&self) -> ResponseBody {
+        // Cheap, Bytes are reference-counted
+        ResponseBody(self.body.clone())
+    }
+    // Parse body as JSON.
+    // Parsing runs without GIL directly over the body,
+    // Python objects are built at the end.
+    fn json<'a>(&self, py: Python<'a>) -> PyResult<Bound<'a, PyAny>> {
+        let parsed = self
+            .parsed
+            .lock()
+            .unwrap_or_else(PoisonError::into_inner)
+            .take();
+        let value = match parsed {
+            Some(v) => v,
+            None => {
+                let body = &self.body;
+                py.detach(|| json::parse(body))?
+            }
+        };
+        let r = json::to_py(py, &value, &self.body);
+        // Large documents take a while to free
+        py.detach(move || drop(value));
+        r
+    }
+}
+
+// Read-only view to the response body.
+// Exposes reqwest's buffer via the buffer protocol without copying.
+#[pyclass(frozen)]
+pub struct ResponseBody(Bytes);
+
+#[pymethods]
+impl ResponseBody {
+    unsafe fn __getbuffer__(
+        slf: Bound<'_, Self>,
+        view: *mut ffi::Py_buffer,
+        flags: c_int,
+    ) -> PyResult<()> {
+        let buf = &slf.get().0;
+        // Fills the view and holds the reference to slf,
+        // so the buffer outlives the view.
+        // Requests for writable buffers are rejected.
+        let r = unsafe {
+            ffi::PyBuffer_FillInfo(
+                view,
+                slf.as_ptr(),
+                buf.as_ptr() as *mut c_void,
+                buf.len() as ffi::Py_ssize_t,
+                1,
+                flags,
+            )
+        };
+        if r == -1 {
+            return Err(PyErr::fetch(slf.py()));
+        }
+        Ok(())
+    }
+    fn __len__(&self) -> usize {
+        self.0.len()
+    }
+    fn __bytes__<'a>(&self, py: Python<'a>) -> Bound<'a, PyBytes> {
+        PyBytes::new(py, self.0.as_ref())
+    }
 }
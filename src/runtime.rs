@@ -0,0 +1,76 @@
+// ------------------------------------------------------------------------
+// Gufo HTTP: Tokio runtime configuration
+// ------------------------------------------------------------------------
+// Copyright (C) 2024-25, Gufo Labs
+// See LICENSE.md for details
+// ------------------------------------------------------------------------
+use crate::error::GufoHttpError;
+use pyo3::{
+    exceptions::{PyRuntimeError, PyValueError},
+    prelude::*,
+};
+use tokio::runtime::{Builder, Runtime};
+
+/// Configure the runtime of the asynchronous client.
+///
+/// Must be called before the first request of the asynchronous client.
+#[pyfunction]
+#[pyo3(signature = (
+    *,
+    worker_threads = None,
+    max_blocking_threads = None,
+    thread_stack_size = None,
+    current_thread = false,
+))]
+pub fn configure_runtime(
+    worker_threads: Option<usize>,
+    max_blocking_threads: Option<usize>,
+    thread_stack_size: Option<usize>,
+    current_thread: bool,
+) -> PyResult<()> {
+    let mut builder = if current_thread {
+        if worker_threads.is_some() {
+            return Err(PyValueError::new_err(
+                "worker_threads can't be used with current_thread",
+            ));
+        }
+        Builder::new_current_thread()
+    } else {
+        Builder::new_multi_thread()
+    };
+    builder.enable_all().thread_name("gufo-http");
+    if let Some(n) = worker_threads {
+        builder.worker_threads(positive("worker_threads", n)?);
+    }
+    if let Some(n) = max_blocking_threads {
+        builder.max_blocking_threads(positive("max_blocking_threads", n)?);
+    }
+    if let Some(n) = thread_stack_size {
+        builder.thread_stack_size(positive("thread_stack_size", n)?);
+    }
+    let runtime = builder.build().map_err(GufoHttpError::Io)?;
+    // Runtime lives until the process exit
+    let runtime: &'static Runtime = Box::leak(Box::new(runtime));
+    if pyo3_async_runtimes::tokio::init_with_runtime(runtime).is_err() {
+        // Default runtime is already started.
+        // Our runtime is not referenced anywhere, reclaim it.
+        drop(unsafe { Box::from_raw(runtime as *const Runtime as *mut Runtime) });
+        return Err(PyRuntimeError::new_err("runtime is already started"));
+    }
+    if current_thread {
+        // Current-thread runtime runs tasks only within block_on,
+        // so drive it from the dedicated thread.
+        std::thread::Builder::new()
+            .name("gufo-http".into())
+            .spawn(|| runtime.block_on(std::future::pending::<()>()))
+            .map_err(GufoHttpError::Io)?;
+    }
+    Ok(())
+}
+
+fn positive(name: &str, value: usize) -> PyResult<usize> {
+    match value {
+        0 => Err(PyValueError::new_err(format!("{name} must be positive"))),
+        n => Ok(n),
+    }
+}
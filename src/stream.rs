@@ -0,0 +1,224 @@
+// ------------------------------------------------------------------------
+// Gufo HTTP: Streaming responses
+// ------------------------------------------------------------------------
+// Copyright (C) 2024-25, Gufo Labs
+// See LICENSE.md for details
+// ------------------------------------------------------------------------
+use crate::error::{GufoHttpError, HttpResult};
+use crate::headers::Headers;
+use crate::pool::Tracked;
+use pyo3::{
+    exceptions::{PyStopAsyncIteration, PyValueError},
+    prelude::*,
+    types::PyBytes,
+};
+use pyo3_async_runtimes::tokio::future_into_py;
+use std::io::{ErrorKind, Read};
+use std::sync::{Arc, PoisonError};
+use tokio::sync::Mutex;
+
+// Default chunk size for synchronous reads
+pub const DEFAULT_CHUNK_SIZE: usize = 65536;
+
+// Body of the streaming response.
+// Set to None when the body is exhausted or closed,
+// so the connection is returned to the pool as soon as possible.
+type AsyncBody = Arc<Mutex<Option<Tracked<reqwest::Response>>>>;
+
+// Response with the body read on demand.
+#[pyclass]
+pub struct AsyncStreamResponse {
+    #[pyo3(get)]
+    status: u16,
+    #[pyo3(get)]
+    headers: Headers,
+    body: AsyncBody,
+}
+
+impl AsyncStreamResponse {
+    pub fn new(resp: Tracked<reqwest::Response>) -> Self {
+        AsyncStreamResponse {
+            status: resp.status().into(),
+            headers: Headers::new(resp.headers().clone()),
+            body: Arc::new(Mutex::new(Some(resp))),
+        }
+    }
+}
+
+#[pymethods]
+impl AsyncStreamResponse {
+    fn iter_bytes(&self) -> AsyncBytesIterator {
+        AsyncBytesIterator(self.body.clone())
+    }
+    fn close<'a>(&self, py: Python<'a>) -> PyResult<Bound<'a, PyAny>> {
+        let body = self.body.clone();
+        future_into_py(py, async move {
+            // Drop unread body, wait for pending read to complete
+            body.lock().await.take();
+            Ok(())
+        })
+    }
+    fn __aenter__<'a>(slf: Py<Self>, py: Python<'a>) -> PyResult<Bound<'a, PyAny>> {
+        future_into_py(py, async move { Ok(slf) })
+    }
+    fn __aexit__<'a>(
+        &self,
+        py: Python<'a>,
+        _exc_type: &Bound<'a, PyAny>,
+        _exc_val: &Bound<'a, PyAny>,
+        _exc_tb: &Bound<'a, PyAny>,
+    ) -> PyResult<Bound<'a, PyAny>> {
+        self.close(py)
+    }
+}
+
+// Asynchronous iterator over response chunks.
+// Only one chunk is requested from the connection at a time,
+// so the server is throttled by the consumer (back-pressure).
+#[pyclass]
+pub struct AsyncBytesIterator(AsyncBody);
+
+#[pymethods]
+impl AsyncBytesIterator {
+    fn __aiter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
+        slf
+    }
+    fn __anext__<'a>(&self, py: Python<'a>) -> PyResult<Bound<'a, PyAny>> {
+        let body = self.0.clone();
+        future_into_py(py, async move {
+            let mut guard = body.lock().await;
+            let resp = match guard.as_mut() {
+                Some(resp) => resp,
+                None => return Err(PyStopAsyncIteration::new_err(())),
+            };
+            match resp.chunk().await {
+                Ok(Some(chunk)) => Ok(Python::attach(|py| {
+                    PyBytes::new(py, chunk.as_ref()).unbind()
+                })),
+                Ok(None) => {
+                    // Body is exhausted, release connection
+                    guard.take();
+                    Err(PyStopAsyncIteration::new_err(()))
+                }
+                Err(e) => {
+                    guard.take();
+                    Err(GufoHttpError::from(e).into())
+                }
+            }
+        })
+    }
+}
+
+// Body of the blocking streaming response.
+// Set to None when the body is exhausted or closed.
+type SyncBody = Arc<std::sync::Mutex<Option<Tracked<reqwest::blocking::Response>>>>;
+
+// Response with the body read on demand.
+#[pyclass]
+pub struct SyncStreamResponse {
+    #[pyo3(get)]
+    status: u16,
+    #[pyo3(get)]
+    headers: Headers,
+    body: SyncBody,
+}
+
+impl SyncStreamResponse {
+    pub fn new(resp: Tracked<reqwest::blocking::Response>) -> Self {
+        SyncStreamResponse {
+            status: resp.status().into(),
+            headers: Headers::new(resp.headers().clone()),
+            body: Arc::new(std::sync::Mutex::new(Some(resp))),
+        }
+    }
+}
+
+#[pymethods]
+impl SyncStreamResponse {
+    #[pyo3(signature = (chunk_size = DEFAULT_CHUNK_SIZE))]
+    fn iter_bytes(&self, chunk_size: usize) -> PyResult<SyncBytesIterator> {
+        if chunk_size == 0 {
+            return Err(PyValueError::new_err("chunk_size must be positive"));
+        }
+        Ok(SyncBytesIterator {
+            body: self.body.clone(),
+            chunk_size,
+            buf: Vec::new(),
+        })
+    }
+    fn close(&self, py: Python<'_>) {
+        let body = self.body.clone();
+        // Drop unread body, wait for pending read to complete
+        py.detach(|| {
+            body.lock().unwrap_or_else(PoisonError::into_inner).take();
+        })
+    }
+    fn __enter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
+        slf
+    }
+    fn __exit__(
+        &self,
+        py: Python<'_>,
+        _exc_type: &Bound<'_, PyAny>,
+        _exc_val: &Bound<'_, PyAny>,
+        _exc_tb: &Bound<'_, PyAny>,
+    ) {
+        self.close(py)
+    }
+}
+
+// Iterator over response chunks.
+// Each chunk is read with GIL released.
+#[pyclass]
+pub struct SyncBytesIterator {
+    body: SyncBody,
+    chunk_size: usize,
+    // Read buffer, reused between the chunks
+    buf: Vec<u8>,
+}
+
+#[pymethods]
+impl SyncBytesIterator {
+    fn __iter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
+        slf
+    }
+    fn __next__(mut slf: PyRefMut<'_, Self>, py: Python<'_>) -> PyResult<Option<Py<PyBytes>>> {
+        let body = slf.body.clone();
+        let chunk_size = slf.chunk_size;
+        let mut buf = std::mem::take(&mut slf.buf);
+        buf.resize(chunk_size, 0);
+        // Release GIL
+        let filled = py.detach(|| -> HttpResult<usize> {
+            let mut guard = body.lock().unwrap_or_else(PoisonError::into_inner);
+            let resp = match guard.as_mut() {
+                Some(resp) => resp,
+                None => return Ok(0),
+            };
+            // Fill the whole chunk, unless the body is exhausted
+            let mut filled = 0;
+            while filled < chunk_size {
+                match resp.read(&mut buf[filled..]) {
+                    Ok(0) => break,
+                    Ok(n) => filled += n,
+                    Err(e) if e.kind() == ErrorKind::Interrupted => {}
+                    Err(e) => {
+                        guard.take();
+                        return Err(GufoHttpError::from(e));
+                    }
+                }
+            }
+            if filled == 0 {
+                // Body is exhausted, release connection
+                guard.take();
+            }
+            Ok(filled)
+        });
+        let r = match filled {
+            Ok(0) => Ok(None),
+            Ok(n) => Ok(Some(PyBytes::new(py, &buf[..n]).unbind())),
+            Err(e) => Err(e.into()),
+        };
+        slf.buf = buf;
+        r
+    }
+}
@@ -5,92 +5,71 @@
 // See LICENSE.md for details
 // ------------------------------------------------------------------------
 use crate::auth::{AuthMethod, BasicAuth, BearerAuth, GetAuthMethod};
+use crate::batch::{self, SyncBatch, SyncBatchIterator};
+use crate::body::{content_type, sync_body};
 use crate::error::{GufoHttpError, HttpResult};
-use crate::headers::Headers;
-use crate::method::{BROTLI, DEFLATE, GZIP, RequestMethod, ZSTD};
-use crate::proxy::Proxy;
+use crate::headers::{Headers, merge_headers, parse_headers};
+use crate::method::RequestMethod;
+use crate::pool::{PoolStats, Tracked};
+use crate::resolver::{Resolver, resolved_into_py};
 use crate::response::Response;
+use crate::stream::{DEFAULT_CHUNK_SIZE, SyncStreamResponse};
+use crate::tls::TlsStats;
+use crate::transport::SyncTransport;
+use bytes::Bytes;
 use pyo3::{
-    exceptions::{PyTypeError, PyValueError},
+    exceptions::{PyRuntimeError, PyTypeError, PyValueError},
     prelude::*,
-    types::{PyBytes, PyDict, PyList, PyString},
+    types::{PyDict, PyList, PyString},
 };
-use reqwest::{
-    header::{HeaderMap, HeaderName, HeaderValue},
-    redirect::Policy,
+use reqwest::header::{CONTENT_TYPE, HeaderMap, HeaderValue, USER_AGENT};
+use std::{
+    fs::File,
+    io::{ErrorKind, Read, Write},
+    path::PathBuf,
+    sync::Arc,
+    time::Duration,
 };
-use std::time::Duration;
 
 #[pyclass(module = "gufo.http.sync_client")]
 pub struct SyncClient {
+    // Shared with transport
     client: reqwest::blocking::Client,
     auth: AuthMethod,
+    stats: Arc<PoolStats>,
+    // Shared with transport
+    resolver: Resolver,
+    // Shared with transport
+    tls_stats: Arc<TlsStats>,
+    // Default headers
+    headers: HeaderMap,
+    // Request timeout
+    timeout: Duration,
 }
 
 #[pymethods]
 impl SyncClient {
-    #[allow(clippy::too_many_arguments)]
     #[new]
     fn new(
-        validate_cert: bool,
-        connect_timeout: u64,
+        transport: &Bound<'_, SyncTransport>,
         timeout: u64,
-        max_redirect: Option<usize>,
         headers: Option<&Bound<'_, PyDict>>,
-        compression: Option<u8>,
         user_agent: Option<&Bound<'_, PyString>>,
         auth: Option<&Bound<'_, PyAny>>,
-        proxy: Option<&Bound<'_, PyList>>,
     ) -> PyResult<Self> {
-        let builder = reqwest::blocking::Client::builder();
-        // Set up redirect policy
-        let mut builder = builder.redirect(match max_redirect {
-            Some(x) => Policy::limited(x),
-            None => Policy::none(),
-        });
+        let transport = transport.get();
         // Set headers
-        if let Some(h) = headers {
-            let mut map = HeaderMap::with_capacity(h.len());
-            for (k, v) in h {
-                map.insert(
-                    HeaderName::from_bytes(
-                        k.downcast::<PyString>()?.as_borrowed().to_string().as_ref(),
-                    )
-                    .map_err(|e| PyValueError::new_err(e.to_string()))?,
-                    HeaderValue::from_bytes(v.downcast::<PyBytes>()?.as_bytes())
-                        .map_err(|e| PyValueError::new_err(e.to_string()))?,
-                );
-            }
-            builder = builder.default_headers(map);
-        }
-        // Set compression
-        if let Some(c) = compression {
-            if c | DEFLATE == DEFLATE {
-                builder = builder.deflate(true);
-            }
-            if c | GZIP == GZIP {
-                builder = builder.gzip(true);
-            }
-            if c | BROTLI == BROTLI {
-                builder = builder.brotli(true);
-            }
-            if c | ZSTD == ZSTD {
-                builder = builder.zstd(true);
-            }
-        }
-        // Set up certificate validation
-        if !validate_cert {
-            builder = builder.danger_accept_invalid_certs(true);
-        }
-        // Set timeouts
-        builder = builder
-            .connect_timeout(Duration::from_nanos(connect_timeout))
-            .timeout(Duration::from_nanos(timeout));
-        // Disable proxies
-        builder = builder.no_proxy();
+        let mut map = match headers {
+            Some(h) => parse_headers(h)?,
+            None => HeaderMap::new(),
+        };
         // Set user agent
         if let Some(ua) = user_agent {
-            builder = builder.user_agent(ua.as_borrowed().to_string());
+            map.insert(
+                USER_AGENT,
+                HeaderValue::from_str(ua.to_str()?)
+                    .map_err(|e| PyValueError::new_err(e.to_string()))?,
+            );
         }
         // Auth
         let auth = match auth {
@@ -107,47 +86,187 @@ impl SyncClient {
             }
             None => AuthMethod::None,
         };
-        // Proxy
-        if let Some(proxy) = proxy {
-            for p in proxy {
-                match p.extract::<Proxy>() {
-                    Ok(p) => {
-                        builder = builder.proxy(p.into());
-                    }
-                    Err(_) => {
-                        return Err(PyTypeError::new_err("proxy must contain Proxy instances"));
-                    }
-                }
-            }
-        }
-        // Build client
-        let client = builder
-            .build()
-            .map_err(|x| PyValueError::new_err(x.to_string()))?;
-        Ok(SyncClient { client, auth })
+        Ok(SyncClient {
+            client: transport.client.clone(),
+            auth,
+            stats: transport.stats.clone(),
+            resolver: transport.resolver.clone(),
+            tls_stats: transport.tls_stats.clone(),
+            headers: map,
+            timeout: Duration::from_nanos(timeout),
+        })
+    }
+    fn pool_stats<'a>(&self, py: Python<'a>) -> PyResult<Bound<'a, PyDict>> {
+        self.stats.to_dict(py)
+    }
+    fn tls_stats<'a>(&self, py: Python<'a>) -> PyResult<Bound<'a, PyDict>> {
+        self.tls_stats.to_dict(py)
+    }
+    fn dns_stats<'a>(&self, py: Python<'a>) -> PyResult<Bound<'a, PyDict>> {
+        self.resolver.stats_to_dict(py)
+    }
+    fn resolve_many(&self, hosts: Vec<String>, py: Python<'_>) -> PyResult<Py<PyDict>> {
+        self.resolver.check_cache()?;
+        let resolver = self.resolver.clone();
+        // Release GIL, resolve hosts on the shared runtime.
+        // Spawned, as current-thread runtime is driven
+        // by its own thread.
+        let resolved = py
+            .detach(|| {
+                let (tx, rx) = std::sync::mpsc::channel();
+                pyo3_async_runtimes::tokio::get_runtime().spawn(async move {
+                    let _ = tx.send(resolver.lookup_many(hosts).await);
+                });
+                rx.recv()
+            })
+            .map_err(|e| PyRuntimeError::new_err(e.to_string()))?;
+        resolved_into_py(py, resolved)
     }
     fn request<'a>(
         &self,
         method: &RequestMethod,
         url: &str,
-        headers: Option<&Bound<'a, PyDict>>,
-        body: Option<&Bound<'a, PyBytes>>,
+        headers: Option<&Bound<'a, PyAny>>,
+        body: Option<&Bound<'a, PyAny>>,
+        timeout: Option<u64>,
+        parse_json: bool,
         py: Python<'a>,
     ) -> PyResult<Response> {
-        // Build request for method
-        let mut req = self.client.request((*method).into(), url);
-        // Add headers, under GIL
-        if let Some(h) = headers {
-            for (k, v) in h {
-                req = req.header(
-                    HeaderName::from_bytes(
-                        k.downcast::<PyString>()?.as_borrowed().to_string().as_ref(),
-                    )
-                    .map_err(|e| GufoHttpError::ValueError(e.to_string()))?,
-                    HeaderValue::from_bytes(v.downcast::<PyBytes>()?.as_bytes())
-                        .map_err(|e| GufoHttpError::ValueError(e.to_string()))?,
-                )
+        let req = self.build_request(method, url, headers, body, timeout)?;
+        // Release GIL
+        Ok(py.detach(|| {
+            fetch(req, &self.stats).map(|resp| if parse_json { resp.with_json() } else { resp })
+        })?)
+    }
+    fn batch<'a>(
+        &self,
+        requests: &Bound<'a, PyAny>,
+        concurrency: usize,
+        py: Python<'a>,
+    ) -> PyResult<Py<PyList>> {
+        let reqs = batch::prepare(requests, concurrency, |item| {
+            self.build_request(
+                &item.method,
+                &item.url,
+                item.headers.as_ref(),
+                item.body.as_ref(),
+                None,
+            )
+        })?;
+        let mut results = Vec::with_capacity(reqs.len());
+        results.resize_with(reqs.len(), || None);
+        let batch = SyncBatch::new(reqs, concurrency, self.stats.clone())?;
+        // Release GIL, wait for all requests
+        let results = py.detach(move || {
+            while let Some((idx, r)) = batch.next() {
+                results[idx] = Some(r);
             }
+            results
+        });
+        batch::collect(py, results)
+    }
+    fn as_completed(
+        &self,
+        requests: &Bound<'_, PyAny>,
+        concurrency: usize,
+    ) -> PyResult<SyncBatchIterator> {
+        let reqs = batch::prepare(requests, concurrency, |item| {
+            self.build_request(
+                &item.method,
+                &item.url,
+                item.headers.as_ref(),
+                item.body.as_ref(),
+                None,
+            )
+        })?;
+        // Requests are started immediately
+        Ok(SyncBatchIterator::new(SyncBatch::new(
+            reqs,
+            concurrency,
+            self.stats.clone(),
+        )?))
+    }
+    #[allow(clippy::too_many_arguments)]
+    fn download<'a>(
+        &self,
+        method: &RequestMethod,
+        url: &str,
+        path: PathBuf,
+        headers: Option<&Bound<'a, PyAny>>,
+        body: Option<&Bound<'a, PyAny>>,
+        timeout: Option<u64>,
+        py: Python<'a>,
+    ) -> PyResult<Response> {
+        let req = self.build_request(method, url, headers, body, timeout)?;
+        // Release GIL
+        let (status, headers) = py.detach(|| -> HttpResult<(u16, Headers)> {
+            // Send request
+            let mut resp = send(req, &self.stats)?;
+            // Get status
+            let status: u16 = resp.status().into();
+            // Wrap headers
+            let headers = Headers::new(resp.headers().clone());
+            // Write body to file, chunk by chunk
+            let mut file = File::create(&path).map_err(GufoHttpError::Io)?;
+            let mut buf = vec![0u8; DEFAULT_CHUNK_SIZE];
+            loop {
+                let n = match resp.read(&mut buf) {
+                    Ok(0) => break,
+                    Ok(n) => n,
+                    Err(e) if e.kind() == ErrorKind::Interrupted => continue,
+                    Err(e) => return Err(GufoHttpError::from(e)),
+                };
+                file.write_all(&buf[..n]).map_err(GufoHttpError::Io)?;
+            }
+            Ok((status, headers))
+        })?;
+        // Return response without body
+        Ok(Response::new(status, headers, Bytes::new()))
+    }
+    fn stream<'a>(
+        &self,
+        method: &RequestMethod,
+        url: &str,
+        headers: Option<&Bound<'a, PyAny>>,
+        body: Option<&Bound<'a, PyAny>>,
+        timeout: Option<u64>,
+        py: Python<'a>,
+    ) -> PyResult<SyncStreamResponse> {
+        let req = self.build_request(method, url, headers, body, timeout)?;
+        // Release GIL, wait for response headers.
+        // Body will be read on demand.
+        let resp = py.detach(|| send(req, &self.stats))?;
+        Ok(SyncStreamResponse::new(resp))
+    }
+}
+
+impl SyncClient {
+    // Prepare request, under GIL
+    fn build_request<'a>(
+        &self,
+        method: &RequestMethod,
+        url: &str,
+        headers: Option<&Bound<'a, PyAny>>,
+        body: Option<&Bound<'a, PyAny>>,
+        timeout: Option<u64>,
+    ) -> PyResult<reqwest::blocking::RequestBuilder> {
+        // Build request for method.
+        // Request timeout overrides the client's one.
+        let mut req = self
+            .client
+            .request((*method).into(), url)
+            .timeout(timeout.map(Duration::from_nanos).unwrap_or(self.timeout));
+        // Set body's content type, explicit headers override it
+        if let Some(ct) = body.and_then(content_type) {
+            req = req.header(CONTENT_TYPE, ct);
+        }
+        // Add headers, request headers override default ones
+        if let Some(h) = headers {
+            let mut map = self.headers.clone();
+            merge_headers(&mut map, h)?;
+            req = req.headers(map);
+        } else if !self.headers.is_empty() {
+            req = req.headers(self.headers.clone());
         }
         // Add auth
         match &self.auth {
@@ -157,29 +276,46 @@ impl SyncClient {
         }
         // Add body
         if let Some(b) = body {
-            // Zero-copy mapping
-            // body will always outlive our function
-            let bytes: &'static [u8] = unsafe { std::mem::transmute(b.as_bytes()) };
-            req = req.body(bytes);
+            req = req.body(sync_body(b)?);
         }
-        // Release GIL
-        let (status, headers, buf) =
-            py.detach(|| -> HttpResult<(u16, Headers, bytes::Bytes)> {
-                // Send request
-                let resp = req.send().map_err(GufoHttpError::from)?;
-                // Get status
-                let status: u16 = resp.status().into();
-                // Wrap headers
-                let headers = Headers::new(resp.headers().clone());
-                // Read response
-                let buf = resp.bytes().map_err(GufoHttpError::from)?;
-                Ok((status, headers, buf))
-            })?;
-        // Return response
-        Ok(Response::new(
-            status,
-            headers,
-            PyBytes::new(py, buf.as_ref()).into(),
-        ))
+        Ok(req)
     }
 }
+
+// Send request and wait for response headers.
+// The request is in progress until the response is dropped.
+// Blocks, must be called with GIL released.
+fn send(
+    req: reqwest::blocking::RequestBuilder,
+    stats: &Arc<PoolStats>,
+) -> HttpResult<Tracked<reqwest::blocking::Response>> {
+    let (client, req) = req.build_split();
+    let req = req?;
+    let in_use = stats.acquire(req.url());
+    let resp = client.execute(req)?;
+    Ok(Tracked {
+        inner: resp,
+        in_use,
+    })
+}
+
+// Send request and read the whole response.
+// Blocks, must be called with GIL released.
+pub fn fetch(
+    req: reqwest::blocking::RequestBuilder,
+    stats: &Arc<PoolStats>,
+) -> HttpResult<Response> {
+    // Send request
+    let Tracked {
+        inner: resp,
+        in_use: _in_use,
+    } = send(req, stats)?;
+    // Get status
+    let status: u16 = resp.status().into();
+    // Wrap headers
+    let headers = Headers::new(resp.headers().clone());
+    // Read response
+    let buf = resp.bytes()?;
+    // Return response
+    Ok(Response::new(status, headers, buf))
+}
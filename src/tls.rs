@@ -0,0 +1,313 @@
+// ------------------------------------------------------------------------
+// Gufo HTTP: TLS configuration
+// ------------------------------------------------------------------------
+// Copyright (C) 2024-25, Gufo Labs
+// See LICENSE.md for details
+// ------------------------------------------------------------------------
+use pyo3::{exceptions::PyValueError, prelude::*, types::PyDict};
+use rustls::{
+    ALL_VERSIONS, ClientConfig, DigitallySignedStruct, NamedGroup, RootCertStore, SignatureScheme,
+    SupportedProtocolVersion,
+    client::{
+        ClientSessionMemoryCache, ClientSessionStore, Resumption, Tls12ClientSessionValue,
+        Tls12Resumption, Tls13ClientSessionValue,
+        danger::{HandshakeSignatureValid, ServerCertVerified, ServerCertVerifier},
+    },
+    crypto::CryptoProvider,
+    pki_types::{
+        CertificateDer, PrivateKeyDer, ServerName, UnixTime,
+        pem::{self, PemObject},
+    },
+    version::TLS13,
+};
+use std::{
+    path::{Path, PathBuf},
+    sync::{
+        Arc, OnceLock,
+        atomic::{AtomicU64, Ordering},
+    },
+};
+
+// ALPN protocols
+pub const ALPN_HTTP1: &[u8] = b"http/1.1";
+pub const ALPN_HTTP2: &[u8] = b"h2";
+pub const ALPN_HTTP3: &[u8] = b"h3";
+
+// TLS session settings
+pub struct SessionSettings {
+    // Maximal number of cached sessions, 0 - disable resumption
+    pub cache_size: usize,
+    // Allow TLS 1.2 session tickets
+    pub tickets: bool,
+}
+
+static TLS13_ONLY: &[&SupportedProtocolVersion] = &[&TLS13];
+
+// Client certificate chain and its private key
+type ClientAuth = (Vec<CertificateDer<'static>>, PrivateKeyDer<'static>);
+
+// Parsed certificates and TLS settings.
+// Immutable, may be shared between transports.
+#[pyclass(frozen)]
+#[derive(Clone)]
+pub struct TlsConfig {
+    roots: Arc<RootCertStore>,
+    client_auth: Option<Arc<ClientAuth>>,
+    versions: &'static [&'static SupportedProtocolVersion],
+}
+
+#[pymethods]
+impl TlsConfig {
+    #[new]
+    #[pyo3(signature = (ca_certs = None, client_cert = None, client_key = None, min_version = None))]
+    fn new(
+        ca_certs: Option<PathBuf>,
+        client_cert: Option<PathBuf>,
+        client_key: Option<PathBuf>,
+        min_version: Option<&str>,
+    ) -> PyResult<Self> {
+        let roots = match ca_certs {
+            Some(path) => Arc::new(load_roots(&path)?),
+            None => default_roots(),
+        };
+        let client_auth = match (client_cert, client_key) {
+            (Some(cert), Some(key)) => Some(Arc::new(load_client_auth(&cert, &key)?)),
+            (None, None) => None,
+            _ => {
+                return Err(PyValueError::new_err(
+                    "client_cert and client_key must be set together",
+                ));
+            }
+        };
+        let versions = match min_version {
+            None | Some("1.2") => ALL_VERSIONS,
+            Some("1.3") => TLS13_ONLY,
+            Some(v) => {
+                return Err(PyValueError::new_err(format!(
+                    "unsupported TLS version: {v}"
+                )));
+            }
+        };
+        Ok(TlsConfig {
+            roots,
+            client_auth,
+            versions,
+        })
+    }
+}
+
+// Bundled webpki roots, parsed once per process
+fn default_roots() -> Arc<RootCertStore> {
+    static ROOTS: OnceLock<Arc<RootCertStore>> = OnceLock::new();
+    ROOTS
+        .get_or_init(|| {
+            let mut roots = RootCertStore::empty();
+            roots.extend(webpki_roots::TLS_SERVER_ROOTS.iter().cloned());
+            Arc::new(roots)
+        })
+        .clone()
+}
+
+// Load trusted certificates from PEM file
+fn load_roots(path: &Path) -> PyResult<RootCertStore> {
+    let mut roots = RootCertStore::empty();
+    for cert in CertificateDer::pem_file_iter(path).map_err(pem_error)? {
+        roots
+            .add(cert.map_err(pem_error)?)
+            .map_err(|e| PyValueError::new_err(format!("invalid CA certificate: {e}")))?;
+    }
+    if roots.is_empty() {
+        return Err(PyValueError::new_err("no CA certificates found"));
+    }
+    Ok(roots)
+}
+
+// Load client certificate chain and private key from PEM files
+fn load_client_auth(cert: &Path, key: &Path) -> PyResult<ClientAuth> {
+    let certs = CertificateDer::pem_file_iter(cert)
+        .map_err(pem_error)?
+        .collect::<Result<Vec<_>, _>>()
+        .map_err(pem_error)?;
+    if certs.is_empty() {
+        return Err(PyValueError::new_err("no client certificates found"));
+    }
+    let key = PrivateKeyDer::from_pem_file(key).map_err(pem_error)?;
+    // Check the key is supported
+    provider()
+        .key_provider
+        .load_private_key(key.clone_key())
+        .map_err(|e| PyValueError::new_err(format!("invalid client key: {e}")))?;
+    Ok((certs, key))
+}
+
+fn pem_error(e: pem::Error) -> PyErr {
+    match e {
+        pem::Error::Io(e) => e.into(),
+        e => PyValueError::new_err(format!("invalid PEM file: {e}")),
+    }
+}
+
+// Build rustls config.
+// Returns config and its handshake statistics.
+pub fn client_config(
+    validate_cert: bool,
+    tls: &TlsConfig,
+    session: &SessionSettings,
+    alpn: &[&[u8]],
+) -> PyResult<(ClientConfig, Arc<TlsStats>)> {
+    let provider = provider();
+    let builder = ClientConfig::builder_with_provider(provider.clone())
+        .with_protocol_versions(tls.versions)
+        .map_err(|e| PyValueError::new_err(e.to_string()))?;
+    let builder = if validate_cert {
+        builder.with_root_certificates(tls.roots.clone())
+    } else {
+        builder
+            .dangerous()
+            .with_custom_certificate_verifier(Arc::new(NoVerifier(provider)))
+    };
+    let mut config = match &tls.client_auth {
+        Some(auth) => builder
+            .with_client_auth_cert(auth.0.clone(), auth.1.clone_key())
+            .map_err(|e| PyValueError::new_err(e.to_string()))?,
+        None => builder.with_no_client_auth(),
+    };
+    config.alpn_protocols = alpn.iter().map(|p| p.to_vec()).collect();
+    // Session resumption
+    let stats = Arc::new(TlsStats::default());
+    let cache = (session.cache_size > 0).then(|| ClientSessionMemoryCache::new(session.cache_size));
+    config.resumption = Resumption::store(Arc::new(CountingStore {
+        cache,
+        stats: stats.clone(),
+    }))
+    .tls12_resumption(if session.tickets {
+        Tls12Resumption::SessionIdOrTickets
+    } else {
+        Tls12Resumption::SessionIdOnly
+    });
+    Ok((config, stats))
+}
+
+// Installed process-wide provider, or ring
+fn provider() -> Arc<CryptoProvider> {
+    CryptoProvider::get_default()
+        .cloned()
+        .unwrap_or_else(|| Arc::new(rustls::crypto::ring::default_provider()))
+}
+
+// TLS handshake statistics
+#[derive(Default, Debug)]
+pub struct TlsStats {
+    // Total handshakes
+    handshakes: AtomicU64,
+    // Handshakes offering cached session,
+    // the server may still refuse it
+    offered: AtomicU64,
+}
+
+impl TlsStats {
+    // Convert to dict of {"handshakes": ..., "offered": ...}
+    pub fn to_dict<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyDict>> {
+        let r = PyDict::new(py);
+        r.set_item("handshakes", self.handshakes.load(Ordering::Relaxed))?;
+        r.set_item("offered", self.offered.load(Ordering::Relaxed))?;
+        Ok(r)
+    }
+}
+
+// Session store, counting handshakes.
+// rustls looks up TLS 1.3 ticket once per handshake,
+// falling back to TLS 1.2 session.
+// Stores nothing when the cache is disabled.
+#[derive(Debug)]
+struct CountingStore {
+    cache: Option<ClientSessionMemoryCache>,
+    stats: Arc<TlsStats>,
+}
+
+impl CountingStore {
+    // Count session offered to the server.
+    // Whether the server accepts it is not visible to the store.
+    fn offered<T>(&self, value: Option<T>) -> Option<T> {
+        if value.is_some() {
+            self.stats.offered.fetch_add(1, Ordering::Relaxed);
+        }
+        value
+    }
+}
+
+impl ClientSessionStore for CountingStore {
+    fn set_kx_hint(&self, server_name: ServerName<'static>, group: NamedGroup) {
+        if let Some(cache) = &self.cache {
+            cache.set_kx_hint(server_name, group)
+        }
+    }
+    fn kx_hint(&self, server_name: &ServerName<'_>) -> Option<NamedGroup> {
+        self.cache.as_ref()?.kx_hint(server_name)
+    }
+    fn set_tls12_session(&self, server_name: ServerName<'static>, value: Tls12ClientSessionValue) {
+        if let Some(cache) = &self.cache {
+            cache.set_tls12_session(server_name, value)
+        }
+    }
+    fn tls12_session(&self, server_name: &ServerName<'_>) -> Option<Tls12ClientSessionValue> {
+        self.offered(self.cache.as_ref()?.tls12_session(server_name))
+    }
+    fn remove_tls12_session(&self, server_name: &ServerName<'static>) {
+        if let Some(cache) = &self.cache {
+            cache.remove_tls12_session(server_name)
+        }
+    }
+    fn insert_tls13_ticket(
+        &self,
+        server_name: ServerName<'static>,
+        value: Tls13ClientSessionValue,
+    ) {
+        if let Some(cache) = &self.cache {
+            cache.insert_tls13_ticket(server_name, value)
+        }
+    }
+    fn take_tls13_ticket(
+        &self,
+        server_name: &ServerName<'static>,
+    ) -> Option<Tls13ClientSessionValue> {
+        self.stats.handshakes.fetch_add(1, Ordering::Relaxed);
+        self.offered(self.cache.as_ref()?.take_tls13_ticket(server_name))
+    }
+}
+
+// Accept any server certificate
+#[derive(Debug)]
+struct NoVerifier(Arc<CryptoProvider>);
+
+impl ServerCertVerifier for NoVerifier {
+    fn verify_server_cert(
+        &self,
+        _end_entity: &CertificateDer<'_>,
+        _intermediates: &[CertificateDer<'_>],
+        _server_name: &ServerName<'_>,
+        _ocsp_response: &[u8],
+        _now: UnixTime,
+    ) -> Result<ServerCertVerified, rustls::Error> {
+        Ok(ServerCertVerified::assertion())
+    }
+    fn verify_tls12_signature(
+        &self,
+        _message: &[u8],
+        _cert: &CertificateDer<'_>,
+        _dss: &DigitallySignedStruct,
+    ) -> Result<HandshakeSignatureValid, rustls::Error> {
+        Ok(HandshakeSignatureValid::assertion())
+    }
+    fn verify_tls13_signature(
+        &self,
+        _message: &[u8],
+        _cert: &CertificateDer<'_>,
+        _dss: &DigitallySignedStruct,
+    ) -> Result<HandshakeSignatureValid, rustls::Error> {
+        Ok(HandshakeSignatureValid::assertion())
+    }
+    fn supported_verify_schemes(&self) -> Vec<SignatureScheme> {
+        self.0.signature_verification_algorithms.supported_schemes()
+    }
+}
@@ -0,0 +1,400 @@
+// ------------------------------------------------------------------------
+// Gufo HTTP: Transport implementation
+// ------------------------------------------------------------------------
+// Copyright (C) 2024-25, Gufo Labs
+// See LICENSE.md for details
+// ------------------------------------------------------------------------
+use crate::method::{BROTLI, DEFLATE, GZIP, ZSTD};
+use crate::pool::PoolStats;
+use crate::proxy::Proxy;
+use crate::resolver::{DnsCache, Resolver};
+use crate::tls::{
+    ALPN_HTTP1, ALPN_HTTP2, ALPN_HTTP3, SessionSettings, TlsConfig, TlsStats, client_config,
+};
+use pyo3::{
+    exceptions::{PyTypeError, PyValueError},
+    prelude::*,
+    types::{PyDict, PyList},
+};
+use reqwest::redirect::Policy;
+use std::{sync::Arc, time::Duration};
+
+// Connection pool and connection settings.
+// May be shared between clients.
+#[pyclass(module = "gufo.http.async_client", frozen)]
+pub struct AsyncTransport {
+    pub client: reqwest::Client,
+    pub stats: Arc<PoolStats>,
+    pub resolver: Resolver,
+    pub tls_stats: Arc<TlsStats>,
+}
+
+#[pymethods]
+impl AsyncTransport {
+    #[allow(clippy::too_many_arguments)]
+    #[new]
+    fn new(
+        validate_cert: bool,
+        connect_timeout: u64,
+        max_redirect: Option<usize>,
+        compression: Option<u8>,
+        proxy: Option<&Bound<'_, PyList>>,
+        pool_max_idle_per_host: Option<usize>,
+        pool_idle_timeout: Option<u64>,
+        tcp_keepalive: Option<u64>,
+        http2_prior_knowledge: bool,
+        http2_adaptive_window: bool,
+        http2_initial_stream_window_size: Option<u32>,
+        http2_initial_connection_window_size: Option<u32>,
+        http2_max_frame_size: Option<u32>,
+        http2_keep_alive_interval: Option<u64>,
+        http2_keep_alive_timeout: Option<u64>,
+        http2_keep_alive_while_idle: bool,
+        http3: bool,
+        dns_ttl: Option<u64>,
+        dns_negative_ttl: u64,
+        dns_cache_size: usize,
+        resolve: Option<&Bound<'_, PyDict>>,
+        tls_session_cache_size: usize,
+        tls_session_tickets: bool,
+        tls_config: TlsConfig,
+    ) -> PyResult<Self> {
+        let builder = reqwest::Client::builder();
+        // Set up redirect policy
+        let mut builder = builder.redirect(match max_redirect {
+            Some(x) => Policy::limited(x),
+            None => Policy::none(),
+        });
+        // Set compression
+        if let Some(c) = compression {
+            if c | DEFLATE == DEFLATE {
+                builder = builder.deflate(true);
+            }
+            if c | GZIP == GZIP {
+                builder = builder.gzip(true);
+            }
+            if c | BROTLI == BROTLI {
+                builder = builder.brotli(true);
+            }
+            if c | ZSTD == ZSTD {
+                builder = builder.zstd(true);
+            }
+        }
+        // Set timeouts
+        builder = builder.connect_timeout(Duration::from_nanos(connect_timeout));
+        // Disable proxies
+        builder = builder.no_proxy();
+        // Proxy
+        if let Some(proxy) = proxy {
+            for p in proxy {
+                match p.extract::<Proxy>() {
+                    Ok(p) => {
+                        builder = builder.proxy(p.into());
+                    }
+                    Err(_) => {
+                        return Err(PyTypeError::new_err("proxy must contain Proxy instances"));
+                    }
+                }
+            }
+        }
+        // Connection pool
+        if let Some(n) = pool_max_idle_per_host {
+            builder = builder.pool_max_idle_per_host(n);
+        }
+        builder = builder
+            .pool_idle_timeout(pool_idle_timeout.map(Duration::from_nanos))
+            .tcp_keepalive(tcp_keepalive.map(Duration::from_nanos));
+        // HTTP/2
+        check_http2(
+            http2_initial_stream_window_size,
+            http2_initial_connection_window_size,
+            http2_max_frame_size,
+        )?;
+        if http2_prior_knowledge {
+            builder = builder.http2_prior_knowledge();
+        }
+        builder = builder
+            .http2_adaptive_window(http2_adaptive_window)
+            .http2_initial_stream_window_size(http2_initial_stream_window_size)
+            .http2_initial_connection_window_size(http2_initial_connection_window_size)
+            .http2_max_frame_size(http2_max_frame_size);
+        if let Some(interval) = http2_keep_alive_interval {
+            builder = builder.http2_keep_alive_interval(Duration::from_nanos(interval));
+        }
+        if let Some(timeout) = http2_keep_alive_timeout {
+            builder = builder.http2_keep_alive_timeout(Duration::from_nanos(timeout));
+        }
+        builder = builder.http2_keep_alive_while_idle(http2_keep_alive_while_idle);
+        // HTTP/3
+        if http3 {
+            check_http3(http2_prior_knowledge)?;
+            #[cfg(feature = "http3")]
+            {
+                builder = builder.http3_prior_knowledge();
+            }
+        }
+        // TLS
+        let (tls, tls_stats) = client_config(
+            validate_cert,
+            &tls_config,
+            &SessionSettings {
+                cache_size: tls_session_cache_size,
+                tickets: tls_session_tickets,
+            },
+            alpn(http2_prior_knowledge, http3),
+        )?;
+        builder = builder.use_preconfigured_tls(tls);
+        // DNS
+        let resolver = build_resolver(dns_ttl, dns_negative_ttl, dns_cache_size, resolve)?;
+        for (host, addrs) in resolver.overrides() {
+            builder = builder.resolve_to_addrs(host, addrs);
+        }
+        if resolver.is_enabled() {
+            builder = builder.dns_resolver(Arc::new(resolver.clone()));
+        }
+        // Build client
+        let client = builder
+            .build()
+            .map_err(|x| PyValueError::new_err(x.to_string()))?;
+        Ok(AsyncTransport {
+            client,
+            stats: Arc::new(PoolStats::default()),
+            resolver,
+            tls_stats,
+        })
+    }
+    fn pool_stats<'a>(&self, py: Python<'a>) -> PyResult<Bound<'a, PyDict>> {
+        self.stats.to_dict(py)
+    }
+    fn tls_stats<'a>(&self, py: Python<'a>) -> PyResult<Bound<'a, PyDict>> {
+        self.tls_stats.to_dict(py)
+    }
+    fn dns_stats<'a>(&self, py: Python<'a>) -> PyResult<Bound<'a, PyDict>> {
+        self.resolver.stats_to_dict(py)
+    }
+}
+
+// Connection pool and connection settings.
+// May be shared between clients.
+// Clients sharing transport share the blocking client's runtime too.
+#[pyclass(module = "gufo.http.sync_client", frozen)]
+pub struct SyncTransport {
+    pub client: reqwest::blocking::Client,
+    pub stats: Arc<PoolStats>,
+    pub resolver: Resolver,
+    pub tls_stats: Arc<TlsStats>,
+}
+
+#[pymethods]
+impl SyncTransport {
+    #[allow(clippy::too_many_arguments)]
+    #[new]
+    fn new(
+        validate_cert: bool,
+        connect_timeout: u64,
+        max_redirect: Option<usize>,
+        compression: Option<u8>,
+        proxy: Option<&Bound<'_, PyList>>,
+        pool_max_idle_per_host: Option<usize>,
+        pool_idle_timeout: Option<u64>,
+        tcp_keepalive: Option<u64>,
+        http2_prior_knowledge: bool,
+        http2_adaptive_window: bool,
+        http2_initial_stream_window_size: Option<u32>,
+        http2_initial_connection_window_size: Option<u32>,
+        http2_max_frame_size: Option<u32>,
+        http3: bool,
+        dns_ttl: Option<u64>,
+        dns_negative_ttl: u64,
+        dns_cache_size: usize,
+        resolve: Option<&Bound<'_, PyDict>>,
+        tls_session_cache_size: usize,
+        tls_session_tickets: bool,
+        tls_config: TlsConfig,
+    ) -> PyResult<Self> {
+        let builder = reqwest::blocking::Client::builder();
+        // Set up redirect policy
+        let mut builder = builder.redirect(match max_redirect {
+            Some(x) => Policy::limited(x),
+            None => Policy::none(),
+        });
+        // Set compression
+        if let Some(c) = compression {
+            if c | DEFLATE == DEFLATE {
+                builder = builder.deflate(true);
+            }
+            if c | GZIP == GZIP {
+                builder = builder.gzip(true);
+            }
+            if c | BROTLI == BROTLI {
+                builder = builder.brotli(true);
+            }
+            if c | ZSTD == ZSTD {
+                builder = builder.zstd(true);
+            }
+        }
+        // Set timeouts.
+        // Request timeout is set by client, disable the default one.
+        builder = builder
+            .connect_timeout(Duration::from_nanos(connect_timeout))
+            .timeout(None);
+        // Disable proxies
+        builder = builder.no_proxy();
+        // Proxy
+        if let Some(proxy) = proxy {
+            for p in proxy {
+                match p.extract::<Proxy>() {
+                    Ok(p) => {
+                        builder = builder.proxy(p.into());
+                    }
+                    Err(_) => {
+                        return Err(PyTypeError::new_err("proxy must contain Proxy instances"));
+                    }
+                }
+            }
+        }
+        // Connection pool
+        if let Some(n) = pool_max_idle_per_host {
+            builder = builder.pool_max_idle_per_host(n);
+        }
+        builder = builder
+            .pool_idle_timeout(pool_idle_timeout.map(Duration::from_nanos))
+            .tcp_keepalive(tcp_keepalive.map(Duration::from_nanos));
+        // HTTP/2
+        check_http2(
+            http2_initial_stream_window_size,
+            http2_initial_connection_window_size,
+            http2_max_frame_size,
+        )?;
+        if http2_prior_knowledge {
+            builder = builder.http2_prior_knowledge();
+        }
+        builder = builder
+            .http2_adaptive_window(http2_adaptive_window)
+            .http2_initial_stream_window_size(http2_initial_stream_window_size)
+            .http2_initial_connection_window_size(http2_initial_connection_window_size)
+            .http2_max_frame_size(http2_max_frame_size);
+        // HTTP/3
+        if http3 {
+            check_http3(http2_prior_knowledge)?;
+            #[cfg(feature = "http3")]
+            {
+                builder = builder.http3_prior_knowledge();
+            }
+        }
+        // TLS
+        let (tls, tls_stats) = client_config(
+            validate_cert,
+            &tls_config,
+            &SessionSettings {
+                cache_size: tls_session_cache_size,
+                tickets: tls_session_tickets,
+            },
+            alpn(http2_prior_knowledge, http3),
+        )?;
+        builder = builder.use_preconfigured_tls(tls);
+        // DNS
+        let resolver = build_resolver(dns_ttl, dns_negative_ttl, dns_cache_size, resolve)?;
+        for (host, addrs) in resolver.overrides() {
+            builder = builder.resolve_to_addrs(host, addrs);
+        }
+        if resolver.is_enabled() {
+            builder = builder.dns_resolver(Arc::new(resolver.clone()));
+        }
+        // Build client
+        let client = builder
+            .build()
+            .map_err(|x| PyValueError::new_err(x.to_string()))?;
+        Ok(SyncTransport {
+            client,
+            stats: Arc::new(PoolStats::default()),
+            resolver,
+            tls_stats,
+        })
+    }
+    fn pool_stats<'a>(&self, py: Python<'a>) -> PyResult<Bound<'a, PyDict>> {
+        self.stats.to_dict(py)
+    }
+    fn tls_stats<'a>(&self, py: Python<'a>) -> PyResult<Bound<'a, PyDict>> {
+        self.tls_stats.to_dict(py)
+    }
+    fn dns_stats<'a>(&self, py: Python<'a>) -> PyResult<Bound<'a, PyDict>> {
+        self.resolver.stats_to_dict(py)
+    }
+}
+
+// Limits of HTTP/2 settings, RFC 9113
+const MAX_WINDOW_SIZE: u32 = (1 << 31) - 1;
+const MIN_MAX_FRAME_SIZE: u32 = 1 << 14;
+const MAX_MAX_FRAME_SIZE: u32 = (1 << 24) - 1;
+
+// Check HTTP/2 settings are in range allowed by protocol
+fn check_http2(
+    stream_window_size: Option<u32>,
+    connection_window_size: Option<u32>,
+    max_frame_size: Option<u32>,
+) -> PyResult<()> {
+    for (name, size) in [
+        ("http2_initial_stream_window_size", stream_window_size),
+        (
+            "http2_initial_connection_window_size",
+            connection_window_size,
+        ),
+    ] {
+        if size.is_some_and(|x| x > MAX_WINDOW_SIZE) {
+            return Err(PyValueError::new_err(format!(
+                "{name} must not exceed {MAX_WINDOW_SIZE}"
+            )));
+        }
+    }
+    if max_frame_size.is_some_and(|x| !(MIN_MAX_FRAME_SIZE..=MAX_MAX_FRAME_SIZE).contains(&x)) {
+        return Err(PyValueError::new_err(format!(
+            "http2_max_frame_size must be between {MIN_MAX_FRAME_SIZE} and {MAX_MAX_FRAME_SIZE}"
+        )));
+    }
+    Ok(())
+}
+
+// Check HTTP/3 is available and not conflicts with other settings
+fn check_http3(http2_prior_knowledge: bool) -> PyResult<()> {
+    if !cfg!(feature = "http3") {
+        return Err(PyValueError::new_err("HTTP/3 support is not compiled in"));
+    }
+    if http2_prior_knowledge {
+        return Err(PyValueError::new_err(
+            "http3 can't be used with http2_prior_knowledge",
+        ));
+    }
+    Ok(())
+}
+
+// ALPN protocols to negotiate
+fn alpn(http2_prior_knowledge: bool, http3: bool) -> &'static [&'static [u8]] {
+    if http3 {
+        &[ALPN_HTTP3]
+    } else if http2_prior_knowledge {
+        &[ALPN_HTTP2]
+    } else {
+        &[ALPN_HTTP2, ALPN_HTTP1]
+    }
+}
+
+// Build resolver with optional cache and pinned addresses
+fn build_resolver(
+    ttl: Option<u64>,
+    negative_ttl: u64,
+    cache_size: usize,
+    resolve: Option<&Bound<'_, PyDict>>,
+) -> PyResult<Resolver> {
+    if cache_size == 0 {
+        return Err(PyValueError::new_err("dns_cache_size must be positive"));
+    }
+    let cache = ttl.map(|ttl| {
+        DnsCache::new(
+            Duration::from_nanos(ttl),
+            Duration::from_nanos(negative_ttl),
+            cache_size,
+        )
+    });
+    Ok(Resolver::new(Resolver::parse_overrides(resolve)?, cache))
+}
@@ -31,6 +31,8 @@ class BlackholeHttpd(object):
         self.prefix = f"http://{self._host}:{self._port}"
         self._thread: Optional[Thread] = None
         self._to_shutdown = False
+        # Number of connections closed by clients
+        self.closed = 0
 
     def __enter__(self: "BlackholeHttpd") -> "BlackholeHttpd":
         """Context manager entry."""
@@ -67,8 +69,8 @@ class BlackholeHttpd(object):
         listener.listen(5)
         logger.info("Listeninng %s:%s", self._address, self._port)
         while not self._to_shutdown:
-            readers, _, _ = select.select(readers, [], [], 1.0)
-            for sock in readers:
+            ready, _, _ = select.select(readers, [], [], 1.0)
+            for sock in ready:
                 if sock == listener:
                     # New connection
                     new_client, remote_addr = listener.accept()
@@ -76,7 +78,10 @@ class BlackholeHttpd(object):
                     readers.append(new_client)
                 else:
                     # Incoming data
-                    data = sock.recv(1024)
+                    try:
+                        data = sock.recv(1024)
+                    except ConnectionResetError:
+                        data = b""
                     if data:
                         logger.info("Received: %s", data)
                     else:
@@ -84,3 +89,4 @@ class BlackholeHttpd(object):
                         logger.info("Connnnection closed")
                         sock.close()
                         readers.remove(sock)
+                        self.closed += 1
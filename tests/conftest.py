@@ -7,8 +7,11 @@
 
 # Python modules
 import logging
+import shutil
 import socket
-from typing import Iterator
+import subprocess
+from pathlib import Path
+from typing import Iterator, Tuple
 
 # Third-party modules
 import pytest
@@ -56,6 +59,20 @@ def httpd_tls() -> Iterator[Httpd]:
         yield httpd
 
 
+@pytest.fixture(scope="session")
+def httpd_mtls() -> Iterator[Httpd]:
+    logger = logging.getLogger("gufo.http.httpd")
+    logger.setLevel(logging.DEBUG)
+    with Httpd(
+        address=HTTPD_ADDRESS,
+        port=get_free_port(),
+        host=HTTPD_HOST,
+        mode=HttpdMode.HTTPS,
+        verify_client=True,
+    ) as httpd:
+        yield httpd
+
+
 @pytest.fixture(scope="session")
 def httpd_blackhole() -> Iterator[BlackholeHttpd]:
     logger = logging.getLogger("gufo.http.httpd")
@@ -70,3 +87,34 @@ def proxy() -> Iterator[ProxyServer]:
     logger.setLevel(logging.DEBUG)
     with ProxyServer(port=get_free_port()) as proxy:
         yield proxy
+
+
+@pytest.fixture(scope="session")
+def tls_cert(tmp_path_factory: pytest.TempPathFactory) -> Tuple[Path, Path]:
+    """Self-signed certificate and its private key."""
+    openssl = shutil.which("openssl")
+    if openssl is None:
+        pytest.skip("openssl is not found")
+    root = tmp_path_factory.mktemp("tls")
+    cert, key = root / "cert.pem", root / "key.pem"
+    subprocess.run(
+        [
+            openssl,
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-keyout",
+            str(key),
+            "-out",
+            str(cert),
+            "-days",
+            "1",
+            "-nodes",
+            "-subj",
+            "/CN=localhost",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return cert, key
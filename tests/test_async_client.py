@@ -7,8 +7,13 @@
 
 # Python modules
 import asyncio
-from collections.abc import Iterable
-from typing import Any, ClassVar, Dict, Optional, Type
+import json
+import os
+import tempfile
+import threading
+from collections.abc import AsyncIterable, Iterable
+from pathlib import Path
+from typing import Any, ClassVar, Dict, List, Optional, Tuple, Type
 
 # Third-party modules
 import pytest
@@ -16,20 +21,33 @@ import pytest
 # Gufo HTTP Modules
 from gufo.http import (
     GZIP,
+    HTTP3,
     AuthBase,
     BasicAuth,
     BearerAuth,
     HttpError,
+    JsonBody,
     Proxy,
     RedirectError,
     RequestError,
+    RequestHeaders,
     RequestMethod,
+    Response,
+    TlsConfig,
 )
-from gufo.http.async_client import HttpClient
+from gufo.http.async_client import HttpClient, Transport
 from gufo.http.httpd import Httpd
+from gufo.http.util import NO_JSON
 
 from .blackhole import BlackholeHttpd
-from .util import UNROUTABLE_PROXY, UNROUTABLE_URL, with_env
+from .util import (
+    HTTPD_HOST,
+    INVALID_PATH,
+    JSON_DATA,
+    UNROUTABLE_PROXY,
+    UNROUTABLE_URL,
+    with_env,
+)
 
 
 def test_get(httpd: Httpd) -> None:
@@ -179,6 +197,634 @@ def test_request_by_str(
     asyncio.run(inner())
 
 
+def test_stream(httpd: Httpd) -> None:
+    async def inner() -> None:
+        async with HttpClient() as client:
+            expected = (await client.get(f"{httpd.prefix}/")).content
+            async with await client.stream(
+                RequestMethod.GET, f"{httpd.prefix}/"
+            ) as resp:
+                assert resp.status == 200
+                assert b"text/html" in resp.headers["Content-Type"]
+                chunks = [chunk async for chunk in resp.iter_bytes()]
+                assert chunks
+                assert all(isinstance(c, bytes) for c in chunks)
+                assert b"".join(chunks) == expected
+                # Exhausted
+                assert [chunk async for chunk in resp.iter_bytes()] == []
+
+    asyncio.run(inner())
+
+
+def test_stream_close(httpd: Httpd) -> None:
+    async def inner() -> None:
+        async with HttpClient() as client:
+            resp = await client.stream(RequestMethod.GET, f"{httpd.prefix}/")
+            async for chunk in resp.iter_bytes():
+                assert chunk
+                break
+            await resp.close()
+            assert [chunk async for chunk in resp.iter_bytes()] == []
+
+    asyncio.run(inner())
+
+
+def test_stream_not_found(httpd: Httpd) -> None:
+    async def inner() -> None:
+        async with HttpClient() as client:
+            async with await client.stream(
+                RequestMethod.GET, f"{httpd.prefix}/not_found"
+            ) as resp:
+                assert resp.status == 404
+
+    asyncio.run(inner())
+
+
+def test_body(httpd: Httpd) -> None:
+    async def inner() -> None:
+        async with HttpClient() as client:
+            resp = await client.get(f"{httpd.prefix}/")
+            assert resp.status == 200
+            body = resp.body
+            assert len(body) == len(resp.content)
+            mv = memoryview(body)
+            assert mv.readonly
+            assert mv == resp.content
+            assert bytes(body) == resp.content
+            assert resp.content is resp.content
+
+    asyncio.run(inner())
+
+
+def test_download(httpd: Httpd) -> None:
+    async def inner() -> None:
+        async with HttpClient() as client:
+            expected = (await client.get(f"{httpd.prefix}/")).content
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "index.html")
+                resp = await client.download(f"{httpd.prefix}/", path)
+                assert resp.status == 200
+                assert b"text/html" in resp.headers["Content-Type"]
+                assert resp.content == b""
+                with open(path, "rb") as fp:
+                    assert fp.read() == expected
+
+    asyncio.run(inner())
+
+
+def test_download_invalid_path(httpd: Httpd) -> None:
+    async def inner() -> None:
+        async with HttpClient() as client:
+            with pytest.raises(FileNotFoundError):
+                await client.download(f"{httpd.prefix}/", INVALID_PATH)
+
+    asyncio.run(inner())
+
+
+UPLOAD_DATA = b"".join(b"%d\n" % i for i in range(100_000))
+
+
+def upload_chunks() -> Iterable[bytes]:
+    for i in range(0, len(UPLOAD_DATA), 10_000):
+        yield UPLOAD_DATA[i : i + 10_000]
+
+
+async def async_upload_chunks() -> AsyncIterable[bytes]:
+    for chunk in upload_chunks():
+        await asyncio.sleep(0)
+        yield chunk
+
+
+@pytest.mark.parametrize("kind", ["bytes", "path", "file", "iter", "list", "aiter"])
+def test_upload(httpd: Httpd, kind: str) -> None:
+    async def inner() -> None:
+        url = f"{httpd.prefix}/upload/data.txt"
+        async with HttpClient() as client:
+            with tempfile.TemporaryDirectory() as tmp:
+                path = Path(tmp) / "data.txt"
+                path.write_bytes(UPLOAD_DATA)
+                with open(path, "rb") as fp:
+                    body = {
+                        "bytes": UPLOAD_DATA,
+                        "path": path,
+                        "file": fp,
+                        "iter": upload_chunks(),
+                        "list": [UPLOAD_DATA[:10], UPLOAD_DATA[10:]],
+                        "aiter": async_upload_chunks(),
+                    }[kind]
+                    resp = await client.put(url, body)
+            assert resp.status in (201, 204)
+            resp = await client.get(url)
+            assert resp.status == 200
+            assert resp.content == UPLOAD_DATA
+
+    asyncio.run(inner())
+
+
+def test_upload_empty_file(httpd: Httpd) -> None:
+    async def inner() -> None:
+        url = f"{httpd.prefix}/upload/empty.txt"
+        async with HttpClient() as client:
+            with tempfile.TemporaryDirectory() as tmp:
+                path = Path(tmp) / "empty.txt"
+                path.write_bytes(b"")
+                resp = await client.put(url, path)
+            assert resp.status in (201, 204)
+            resp = await client.get(url)
+            assert resp.status == 200
+            assert resp.content == b""
+
+    asyncio.run(inner())
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="no named pipes")
+def test_upload_fifo(httpd: Httpd) -> None:
+    async def inner() -> None:
+        url = f"{httpd.prefix}/upload/fifo.txt"
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "fifo"
+            os.mkfifo(path)
+            # Blocks until the pipe is opened for reading
+            writer = threading.Thread(target=path.write_bytes, args=(UPLOAD_DATA,))
+            writer.start()
+            async with HttpClient() as client:
+                resp = await client.put(url, path)
+                writer.join()
+                assert resp.status in (201, 204)
+                resp = await client.get(url)
+                assert resp.status == 200
+                assert resp.content == UPLOAD_DATA
+
+    asyncio.run(inner())
+
+
+def test_upload_invalid_path(httpd: Httpd) -> None:
+    async def inner() -> None:
+        async with HttpClient() as client:
+            with pytest.raises(FileNotFoundError):
+                await client.put(f"{httpd.prefix}/upload/data.txt", Path(INVALID_PATH))
+
+    asyncio.run(inner())
+
+
+def test_upload_invalid_body(httpd: Httpd) -> None:
+    async def inner() -> None:
+        async with HttpClient() as client:
+            with pytest.raises(TypeError):
+                await client.put(
+                    f"{httpd.prefix}/upload/data.txt",
+                    "data",  # type:ignore[arg-type]
+                )
+
+    asyncio.run(inner())
+
+
+def test_upload_invalid_chunk(httpd: Httpd) -> None:
+    async def inner() -> None:
+        async with HttpClient() as client:
+            with pytest.raises(RequestError):
+                await client.put(
+                    f"{httpd.prefix}/upload/data.txt",
+                    ["data"],  # type:ignore[list-item]
+                )
+
+    asyncio.run(inner())
+
+
+def get_batch(prefix: str) -> List[Any]:
+    return [
+        (RequestMethod.GET, f"{prefix}/", None, None),
+        (RequestMethod.GET, f"{prefix}/not_found", None, None),
+        (RequestMethod.POST, f"{prefix}/post", None, b"TEST"),
+        (RequestMethod.GET, "ldap://127.0.0.1/", None, None),
+        (RequestMethod.GET, f"{prefix}/", {"X": b"\n"}, None),
+    ]
+
+
+def test_batch(httpd: Httpd) -> None:
+    async def inner() -> None:
+        async with HttpClient() as client:
+            results = await client.batch(get_batch(httpd.prefix), concurrency=2)
+        assert len(results) == 5
+        assert isinstance(results[0], Response)
+        assert results[0].status == 200
+        assert isinstance(results[1], Response)
+        assert results[1].status == 404
+        assert isinstance(results[2], Response)
+        assert results[2].status == 200
+        assert isinstance(results[3], RequestError)
+        assert isinstance(results[4], ValueError)
+
+    asyncio.run(inner())
+
+
+@pytest.mark.parametrize("concurrency", [1, 4, 100])
+def test_batch_concurrency(httpd: Httpd, concurrency: int) -> None:
+    async def inner() -> None:
+        n = 50
+        async with HttpClient() as client:
+            results = await client.batch(
+                (
+                    (RequestMethod.GET, f"{httpd.prefix}/?n={i}", None, None)
+                    for i in range(n)
+                ),
+                concurrency=concurrency,
+            )
+        assert len(results) == n
+        for r in results:
+            assert isinstance(r, Response)
+            assert r.status == 200
+
+    asyncio.run(inner())
+
+
+def test_as_completed(httpd: Httpd) -> None:
+    async def inner() -> None:
+        async with HttpClient() as client:
+            it = client.as_completed(get_batch(httpd.prefix))
+            results = {idx: r async for idx, r in it}
+        assert sorted(results) == [0, 1, 2, 3, 4]
+        assert isinstance(results[0], Response)
+        assert results[0].status == 200
+        assert isinstance(results[1], Response)
+        assert results[1].status == 404
+        assert isinstance(results[2], Response)
+        assert results[2].status == 200
+        assert isinstance(results[3], RequestError)
+        assert isinstance(results[4], ValueError)
+
+    asyncio.run(inner())
+
+
+def test_as_completed_order(httpd: Httpd, httpd_blackhole: BlackholeHttpd) -> None:
+    async def inner() -> None:
+        slow = f"{httpd_blackhole.prefix}/"
+        fast = f"{httpd.prefix}/"
+        async with HttpClient(timeout=1.0) as client:
+            it = client.as_completed(
+                [
+                    (RequestMethod.GET, slow, None, None),
+                    (RequestMethod.GET, fast, None, None),
+                ]
+            )
+            idx, r = await it.__anext__()
+            assert idx == 1
+            assert isinstance(r, Response)
+            idx, r = await it.__anext__()
+            assert idx == 0
+            assert isinstance(r, TimeoutError)
+            with pytest.raises(StopAsyncIteration):
+                await it.__anext__()
+
+    asyncio.run(inner())
+
+
+def batch_payload(i: int) -> bytes:
+    # New object on every call, referenced only by the batch item
+    return b"%d\n" % i * 10_000
+
+
+def test_batch_generator_body(httpd: Httpd) -> None:
+    async def inner() -> None:
+        n = 10
+        url = f"{httpd.prefix}/upload/batch"
+        async with HttpClient() as client:
+            results = await client.batch(
+                (
+                    (RequestMethod.PUT, f"{url}-{i}.txt", None, batch_payload(i))
+                    for i in range(n)
+                ),
+                concurrency=4,
+            )
+            for r in results:
+                assert isinstance(r, Response)
+                assert 200 <= r.status < 300
+            for i in range(n):
+                resp = await client.get(f"{url}-{i}.txt")
+                assert resp.content == batch_payload(i)
+
+    asyncio.run(inner())
+
+
+def test_as_completed_body(httpd: Httpd) -> None:
+    async def inner() -> None:
+        n = 10
+        url = f"{httpd.prefix}/upload/completed"
+        async with HttpClient() as client:
+            # Temporary list, requests are started on iteration
+            it = client.as_completed(
+                [
+                    (RequestMethod.PUT, f"{url}-{i}.txt", None, batch_payload(i))
+                    for i in range(n)
+                ],
+                concurrency=4,
+            )
+            async for _, r in it:
+                assert isinstance(r, Response)
+                assert 200 <= r.status < 300
+            for i in range(n):
+                resp = await client.get(f"{url}-{i}.txt")
+                assert resp.content == batch_payload(i)
+
+    asyncio.run(inner())
+
+
+def test_batch_empty(httpd: Httpd) -> None:
+    async def inner() -> None:
+        async with HttpClient() as client:
+            assert await client.batch([]) == []
+
+    asyncio.run(inner())
+
+
+def test_batch_invalid_concurrency(httpd: Httpd) -> None:
+    async def inner() -> None:
+        async with HttpClient() as client:
+            with pytest.raises(ValueError):
+                await client.batch([], concurrency=0)
+
+    asyncio.run(inner())
+
+
+def test_batch_invalid_item(httpd: Httpd) -> None:
+    async def inner() -> None:
+        async with HttpClient() as client:
+            with pytest.raises(TypeError):
+                await client.batch(
+                    [(RequestMethod.GET, "/")]  # type:ignore[list-item]
+                )
+
+    asyncio.run(inner())
+
+
+def test_pool_stats(httpd: Httpd) -> None:
+    async def inner() -> None:
+        async with HttpClient() as client:
+            assert client.pool_stats() == {}
+            await client.get(f"{httpd.prefix}/")
+            assert client.pool_stats() == {httpd.prefix: {"in_use": 0, "requests": 1}}
+            async with await client.stream(RequestMethod.GET, f"{httpd.prefix}/"):
+                assert client.pool_stats() == {
+                    httpd.prefix: {"in_use": 1, "requests": 2}
+                }
+            assert client.pool_stats() == {httpd.prefix: {"in_use": 0, "requests": 2}}
+
+    asyncio.run(inner())
+
+
+def test_pool_settings(httpd: Httpd) -> None:
+    async def inner() -> None:
+        async with HttpClient(
+            pool_max_idle_per_host=1,
+            pool_idle_timeout=None,
+            tcp_keepalive=30.0,
+        ) as client:
+            for _ in range(3):
+                resp = await client.get(f"{httpd.prefix}/")
+                assert resp.status == 200
+
+    asyncio.run(inner())
+
+
+def test_transport(httpd: Httpd) -> None:
+    async def inner() -> None:
+        url = f"{httpd.prefix}/headers/check"
+        transport = Transport()
+        async with (
+            HttpClient(transport=transport, headers={"X-Gufo-HTTP": b"TEST"}) as c1,
+            HttpClient(transport=transport) as c2,
+        ):
+            assert (await c1.get(url)).status == 200
+            assert (await c2.get(url)).status == 403
+            expected = {httpd.prefix: {"in_use": 0, "requests": 2}}
+            assert transport.pool_stats() == expected
+            assert c1.pool_stats() == expected
+            assert c2.pool_stats() == expected
+
+    asyncio.run(inner())
+
+
+def test_coalesce(httpd: Httpd) -> None:
+    async def inner() -> None:
+        async with HttpClient(coalesce=True) as client:
+            results = await asyncio.gather(
+                *[client.get(f"{httpd.prefix}/") for _ in range(100)],
+                client.get(f"{httpd.prefix}/not_found"),
+                client.get("http://127.0.0.1:1/"),
+                return_exceptions=True,
+            )
+            for r in results[:100]:
+                assert isinstance(r, Response)
+                assert r.status == 200
+            assert isinstance(results[100], Response)
+            assert results[100].status == 404
+            assert isinstance(results[101], ConnectionError)
+
+    asyncio.run(inner())
+
+
+def test_coalesce_loops(httpd: Httpd) -> None:
+    client = HttpClient(coalesce=True)
+
+    async def inner() -> None:
+        resp = await client.get(f"{httpd.prefix}/")
+        assert resp.status == 200
+
+    # Each run creates new loop
+    asyncio.run(inner())
+    asyncio.run(inner())
+
+
+async def wait_closed(httpd: BlackholeHttpd, closed: int) -> None:
+    for _ in range(50):
+        if httpd.closed >= closed:
+            return
+        await asyncio.sleep(0.1)
+    pytest.fail("connection is not closed")
+
+
+@pytest.mark.parametrize("coalesce", [False, True])
+def test_cancel_request(httpd_blackhole: BlackholeHttpd, coalesce: bool) -> None:
+    async def inner() -> None:
+        closed = httpd_blackhole.closed
+        async with HttpClient(coalesce=coalesce) as client:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(client.get(f"{httpd_blackhole.prefix}/"), 0.5)
+            # Request is dropped, connection is closed
+            await wait_closed(httpd_blackhole, closed + 1)
+            stats = client.pool_stats()
+            assert stats[httpd_blackhole.prefix]["in_use"] == 0
+
+    asyncio.run(inner())
+
+
+def test_cancel_stream(httpd_blackhole: BlackholeHttpd) -> None:
+    async def inner() -> None:
+        closed = httpd_blackhole.closed
+        async with HttpClient() as client:
+            task = asyncio.create_task(
+                client.stream(RequestMethod.GET, f"{httpd_blackhole.prefix}/")
+            )
+            await asyncio.sleep(0.5)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            await wait_closed(httpd_blackhole, closed + 1)
+
+    asyncio.run(inner())
+
+
+def test_cancel_batch(httpd_blackhole: BlackholeHttpd) -> None:
+    async def inner() -> None:
+        closed = httpd_blackhole.closed
+        url = f"{httpd_blackhole.prefix}/"
+        async with HttpClient() as client:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    client.batch([(RequestMethod.GET, url, None, None)] * 3),
+                    0.5,
+                )
+            # All requests are dropped
+            await wait_closed(httpd_blackhole, closed + 3)
+            stats = client.pool_stats()
+            assert stats[httpd_blackhole.prefix]["in_use"] == 0
+
+    asyncio.run(inner())
+
+
+def test_resolve(httpd: Httpd) -> None:
+    async def inner() -> None:
+        url = httpd.prefix.replace(HTTPD_HOST, "pinned.gufolabs.test")
+        async with HttpClient(resolve={"pinned.gufolabs.test": "127.0.0.1"}) as client:
+            resp = await client.get(f"{url}/")
+            assert resp.status == 200
+
+    asyncio.run(inner())
+
+
+def test_dns_cache(httpd: Httpd) -> None:
+    async def inner() -> None:
+        async with HttpClient(dns_ttl=60.0, dns_cache_size=1) as client:
+            for _ in range(3):
+                resp = await client.get(f"{httpd.prefix}/")
+                assert resp.status == 200
+
+    asyncio.run(inner())
+
+
+def test_dns_cache_hit(httpd: Httpd) -> None:
+    async def inner() -> None:
+        async with HttpClient(dns_ttl=60.0) as client:
+            assert client.dns_stats() == {"hits": 0, "misses": 0}
+            await client.resolve_many([HTTPD_HOST])
+            assert client.dns_stats() == {"hits": 0, "misses": 1}
+            # Served from the cache
+            resp = await client.get(f"{httpd.prefix}/")
+            assert resp.status == 200
+            assert client.dns_stats() == {"hits": 1, "misses": 1}
+
+    asyncio.run(inner())
+
+
+def test_dns_cache_negative() -> None:
+    async def inner() -> None:
+        async with HttpClient(dns_ttl=60.0, dns_negative_ttl=60.0) as client:
+            for _ in range(2):
+                assert await client.resolve_many(["unknown.invalid"]) == {
+                    "unknown.invalid": []
+                }
+            assert client.dns_stats() == {"hits": 1, "misses": 1}
+
+    asyncio.run(inner())
+
+
+def test_dns_cache_inflight() -> None:
+    async def inner() -> None:
+        async with HttpClient(dns_ttl=60.0) as client:
+            await client.resolve_many(["localhost", "localhost", "localhost"])
+            # Concurrent misses share a single lookup
+            assert client.dns_stats() == {"hits": 2, "misses": 1}
+
+    asyncio.run(inner())
+
+
+def test_dns_cache_disabled(httpd: Httpd) -> None:
+    async def inner() -> None:
+        async with HttpClient() as client:
+            with pytest.raises(ValueError):
+                await client.resolve_many([HTTPD_HOST])
+            resp = await client.get(f"{httpd.prefix}/")
+            assert resp.status == 200
+            assert client.dns_stats() == {"hits": 0, "misses": 0}
+
+    asyncio.run(inner())
+
+
+def test_resolve_many() -> None:
+    async def inner() -> None:
+        async with HttpClient(
+            dns_ttl=60.0, resolve={"pinned.gufolabs.test": "192.0.2.1"}
+        ) as client:
+            r = await client.resolve_many(
+                ["localhost", "pinned.gufolabs.test", "unknown.invalid"]
+            )
+            assert set(r) == {
+                "localhost",
+                "pinned.gufolabs.test",
+                "unknown.invalid",
+            }
+            assert r["localhost"]
+            assert r["pinned.gufolabs.test"] == ["192.0.2.1"]
+            assert r["unknown.invalid"] == []
+
+    asyncio.run(inner())
+
+
+@pytest.mark.parametrize(
+    ("settings", "exc"),
+    [
+        ({"resolve": {"pinned.gufolabs.test": "x"}}, ValueError),
+        ({"resolve": {"pinned.gufolabs.test": 1}}, TypeError),
+        ({"dns_cache_size": 0}, ValueError),
+    ],
+)
+def test_resolve_invalid(settings: Dict[str, Any], exc: Type[BaseException]) -> None:
+    with pytest.raises(exc):
+        HttpClient(**settings)
+
+
+def test_warmup(httpd: Httpd) -> None:
+    async def inner() -> None:
+        async with HttpClient(connect_timeout=1.0) as client:
+            r = await client.warmup(
+                [httpd.prefix, UNROUTABLE_URL], connections_per_host=3
+            )
+            assert r == {httpd.prefix: 3, UNROUTABLE_URL: 0}
+            stats = client.pool_stats()
+            assert stats[httpd.prefix] == {"in_use": 0, "requests": 3}
+            resp = await client.get(f"{httpd.prefix}/")
+            assert resp.status == 200
+
+    asyncio.run(inner())
+
+
+def test_warmup_empty() -> None:
+    async def inner() -> None:
+        async with HttpClient() as client:
+            assert await client.warmup([]) == {}
+
+    asyncio.run(inner())
+
+
+def test_warmup_invalid() -> None:
+    async def inner() -> None:
+        async with HttpClient() as client:
+            with pytest.raises(ValueError):
+                await client.warmup([UNROUTABLE_URL], connections_per_host=0)
+
+    asyncio.run(inner())
+
+
 def test_not_found(httpd: Httpd) -> None:
     async def inner() -> None:
         async with HttpClient() as client:
@@ -342,6 +988,208 @@ def test_headers_items(httpd: Httpd) -> None:
     asyncio.run(inner())
 
 
+def test_headers_len_iter(httpd: Httpd) -> None:
+    async def inner() -> None:
+        client = HttpClient()
+        resp = await client.get(f"{httpd.prefix}/")
+        keys = list(resp.headers)
+        assert keys == list(resp.headers.keys())
+        assert len(resp.headers) == len(keys)
+        assert "content-type" in keys
+
+    asyncio.run(inner())
+
+
+def test_headers_get_all(httpd: Httpd) -> None:
+    async def inner() -> None:
+        client = HttpClient()
+        resp = await client.get(f"{httpd.prefix}/headers/multi")
+        assert resp.status == 200
+        assert resp.headers.get_all("X-Gufo-HTTP") == [b"TEST1", b"TEST2"]
+        assert resp.headers.get_all("X-Gufo-Missed") == []
+        items = [k for k, _ in resp.headers.items() if k == "x-gufo-http"]
+        assert len(items) == 2
+        assert list(resp.headers).count("x-gufo-http") == 1
+
+    asyncio.run(inner())
+
+
+@pytest.mark.parametrize(
+    ("decode", "multi", "expected"),
+    [
+        (False, False, b"TEST1, TEST2"),
+        (True, False, "TEST1, TEST2"),
+        (False, True, [b"TEST1", b"TEST2"]),
+        (True, True, ["TEST1", "TEST2"]),
+    ],
+)
+def test_headers_to_dict(
+    httpd: Httpd, decode: bool, multi: bool, expected: Any
+) -> None:
+    async def inner() -> None:
+        client = HttpClient()
+        resp = await client.get(f"{httpd.prefix}/headers/multi")
+        assert resp.status == 200
+        assert "X-GUFO-HTTP" in resp.headers
+        r = resp.headers.to_dict(decode=decode, multi=multi)
+        assert len(r) == len(resp.headers)
+        assert set(r) == set(resp.headers)
+        assert r["x-gufo-http"] == expected
+        cookies = [b"a=1; Expires=Wed, 21 Oct 2026 07:28:00 GMT", b"b=2"]
+        if decode:
+            assert r["set-cookie"] == [c.decode() for c in cookies]
+        else:
+            assert r["set-cookie"] == cookies
+
+    asyncio.run(inner())
+
+
+def test_json(httpd: Httpd) -> None:
+    async def inner() -> None:
+        client = HttpClient()
+        resp = await client.get(f"{httpd.prefix}/json")
+        assert resp.status == 200
+        data = resp.json()
+        assert data == JSON_DATA
+        assert list(data) == ["z", "a"]
+
+    asyncio.run(inner())
+
+
+def test_json_numbers(httpd: Httpd) -> None:
+    async def inner() -> None:
+        client = HttpClient()
+        resp = await client.get(f"{httpd.prefix}/json/numbers")
+        assert resp.status == 200
+        data = resp.json()
+        assert data == json.loads(resp.content)
+        assert data == [
+            123456789012345678901234567890,
+            -123456789012345678901234567890,
+            18446744073709551615,
+            -9223372036854775808,
+            0.1,
+            1e19,
+        ]
+
+    asyncio.run(inner())
+
+
+@pytest.mark.parametrize("coalesce", [False, True])
+@pytest.mark.parametrize("parse", [None, "json"])
+def test_json_parse(httpd: Httpd, parse: Optional[str], coalesce: bool) -> None:
+    async def inner() -> None:
+        client = HttpClient(coalesce=coalesce)
+        resp = await client.request(
+            RequestMethod.GET, f"{httpd.prefix}/json", parse=parse
+        )
+        assert resp.status == 200
+        assert resp.json() == JSON_DATA
+        # Parsed once more
+        assert resp.json() == JSON_DATA
+
+    asyncio.run(inner())
+
+
+@pytest.mark.parametrize("parse", [None, "json"])
+def test_json_invalid(httpd: Httpd, parse: Optional[str]) -> None:
+    async def inner() -> None:
+        client = HttpClient()
+        resp = await client.request(RequestMethod.GET, f"{httpd.prefix}/", parse=parse)
+        assert resp.status == 200
+        with pytest.raises(ValueError):
+            resp.json()
+
+    asyncio.run(inner())
+
+
+def test_parse_invalid_mode(httpd: Httpd) -> None:
+    async def inner() -> None:
+        client = HttpClient()
+        with pytest.raises(ValueError):
+            await client.request(RequestMethod.GET, f"{httpd.prefix}/", parse="xml")
+
+    asyncio.run(inner())
+
+
+def test_put_json(httpd: Httpd) -> None:
+    async def inner() -> None:
+        url = f"{httpd.prefix}/upload/data.json"
+        async with HttpClient() as client:
+            resp = await client.put(url, json=JSON_DATA)
+            assert 200 <= resp.status < 300
+            resp = await client.get(url)
+            assert resp.status == 200
+            assert resp.json() == JSON_DATA
+
+    asyncio.run(inner())
+
+
+def test_put_json_null(httpd: Httpd) -> None:
+    async def inner() -> None:
+        url = f"{httpd.prefix}/upload/null.json"
+        async with HttpClient() as client:
+            resp = await client.put(url, json=None)
+            assert 200 <= resp.status < 300
+            resp = await client.get(url)
+            assert resp.status == 200
+            assert resp.content == b"null"
+            assert resp.json() is None
+
+    asyncio.run(inner())
+
+
+@pytest.mark.parametrize("verb", ["post", "put", "patch"])
+@pytest.mark.parametrize(
+    ("body", "json_obj", "headers", "expected"),
+    [
+        (None, JSON_DATA, None, 200),
+        (None, [], None, 200),
+        (None, None, None, 200),
+        (JsonBody(JSON_DATA), NO_JSON, None, 200),
+        (None, JSON_DATA, {"Content-Type": b"text/plain"}, 415),
+        (b"{}", NO_JSON, None, 415),
+    ],
+)
+def test_json_content_type(
+    httpd: Httpd,
+    verb: str,
+    body: Optional[Any],
+    json_obj: Any,
+    headers: Optional[Dict[str, bytes]],
+    expected: int,
+) -> None:
+    async def inner() -> None:
+        async with HttpClient() as client:
+            resp = await getattr(client, verb)(
+                f"{httpd.prefix}/json/check", body, headers=headers, json=json_obj
+            )
+            assert resp.status == expected
+
+    asyncio.run(inner())
+
+
+def test_json_and_body(httpd: Httpd) -> None:
+    async def inner() -> None:
+        async with HttpClient() as client:
+            with pytest.raises(ValueError):
+                await client.post(f"{httpd.prefix}/post", b"{}", json={})
+
+    asyncio.run(inner())
+
+
+def test_headers_iter_outlives_response(httpd: Httpd) -> None:
+    async def inner() -> None:
+        client = HttpClient()
+        resp = await client.get(f"{httpd.prefix}/")
+        expected = list(resp.headers.items())
+        items = resp.headers.items()
+        del resp
+        assert list(items) == expected
+
+    asyncio.run(inner())
+
+
 def test_redirect_to_root(httpd: Httpd) -> None:
     async def inner() -> None:
         async with HttpClient() as client:
@@ -450,6 +1298,30 @@ def test_get_with_header_request(httpd: Httpd) -> None:
     asyncio.run(inner())
 
 
+def test_get_with_request_headers(httpd: Httpd) -> None:
+    async def inner() -> None:
+        headers = RequestHeaders({"X-Gufo-HTTP": b"TEST"})
+        async with HttpClient(headers={"X-Gufo-HTTP": b"FAIL"}) as client:
+            for _ in range(3):
+                resp = await client.get(
+                    f"{httpd.prefix}/headers/check", headers=headers
+                )
+                assert resp.status == 200
+
+    asyncio.run(inner())
+
+
+def test_batch_request_headers(httpd: Httpd) -> None:
+    async def inner() -> None:
+        headers = RequestHeaders({"X-Gufo-HTTP": b"TEST"})
+        url = f"{httpd.prefix}/headers/check"
+        async with HttpClient() as client:
+            r = await client.batch([(RequestMethod.GET, url, headers, None)] * 3)
+            assert all(resp.status == 200 for resp in r)
+
+    asyncio.run(inner())
+
+
 @pytest.mark.parametrize("compression", [None, GZIP])
 def test_compression(httpd: Httpd, compression: Optional[int]) -> None:
     async def inner() -> None:
@@ -481,6 +1353,20 @@ def test_request_timeout(httpd_blackhole: BlackholeHttpd) -> None:
     asyncio.run(inner())
 
 
+def test_request_timeout_override(
+    httpd: Httpd, httpd_blackhole: BlackholeHttpd
+) -> None:
+    async def inner() -> None:
+        async with HttpClient(timeout=0.001) as client:
+            resp = await client.get(f"{httpd.prefix}/", timeout=10.0)
+            assert resp.status == 200
+        async with HttpClient() as client:
+            with pytest.raises(TimeoutError):
+                await client.get(f"{httpd_blackhole.prefix}/", timeout=1.0)
+
+    asyncio.run(inner())
+
+
 def test_default_user_agent(httpd: Httpd) -> None:
     async def inner() -> None:
         async with HttpClient() as client:
@@ -557,6 +1443,137 @@ def test_tls_get(httpd_tls: Httpd) -> None:
     asyncio.run(inner())
 
 
+@pytest.mark.parametrize(
+    ("settings", "expected"),
+    [
+        ({}, {"handshakes": 3, "offered": 2}),
+        ({"tls_session_tickets": False}, {"handshakes": 3, "offered": 2}),
+        ({"tls_session_cache_size": 0}, {"handshakes": 3, "offered": 0}),
+    ],
+)
+def test_tls_session_resumption(
+    httpd_tls: Httpd, settings: Dict[str, Any], expected: Dict[str, int]
+) -> None:
+    async def inner() -> None:
+        # New connection for each request
+        async with HttpClient(
+            validate_cert=False, pool_max_idle_per_host=0, **settings
+        ) as client:
+            assert client.tls_stats() == {"handshakes": 0, "offered": 0}
+            for _ in range(3):
+                resp = await client.get(f"{httpd_tls.prefix}/")
+                assert resp.status == 200
+            assert client.tls_stats() == expected
+
+    asyncio.run(inner())
+
+
+def test_tls_config_shared(httpd_tls: Httpd) -> None:
+    async def inner() -> None:
+        config = TlsConfig(min_version="1.3")
+        for _ in range(2):
+            async with HttpClient(validate_cert=False, tls_config=config) as client:
+                resp = await client.get(f"{httpd_tls.prefix}/")
+                assert resp.status == 200
+
+    asyncio.run(inner())
+
+
+def test_tls_ca_certs(httpd_tls: Httpd) -> None:
+    async def inner() -> None:
+        async with HttpClient(ca_certs=httpd_tls.ca_cert) as client:
+            resp = await client.get(f"{httpd_tls.prefix}/")
+            assert resp.status == 200
+
+    asyncio.run(inner())
+
+
+def test_tls_client_cert(httpd_mtls: Httpd) -> None:
+    async def inner() -> None:
+        async with HttpClient(
+            ca_certs=httpd_mtls.ca_cert,
+            client_cert=httpd_mtls.client_cert,
+            client_key=httpd_mtls.client_key,
+        ) as client:
+            resp = await client.get(f"{httpd_mtls.prefix}/")
+            assert resp.status == 200
+
+    asyncio.run(inner())
+
+
+def test_tls_client_cert_missing(httpd_mtls: Httpd) -> None:
+    async def inner() -> None:
+        async with HttpClient(ca_certs=httpd_mtls.ca_cert) as client:
+            resp = await client.get(f"{httpd_mtls.prefix}/")
+            # No required SSL certificate was sent
+            assert resp.status == 400
+
+    asyncio.run(inner())
+
+
+def test_tls_ca_certs_untrusted(httpd_tls: Httpd, tls_cert: Tuple[Path, Path]) -> None:
+    async def inner() -> None:
+        # Server's certificate is not signed by custom CA
+        async with HttpClient(ca_certs=tls_cert[0]) as client:
+            with pytest.raises(ConnectionError):
+                await client.get(f"{httpd_tls.prefix}/")
+
+    asyncio.run(inner())
+
+
+@pytest.mark.parametrize(
+    "settings",
+    [
+        {"http2_prior_knowledge": True},
+        {"http2_adaptive_window": True},
+        {
+            "http2_initial_stream_window_size": 1 << 20,
+            "http2_initial_connection_window_size": 1 << 22,
+            "http2_max_frame_size": 1 << 15,
+        },
+        {
+            "http2_keep_alive_interval": 10.0,
+            "http2_keep_alive_timeout": 5.0,
+            "http2_keep_alive_while_idle": True,
+        },
+    ],
+)
+def test_http2(httpd_tls: Httpd, settings: Dict[str, Any]) -> None:
+    async def inner() -> None:
+        async with HttpClient(validate_cert=False, **settings) as client:
+            for _ in range(3):
+                resp = await client.get(f"{httpd_tls.prefix}/")
+                assert resp.status == 200
+
+    asyncio.run(inner())
+
+
+@pytest.mark.parametrize(
+    "settings",
+    [
+        {"http2_initial_stream_window_size": 1 << 31},
+        {"http2_initial_connection_window_size": 1 << 31},
+        {"http2_max_frame_size": 1 << 13},
+        {"http2_max_frame_size": 1 << 24},
+    ],
+)
+def test_http2_invalid(settings: Dict[str, Any]) -> None:
+    with pytest.raises(ValueError):
+        HttpClient(**settings)
+
+
+@pytest.mark.skipif(HTTP3, reason="HTTP/3 support is compiled in")
+def test_http3_unavailable() -> None:
+    with pytest.raises(ValueError):
+        HttpClient(http3=True)
+
+
+@pytest.mark.skipif(not HTTP3, reason="HTTP/3 support is not compiled in")
+def test_http3_prior_knowledge_conflict() -> None:
+    with pytest.raises(ValueError):
+        HttpClient(http3=True, http2_prior_knowledge=True)
+
+
 @pytest.mark.parametrize(
     "proxy",
     [1, "x", [1], [Proxy("http://127.0.0.1:3128"), BasicAuth("test", None)]],
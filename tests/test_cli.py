@@ -6,6 +6,7 @@
 # ---------------------------------------------------------------------
 
 # Python modules
+import os
 import tempfile
 from typing import List, Optional
 
@@ -15,6 +16,7 @@ import pytest
 # Gufo HTTP modules
 from gufo.http.cli import Cli, ExitCode
 from gufo.http.httpd import Httpd
+from gufo.http.sync_client import HttpClient
 
 
 class GuardedCli(Cli):
@@ -66,6 +68,44 @@ def test_cli_get_file(
             assert "</html>" in data
 
 
+def test_cli_get_file_not_found(
+    httpd: Httpd,
+) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "out.html")
+        cli_args = ["-o", path, f"{httpd.prefix}/not_found"]
+        with pytest.raises(RuntimeError, match="404"):
+            GuardedCli().run(cli_args)
+        assert not os.path.exists(path)
+
+
+@pytest.mark.parametrize("path", ["/not_found", "http://127.0.0.1:1/"])
+def test_cli_get_file_keep_existing(httpd: Httpd, path: str) -> None:
+    url = f"{httpd.prefix}{path}" if path.startswith("/") else path
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "out.html")
+        with open(out, "w") as fp:
+            fp.write("original")
+        with pytest.raises(RuntimeError):
+            GuardedCli().run(["-o", out, url])
+        with open(out) as fp:
+            assert fp.read() == "original"
+        # No temporary files left
+        assert os.listdir(tmp) == ["out.html"]
+
+
+def test_cli_get_file_os_error(httpd: Httpd, monkeypatch: pytest.MonkeyPatch) -> None:
+    def download(*args: object, **kwargs: object) -> None:
+        msg = "test error"
+        raise OSError(msg)
+
+    monkeypatch.setattr(HttpClient, "download", download)
+    with tempfile.TemporaryDirectory() as tmp:
+        cli_args = ["-o", os.path.join(tmp, "out.html"), httpd.prefix]
+        with pytest.raises(RuntimeError, match="test error"):
+            GuardedCli().run(cli_args)
+
+
 def test_cli_get_wrong_file(
     httpd: Httpd,
 ) -> None:
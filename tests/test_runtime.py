@@ -0,0 +1,83 @@
+# ---------------------------------------------------------------------
+# Gufo HTTP: configure_runtime tests
+# ---------------------------------------------------------------------
+# Copyright (C) 2025, Gufo Labs
+# See LICENSE.md for details
+# ---------------------------------------------------------------------
+
+# Python modules
+import asyncio
+import subprocess
+import sys
+from typing import Any, Dict
+
+# Third-party modules
+import pytest
+
+# Gufo HTTP modules
+from gufo.http import configure_runtime
+from gufo.http.async_client import HttpClient
+from gufo.http.httpd import Httpd
+
+SCRIPT = """
+import asyncio
+import sys
+
+from gufo.http import configure_runtime
+from gufo.http.async_client import HttpClient
+
+configure_runtime({args})
+
+
+async def main() -> None:
+    async with HttpClient() as client:
+        resp = await client.get(sys.argv[1])
+        assert resp.status == 200
+
+
+asyncio.run(main())
+"""
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        {},
+        {"worker_threads": 1},
+        {"worker_threads": 2, "max_blocking_threads": 4},
+        {"thread_stack_size": 1 << 20},
+        {"current_thread": True},
+    ],
+)
+def test_configure_runtime(httpd: Httpd, args: Dict[str, Any]) -> None:
+    # Runtime is configured once per process
+    script = SCRIPT.format(args=", ".join(f"{k}={v!r}" for k, v in args.items()))
+    subprocess.run(
+        [sys.executable, "-c", script, f"{httpd.prefix}/"],
+        check=True,
+        timeout=30,
+    )
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        {"worker_threads": 0},
+        {"max_blocking_threads": 0},
+        {"thread_stack_size": 0},
+        {"worker_threads": 1, "current_thread": True},
+    ],
+)
+def test_configure_runtime_invalid(args: Dict[str, Any]) -> None:
+    with pytest.raises(ValueError):
+        configure_runtime(**args)
+
+
+def test_configure_runtime_started(httpd: Httpd) -> None:
+    async def inner() -> None:
+        async with HttpClient() as client:
+            await client.get(f"{httpd.prefix}/")
+
+    asyncio.run(inner())
+    with pytest.raises(RuntimeError):
+        configure_runtime()
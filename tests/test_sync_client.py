@@ -6,8 +6,13 @@
 # ---------------------------------------------------------------------
 
 # Python modules
+import json
+import os
+import tempfile
+import threading
 from collections.abc import Iterable
-from typing import Any, ClassVar, Dict, Optional, Type
+from pathlib import Path
+from typing import Any, ClassVar, Dict, List, Optional, Tuple, Type
 
 # Third-party modules
 import pytest
@@ -15,20 +20,33 @@ import pytest
 # Gufo HTTP Modules
 from gufo.http import (
     GZIP,
+    HTTP3,
     AuthBase,
     BasicAuth,
     BearerAuth,
     HttpError,
+    JsonBody,
     Proxy,
     RedirectError,
     RequestError,
+    RequestHeaders,
     RequestMethod,
+    Response,
+    TlsConfig,
 )
 from gufo.http.httpd import Httpd
-from gufo.http.sync_client import HttpClient
+from gufo.http.sync_client import DEFAULT_CONCURRENCY, HttpClient, Transport
+from gufo.http.util import NO_JSON
 
 from .blackhole import BlackholeHttpd
-from .util import UNROUTABLE_PROXY, UNROUTABLE_URL, with_env
+from .util import (
+    HTTPD_HOST,
+    INVALID_PATH,
+    JSON_DATA,
+    UNROUTABLE_PROXY,
+    UNROUTABLE_URL,
+    with_env,
+)
 
 
 def test_get(httpd: Httpd) -> None:
@@ -148,6 +166,445 @@ def test_request_by_str(
         assert 200 <= resp.status <= 299
 
 
+@pytest.mark.parametrize("chunk_size", [None, 1, 100, 1_000_000])
+def test_stream(httpd: Httpd, chunk_size: Optional[int]) -> None:
+    with HttpClient() as client:
+        expected = client.get(f"{httpd.prefix}/").content
+        with client.stream(RequestMethod.GET, f"{httpd.prefix}/") as resp:
+            assert resp.status == 200
+            assert b"text/html" in resp.headers["Content-Type"]
+            if chunk_size is None:
+                chunks = list(resp.iter_bytes())
+            else:
+                chunks = list(resp.iter_bytes(chunk_size))
+                assert all(len(c) == chunk_size for c in chunks[:-1])
+            assert chunks
+            assert b"".join(chunks) == expected
+            # Exhausted
+            assert list(resp.iter_bytes()) == []
+
+
+def test_stream_close(httpd: Httpd) -> None:
+    with HttpClient() as client:
+        resp = client.stream(RequestMethod.GET, f"{httpd.prefix}/")
+        it = resp.iter_bytes(10)
+        assert len(next(it)) == 10
+        resp.close()
+        assert list(it) == []
+
+
+def test_stream_invalid_chunk_size(httpd: Httpd) -> None:
+    with HttpClient() as client:
+        with client.stream(RequestMethod.GET, f"{httpd.prefix}/") as resp:
+            with pytest.raises(ValueError):
+                resp.iter_bytes(0)
+
+
+def test_body(httpd: Httpd) -> None:
+    with HttpClient() as client:
+        resp = client.get(f"{httpd.prefix}/")
+        assert resp.status == 200
+        body = resp.body
+        assert len(body) == len(resp.content)
+        mv = memoryview(body)
+        assert mv.readonly
+        assert mv == resp.content
+        assert bytes(body) == resp.content
+        assert resp.content is resp.content
+
+
+def test_download(httpd: Httpd) -> None:
+    with HttpClient() as client:
+        expected = client.get(f"{httpd.prefix}/").content
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.html")
+            resp = client.download(f"{httpd.prefix}/", path)
+            assert resp.status == 200
+            assert b"text/html" in resp.headers["Content-Type"]
+            assert resp.content == b""
+            with open(path, "rb") as fp:
+                assert fp.read() == expected
+
+
+def test_download_invalid_path(httpd: Httpd) -> None:
+    with HttpClient() as client:
+        with pytest.raises(FileNotFoundError):
+            client.download(f"{httpd.prefix}/", INVALID_PATH)
+
+
+UPLOAD_DATA = b"".join(b"%d\n" % i for i in range(100_000))
+
+
+def upload_chunks() -> Iterable[bytes]:
+    for i in range(0, len(UPLOAD_DATA), 10_000):
+        yield UPLOAD_DATA[i : i + 10_000]
+
+
+@pytest.mark.parametrize("kind", ["bytes", "path", "file", "iter", "list"])
+def test_upload(httpd: Httpd, kind: str) -> None:
+    url = f"{httpd.prefix}/upload/data.txt"
+    with tempfile.TemporaryDirectory() as tmp, HttpClient() as client:
+        path = Path(tmp) / "data.txt"
+        path.write_bytes(UPLOAD_DATA)
+        with open(path, "rb") as fp:
+            body = {
+                "bytes": UPLOAD_DATA,
+                "path": path,
+                "file": fp,
+                "iter": upload_chunks(),
+                "list": [UPLOAD_DATA[:10], UPLOAD_DATA[10:]],
+            }[kind]
+            resp = client.put(url, body)
+        assert resp.status in (201, 204)
+        resp = client.get(url)
+        assert resp.status == 200
+        assert resp.content == UPLOAD_DATA
+
+
+def test_upload_empty_file(httpd: Httpd) -> None:
+    url = f"{httpd.prefix}/upload/empty.txt"
+    with tempfile.TemporaryDirectory() as tmp, HttpClient() as client:
+        path = Path(tmp) / "empty.txt"
+        path.write_bytes(b"")
+        resp = client.put(url, path)
+        assert resp.status in (201, 204)
+        resp = client.get(url)
+        assert resp.status == 200
+        assert resp.content == b""
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="no named pipes")
+def test_upload_fifo(httpd: Httpd) -> None:
+    url = f"{httpd.prefix}/upload/fifo.txt"
+    with tempfile.TemporaryDirectory() as tmp, HttpClient() as client:
+        path = Path(tmp) / "fifo"
+        os.mkfifo(path)
+        # Blocks until the pipe is opened for reading
+        writer = threading.Thread(target=path.write_bytes, args=(UPLOAD_DATA,))
+        writer.start()
+        resp = client.put(url, path)
+        writer.join()
+        assert resp.status in (201, 204)
+        resp = client.get(url)
+        assert resp.status == 200
+        assert resp.content == UPLOAD_DATA
+
+
+def test_upload_invalid_path(httpd: Httpd) -> None:
+    with HttpClient() as client, pytest.raises(FileNotFoundError):
+        client.put(f"{httpd.prefix}/upload/data.txt", Path(INVALID_PATH))
+
+
+def test_upload_invalid_body(httpd: Httpd) -> None:
+    with HttpClient() as client, pytest.raises(TypeError):
+        client.put(
+            f"{httpd.prefix}/upload/data.txt",
+            "data",  # type:ignore[arg-type]
+        )
+
+
+def test_upload_invalid_chunk(httpd: Httpd) -> None:
+    with HttpClient() as client, pytest.raises(RequestError):
+        client.put(
+            f"{httpd.prefix}/upload/data.txt",
+            ["data"],  # type:ignore[list-item]
+        )
+
+
+def get_batch(prefix: str) -> List[Any]:
+    return [
+        (RequestMethod.GET, f"{prefix}/", None, None),
+        (RequestMethod.GET, f"{prefix}/not_found", None, None),
+        (RequestMethod.POST, f"{prefix}/post", None, b"TEST"),
+        (RequestMethod.GET, "ldap://127.0.0.1/", None, None),
+        (RequestMethod.GET, f"{prefix}/", {"X": b"\n"}, None),
+    ]
+
+
+def test_batch(httpd: Httpd) -> None:
+    with HttpClient() as client:
+        results = client.batch(get_batch(httpd.prefix), concurrency=2)
+    assert len(results) == 5
+    assert isinstance(results[0], Response)
+    assert results[0].status == 200
+    assert isinstance(results[1], Response)
+    assert results[1].status == 404
+    assert isinstance(results[2], Response)
+    assert results[2].status == 200
+    assert isinstance(results[3], RequestError)
+    assert isinstance(results[4], ValueError)
+
+
+@pytest.mark.parametrize("concurrency", [1, 4, 100])
+def test_batch_concurrency(httpd: Httpd, concurrency: int) -> None:
+    n = 50
+    with HttpClient() as client:
+        results = client.batch(
+            (
+                (RequestMethod.GET, f"{httpd.prefix}/?n={i}", None, None)
+                for i in range(n)
+            ),
+            concurrency=concurrency,
+        )
+    assert len(results) == n
+    for r in results:
+        assert isinstance(r, Response)
+        assert r.status == 200
+
+
+def test_as_completed(httpd: Httpd) -> None:
+    with HttpClient() as client:
+        results = dict(client.as_completed(get_batch(httpd.prefix)))
+    assert sorted(results) == [0, 1, 2, 3, 4]
+    assert isinstance(results[0], Response)
+    assert results[0].status == 200
+    assert isinstance(results[1], Response)
+    assert results[1].status == 404
+    assert isinstance(results[2], Response)
+    assert results[2].status == 200
+    assert isinstance(results[3], RequestError)
+    assert isinstance(results[4], ValueError)
+
+
+def test_as_completed_order(httpd: Httpd, httpd_blackhole: BlackholeHttpd) -> None:
+    slow = f"{httpd_blackhole.prefix}/"
+    fast = f"{httpd.prefix}/"
+    with HttpClient(timeout=1.0) as client:
+        it = client.as_completed(
+            [
+                (RequestMethod.GET, slow, None, None),
+                (RequestMethod.GET, fast, None, None),
+            ]
+        )
+        idx, r = next(it)
+        assert idx == 1
+        assert isinstance(r, Response)
+        idx, r = next(it)
+        assert idx == 0
+        assert isinstance(r, TimeoutError)
+        with pytest.raises(StopIteration):
+            next(it)
+
+
+def batch_payload(i: int) -> bytes:
+    # New object on every call, referenced only by the batch item
+    return b"%d\n" % i * 10_000
+
+
+@pytest.mark.skipif(
+    not os.path.isdir("/proc/self/task"), reason="requires /proc/self/task"
+)
+def test_batch_reuses_workers(httpd: Httpd) -> None:
+    def threads() -> int:
+        return len(os.listdir("/proc/self/task"))
+
+    n = 300
+    reqs = [(RequestMethod.GET, f"{httpd.prefix}/", None, None)] * n
+    before = threads()
+    with HttpClient() as client:
+        for _ in range(3):
+            results = client.batch(reqs, concurrency=1000)
+            assert len(results) == n
+            for r in results:
+                assert isinstance(r, Response)
+                assert r.status == 200
+            # Worker threads are limited and reused between batches
+            assert threads() <= before + 256
+
+
+def test_batch_generator_body(httpd: Httpd) -> None:
+    n = 10
+    url = f"{httpd.prefix}/upload/batch"
+    with HttpClient() as client:
+        results = client.batch(
+            (
+                (RequestMethod.PUT, f"{url}-{i}.txt", None, batch_payload(i))
+                for i in range(n)
+            ),
+            concurrency=4,
+        )
+        for r in results:
+            assert isinstance(r, Response)
+            assert 200 <= r.status < 300
+        for i in range(n):
+            resp = client.get(f"{url}-{i}.txt")
+            assert resp.content == batch_payload(i)
+
+
+def test_as_completed_body(httpd: Httpd) -> None:
+    n = 10
+    url = f"{httpd.prefix}/upload/completed"
+    with HttpClient() as client:
+        # Temporary list, released before the iteration
+        it = client.as_completed(
+            [
+                (RequestMethod.PUT, f"{url}-{i}.txt", None, batch_payload(i))
+                for i in range(n)
+            ],
+            concurrency=4,
+        )
+        for _, r in it:
+            assert isinstance(r, Response)
+            assert 200 <= r.status < 300
+        for i in range(n):
+            resp = client.get(f"{url}-{i}.txt")
+            assert resp.content == batch_payload(i)
+
+
+def test_batch_empty(httpd: Httpd) -> None:
+    with HttpClient() as client:
+        assert client.batch([]) == []
+
+
+def test_batch_invalid_concurrency(httpd: Httpd) -> None:
+    with HttpClient() as client, pytest.raises(ValueError):
+        client.batch([], concurrency=0)
+
+
+def test_batch_invalid_item(httpd: Httpd) -> None:
+    with HttpClient() as client, pytest.raises(TypeError):
+        client.batch([(RequestMethod.GET, "/")])  # type:ignore[list-item]
+
+
+def test_pool_stats(httpd: Httpd) -> None:
+    with HttpClient() as client:
+        assert client.pool_stats() == {}
+        client.get(f"{httpd.prefix}/")
+        assert client.pool_stats() == {httpd.prefix: {"in_use": 0, "requests": 1}}
+        with client.stream(RequestMethod.GET, f"{httpd.prefix}/"):
+            assert client.pool_stats() == {httpd.prefix: {"in_use": 1, "requests": 2}}
+        assert client.pool_stats() == {httpd.prefix: {"in_use": 0, "requests": 2}}
+
+
+def test_pool_settings(httpd: Httpd) -> None:
+    with HttpClient(
+        pool_max_idle_per_host=1, pool_idle_timeout=None, tcp_keepalive=30.0
+    ) as client:
+        for _ in range(3):
+            resp = client.get(f"{httpd.prefix}/")
+            assert resp.status == 200
+
+
+def test_transport(httpd: Httpd) -> None:
+    url = f"{httpd.prefix}/headers/check"
+    transport = Transport()
+    with (
+        HttpClient(transport=transport, headers={"X-Gufo-HTTP": b"TEST"}) as c1,
+        HttpClient(transport=transport) as c2,
+    ):
+        assert c1.get(url).status == 200
+        assert c2.get(url).status == 403
+        expected = {httpd.prefix: {"in_use": 0, "requests": 2}}
+        assert transport.pool_stats() == expected
+        assert c1.pool_stats() == expected
+        assert c2.pool_stats() == expected
+
+
+def test_resolve(httpd: Httpd) -> None:
+    url = httpd.prefix.replace(HTTPD_HOST, "pinned.gufolabs.test")
+    with HttpClient(resolve={"pinned.gufolabs.test": "127.0.0.1"}) as client:
+        resp = client.get(f"{url}/")
+        assert resp.status == 200
+
+
+def test_dns_cache(httpd: Httpd) -> None:
+    with HttpClient(dns_ttl=60.0, dns_cache_size=1) as client:
+        for _ in range(3):
+            resp = client.get(f"{httpd.prefix}/")
+            assert resp.status == 200
+
+
+def test_dns_cache_hit(httpd: Httpd) -> None:
+    with HttpClient(dns_ttl=60.0) as client:
+        assert client.dns_stats() == {"hits": 0, "misses": 0}
+        client.resolve_many([HTTPD_HOST])
+        assert client.dns_stats() == {"hits": 0, "misses": 1}
+        # Served from the cache
+        resp = client.get(f"{httpd.prefix}/")
+        assert resp.status == 200
+        assert client.dns_stats() == {"hits": 1, "misses": 1}
+
+
+def test_dns_cache_negative() -> None:
+    with HttpClient(dns_ttl=60.0, dns_negative_ttl=60.0) as client:
+        for _ in range(2):
+            assert client.resolve_many(["unknown.invalid"]) == {"unknown.invalid": []}
+        assert client.dns_stats() == {"hits": 1, "misses": 1}
+
+
+def test_dns_cache_inflight() -> None:
+    with HttpClient(dns_ttl=60.0) as client:
+        client.resolve_many(["localhost", "localhost", "localhost"])
+        # Concurrent misses share a single lookup
+        assert client.dns_stats() == {"hits": 2, "misses": 1}
+
+
+def test_dns_cache_disabled(httpd: Httpd) -> None:
+    with HttpClient() as client:
+        with pytest.raises(ValueError):
+            client.resolve_many([HTTPD_HOST])
+        resp = client.get(f"{httpd.prefix}/")
+        assert resp.status == 200
+        assert client.dns_stats() == {"hits": 0, "misses": 0}
+
+
+def test_resolve_many() -> None:
+    with HttpClient(
+        dns_ttl=60.0, resolve={"pinned.gufolabs.test": "192.0.2.1"}
+    ) as client:
+        r = client.resolve_many(
+            ["localhost", "pinned.gufolabs.test", "unknown.invalid"]
+        )
+        assert set(r) == {
+            "localhost",
+            "pinned.gufolabs.test",
+            "unknown.invalid",
+        }
+        assert r["localhost"]
+        assert r["pinned.gufolabs.test"] == ["192.0.2.1"]
+        assert r["unknown.invalid"] == []
+
+
+@pytest.mark.parametrize(
+    ("settings", "exc"),
+    [
+        ({"resolve": {"pinned.gufolabs.test": "x"}}, ValueError),
+        ({"resolve": {"pinned.gufolabs.test": 1}}, TypeError),
+        ({"dns_cache_size": 0}, ValueError),
+    ],
+)
+def test_resolve_invalid(settings: Dict[str, Any], exc: Type[BaseException]) -> None:
+    with pytest.raises(exc):
+        HttpClient(**settings)
+
+
+def test_warmup(httpd: Httpd) -> None:
+    with HttpClient(connect_timeout=1.0) as client:
+        r = client.warmup([httpd.prefix, UNROUTABLE_URL], connections_per_host=3)
+        assert r == {httpd.prefix: 3, UNROUTABLE_URL: 0}
+        stats = client.pool_stats()
+        assert stats[httpd.prefix] == {"in_use": 0, "requests": 3}
+        resp = client.get(f"{httpd.prefix}/")
+        assert resp.status == 200
+
+
+def test_warmup_over_concurrency(httpd: Httpd) -> None:
+    n = DEFAULT_CONCURRENCY + 10
+    with HttpClient() as client:
+        r = client.warmup([httpd.prefix], connections_per_host=n)
+        assert r == {httpd.prefix: n}
+
+
+def test_warmup_empty() -> None:
+    with HttpClient() as client:
+        assert client.warmup([]) == {}
+
+
+def test_warmup_invalid() -> None:
+    with HttpClient() as client, pytest.raises(ValueError):
+        client.warmup([UNROUTABLE_URL], connections_per_host=0)
+
+
 def test_not_found(httpd: Httpd) -> None:
     with HttpClient() as client:
         resp = client.get(f"{httpd.prefix}/not_found")
@@ -276,6 +733,165 @@ def test_headers_items(httpd: Httpd) -> None:
     assert b"text/html" in data["content-type"]
 
 
+def test_headers_len_iter(httpd: Httpd) -> None:
+    client = HttpClient()
+    resp = client.get(f"{httpd.prefix}/")
+    keys = list(resp.headers)
+    assert keys == list(resp.headers.keys())
+    assert len(resp.headers) == len(keys)
+    assert "content-type" in keys
+
+
+def test_headers_get_all(httpd: Httpd) -> None:
+    client = HttpClient()
+    resp = client.get(f"{httpd.prefix}/headers/multi")
+    assert resp.status == 200
+    assert resp.headers.get_all("X-Gufo-HTTP") == [b"TEST1", b"TEST2"]
+    assert resp.headers.get_all("X-Gufo-Missed") == []
+    items = [k for k, _ in resp.headers.items() if k == "x-gufo-http"]
+    assert len(items) == 2
+    assert list(resp.headers).count("x-gufo-http") == 1
+
+
+@pytest.mark.parametrize(
+    ("decode", "multi", "expected"),
+    [
+        (False, False, b"TEST1, TEST2"),
+        (True, False, "TEST1, TEST2"),
+        (False, True, [b"TEST1", b"TEST2"]),
+        (True, True, ["TEST1", "TEST2"]),
+    ],
+)
+def test_headers_to_dict(
+    httpd: Httpd, decode: bool, multi: bool, expected: Any
+) -> None:
+    client = HttpClient()
+    resp = client.get(f"{httpd.prefix}/headers/multi")
+    assert resp.status == 200
+    assert "X-GUFO-HTTP" in resp.headers
+    r = resp.headers.to_dict(decode=decode, multi=multi)
+    assert len(r) == len(resp.headers)
+    assert set(r) == set(resp.headers)
+    assert r["x-gufo-http"] == expected
+    cookies = [b"a=1; Expires=Wed, 21 Oct 2026 07:28:00 GMT", b"b=2"]
+    if decode:
+        assert r["set-cookie"] == [c.decode() for c in cookies]
+    else:
+        assert r["set-cookie"] == cookies
+
+
+def test_json(httpd: Httpd) -> None:
+    client = HttpClient()
+    resp = client.get(f"{httpd.prefix}/json")
+    assert resp.status == 200
+    data = resp.json()
+    assert data == JSON_DATA
+    assert list(data) == ["z", "a"]
+
+
+def test_json_numbers(httpd: Httpd) -> None:
+    client = HttpClient()
+    resp = client.get(f"{httpd.prefix}/json/numbers")
+    assert resp.status == 200
+    data = resp.json()
+    assert data == json.loads(resp.content)
+    assert data == [
+        123456789012345678901234567890,
+        -123456789012345678901234567890,
+        18446744073709551615,
+        -9223372036854775808,
+        0.1,
+        1e19,
+    ]
+
+
+@pytest.mark.parametrize("parse", [None, "json"])
+def test_json_parse(httpd: Httpd, parse: Optional[str]) -> None:
+    client = HttpClient()
+    resp = client.request(RequestMethod.GET, f"{httpd.prefix}/json", parse=parse)
+    assert resp.status == 200
+    assert resp.json() == JSON_DATA
+    # Parsed once more
+    assert resp.json() == JSON_DATA
+
+
+@pytest.mark.parametrize("parse", [None, "json"])
+def test_json_invalid(httpd: Httpd, parse: Optional[str]) -> None:
+    client = HttpClient()
+    resp = client.request(RequestMethod.GET, f"{httpd.prefix}/", parse=parse)
+    assert resp.status == 200
+    with pytest.raises(ValueError):
+        resp.json()
+
+
+def test_parse_invalid_mode(httpd: Httpd) -> None:
+    client = HttpClient()
+    with pytest.raises(ValueError):
+        client.request(RequestMethod.GET, f"{httpd.prefix}/", parse="xml")
+
+
+def test_put_json(httpd: Httpd) -> None:
+    url = f"{httpd.prefix}/upload/data.json"
+    with HttpClient() as client:
+        resp = client.put(url, json=JSON_DATA)
+        assert 200 <= resp.status < 300
+        resp = client.get(url)
+        assert resp.status == 200
+        assert resp.json() == JSON_DATA
+
+
+def test_put_json_null(httpd: Httpd) -> None:
+    url = f"{httpd.prefix}/upload/null.json"
+    with HttpClient() as client:
+        resp = client.put(url, json=None)
+        assert 200 <= resp.status < 300
+        resp = client.get(url)
+        assert resp.status == 200
+        assert resp.content == b"null"
+        assert resp.json() is None
+
+
+@pytest.mark.parametrize("verb", ["post", "put", "patch"])
+@pytest.mark.parametrize(
+    ("body", "json_obj", "headers", "expected"),
+    [
+        (None, JSON_DATA, None, 200),
+        (None, [], None, 200),
+        (None, None, None, 200),
+        (JsonBody(JSON_DATA), NO_JSON, None, 200),
+        (None, JSON_DATA, {"Content-Type": b"text/plain"}, 415),
+        (b"{}", NO_JSON, None, 415),
+    ],
+)
+def test_json_content_type(
+    httpd: Httpd,
+    verb: str,
+    body: Optional[Any],
+    json_obj: Any,
+    headers: Optional[Dict[str, bytes]],
+    expected: int,
+) -> None:
+    with HttpClient() as client:
+        resp = getattr(client, verb)(
+            f"{httpd.prefix}/json/check", body, headers=headers, json=json_obj
+        )
+        assert resp.status == expected
+
+
+def test_json_and_body(httpd: Httpd) -> None:
+    with HttpClient() as client, pytest.raises(ValueError):
+        client.post(f"{httpd.prefix}/post", b"{}", json={})
+
+
+def test_headers_iter_outlives_response(httpd: Httpd) -> None:
+    client = HttpClient()
+    resp = client.get(f"{httpd.prefix}/")
+    expected = list(resp.headers.items())
+    items = resp.headers.items()
+    del resp
+    assert list(items) == expected
+
+
 def test_redirect_to_root(httpd: Httpd) -> None:
     with HttpClient() as client:
         resp = client.get(f"{httpd.prefix}/redirect/root")
@@ -354,6 +970,22 @@ def test_get_with_header_request(httpd: Httpd) -> None:
         assert data == b'{"status":true}'
 
 
+def test_get_with_request_headers(httpd: Httpd) -> None:
+    headers = RequestHeaders({"X-Gufo-HTTP": b"TEST"})
+    with HttpClient(headers={"X-Gufo-HTTP": b"FAIL"}) as client:
+        for _ in range(3):
+            resp = client.get(f"{httpd.prefix}/headers/check", headers=headers)
+            assert resp.status == 200
+
+
+def test_batch_request_headers(httpd: Httpd) -> None:
+    headers = RequestHeaders({"X-Gufo-HTTP": b"TEST"})
+    url = f"{httpd.prefix}/headers/check"
+    with HttpClient() as client:
+        r = client.batch([(RequestMethod.GET, url, headers, None)] * 3)
+        assert all(resp.status == 200 for resp in r)
+
+
 @pytest.mark.parametrize("compression", [None, GZIP])
 def test_compression(httpd: Httpd, compression: Optional[int]) -> None:
     with HttpClient(compression=compression) as client:
@@ -375,6 +1007,16 @@ def test_request_timeout(httpd_blackhole: BlackholeHttpd) -> None:
         client.get(f"{httpd_blackhole.prefix}/")
 
 
+def test_request_timeout_override(
+    httpd: Httpd, httpd_blackhole: BlackholeHttpd
+) -> None:
+    with HttpClient(timeout=0.001) as client:
+        resp = client.get(f"{httpd.prefix}/", timeout=10.0)
+        assert resp.status == 200
+    with HttpClient() as client, pytest.raises(TimeoutError):
+        client.get(f"{httpd_blackhole.prefix}/", timeout=1.0)
+
+
 def test_default_user_agent(httpd: Httpd) -> None:
     with HttpClient() as client:
         resp = client.get(f"{httpd.prefix}/ua/default")
@@ -428,6 +1070,111 @@ def test_tls_get(httpd_tls: Httpd) -> None:
         assert b"</html>" in data
 
 
+@pytest.mark.parametrize(
+    ("settings", "expected"),
+    [
+        ({}, {"handshakes": 3, "offered": 2}),
+        ({"tls_session_tickets": False}, {"handshakes": 3, "offered": 2}),
+        ({"tls_session_cache_size": 0}, {"handshakes": 3, "offered": 0}),
+    ],
+)
+def test_tls_session_resumption(
+    httpd_tls: Httpd, settings: Dict[str, Any], expected: Dict[str, int]
+) -> None:
+    # New connection for each request
+    with HttpClient(
+        validate_cert=False, pool_max_idle_per_host=0, **settings
+    ) as client:
+        assert client.tls_stats() == {"handshakes": 0, "offered": 0}
+        for _ in range(3):
+            resp = client.get(f"{httpd_tls.prefix}/")
+            assert resp.status == 200
+        assert client.tls_stats() == expected
+
+
+def test_tls_config_shared(httpd_tls: Httpd) -> None:
+    config = TlsConfig(min_version="1.3")
+    for _ in range(2):
+        with HttpClient(validate_cert=False, tls_config=config) as client:
+            resp = client.get(f"{httpd_tls.prefix}/")
+            assert resp.status == 200
+
+
+def test_tls_ca_certs(httpd_tls: Httpd) -> None:
+    with HttpClient(ca_certs=httpd_tls.ca_cert) as client:
+        resp = client.get(f"{httpd_tls.prefix}/")
+        assert resp.status == 200
+
+
+def test_tls_client_cert(httpd_mtls: Httpd) -> None:
+    with HttpClient(
+        ca_certs=httpd_mtls.ca_cert,
+        client_cert=httpd_mtls.client_cert,
+        client_key=httpd_mtls.client_key,
+    ) as client:
+        resp = client.get(f"{httpd_mtls.prefix}/")
+        assert resp.status == 200
+
+
+def test_tls_client_cert_missing(httpd_mtls: Httpd) -> None:
+    with HttpClient(ca_certs=httpd_mtls.ca_cert) as client:
+        resp = client.get(f"{httpd_mtls.prefix}/")
+        # No required SSL certificate was sent
+        assert resp.status == 400
+
+
+def test_tls_ca_certs_untrusted(httpd_tls: Httpd, tls_cert: Tuple[Path, Path]) -> None:
+    # Server's certificate is not signed by custom CA
+    client = HttpClient(ca_certs=tls_cert[0])
+    with client, pytest.raises(ConnectionError):
+        client.get(f"{httpd_tls.prefix}/")
+
+
+@pytest.mark.parametrize(
+    "settings",
+    [
+        {"http2_prior_knowledge": True},
+        {"http2_adaptive_window": True},
+        {
+            "http2_initial_stream_window_size": 1 << 20,
+            "http2_initial_connection_window_size": 1 << 22,
+            "http2_max_frame_size": 1 << 15,
+        },
+    ],
+)
+def test_http2(httpd_tls: Httpd, settings: Dict[str, Any]) -> None:
+    with HttpClient(validate_cert=False, **settings) as client:
+        for _ in range(3):
+            resp = client.get(f"{httpd_tls.prefix}/")
+            assert resp.status == 200
+
+
+@pytest.mark.parametrize(
+    "settings",
+    [
+        {"http2_initial_stream_window_size": 1 << 31},
+        {"http2_initial_connection_window_size": 1 << 31},
+        {"http2_max_frame_size": 1 << 13},
+        {"http2_max_frame_size": 1 << 24},
+    ],
+)
+def test_http2_invalid(settings: Dict[str, Any]) -> None:
+    with pytest.raises(ValueError):
+        HttpClient(**settings)
+
+
+@pytest.mark.skipif(HTTP3, reason="HTTP/3 support is compiled in")
+def test_http3_unavailable() -> None:
+    with pytest.raises(ValueError):
+        HttpClient(http3=True)
+
+
+@pytest.mark.skipif(not HTTP3, reason="HTTP/3 support is not compiled in")
+def test_http3_prior_knowledge_conflict() -> None:
+    with pytest.raises(ValueError):
+        HttpClient(http3=True, http2_prior_knowledge=True)
+
+
 @pytest.mark.parametrize(
     "proxy",
     [1, "x", [1], [Proxy("http://127.0.0.1:3128"), BasicAuth("test", None)]],
@@ -0,0 +1,63 @@
+# ---------------------------------------------------------------------
+# Gufo HTTP: TlsConfig tests
+# ---------------------------------------------------------------------
+# Copyright (C) 2025, Gufo Labs
+# See LICENSE.md for details
+# ---------------------------------------------------------------------
+
+# Python modules
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Type
+
+# Third-party modules
+import pytest
+
+# Gufo HTTP modules
+from gufo.http import TlsConfig
+
+
+def test_tls_config_default() -> None:
+    TlsConfig()
+
+
+@pytest.mark.parametrize("min_version", [None, "1.2", "1.3"])
+def test_tls_config(tls_cert: Tuple[Path, Path], min_version: Optional[str]) -> None:
+    cert, key = tls_cert
+    TlsConfig(ca_certs=cert, client_cert=cert, client_key=key, min_version=min_version)
+
+
+def test_tls_config_str_path(tls_cert: Tuple[Path, Path]) -> None:
+    cert, key = tls_cert
+    TlsConfig(ca_certs=str(cert), client_cert=str(cert), client_key=str(key))
+
+
+@pytest.mark.parametrize(
+    ("args", "exc"),
+    [
+        ({"ca_certs": "missing.pem"}, OSError),
+        ({"ca_certs": "empty.pem"}, ValueError),
+        ({"ca_certs": "key.pem"}, ValueError),
+        ({"client_cert": "cert.pem"}, ValueError),
+        ({"client_key": "key.pem"}, ValueError),
+        ({"client_cert": "cert.pem", "client_key": "cert.pem"}, ValueError),
+        ({"client_cert": "empty.pem", "client_key": "key.pem"}, ValueError),
+        ({"min_version": "1.1"}, ValueError),
+    ],
+)
+def test_tls_config_invalid(
+    tls_cert: Tuple[Path, Path],
+    tmp_path: Path,
+    args: Dict[str, Any],
+    exc: Type[BaseException],
+) -> None:
+    cert, key = tls_cert
+    files = {
+        "cert.pem": cert,
+        "key.pem": key,
+        "empty.pem": tmp_path / "empty.pem",
+        "missing.pem": tmp_path / "missing.pem",
+    }
+    files["empty.pem"].write_text("")
+    args = {k: files[v] if k != "min_version" else v for k, v in args.items()}
+    with pytest.raises(exc):
+        TlsConfig(**args)
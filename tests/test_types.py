@@ -6,13 +6,13 @@
 # ---------------------------------------------------------------------
 
 # Python modules
-from typing import Optional
+from typing import Any, Dict, List, Optional, Type
 
 # Third-party modules
 import pytest
 
 # Gufo HTTP modules
-from gufo.http import Proxy, RequestMethod
+from gufo.http import JsonBody, Proxy, RequestHeaders, RequestMethod
 
 
 @pytest.mark.parametrize(
@@ -56,3 +56,83 @@ def _test_invalid_method() -> None:
 def test_proxy_invalid_scheme() -> None:
     with pytest.raises(ValueError):
         Proxy("httpz://127.0.0.1:3128/")
+
+
+def test_request_headers() -> None:
+    headers = RequestHeaders({"X-Gufo-HTTP": b"TEST", "Accept": b"*/*"})
+    assert len(headers) == 2
+
+
+def test_request_headers_len_case() -> None:
+    headers = RequestHeaders({"Accept": b"*/*", "accept": b"text/plain"})
+    assert len(headers) == 1
+
+
+@pytest.mark.parametrize(
+    ("headers", "exc"),
+    [
+        ({"X Gufo": b"TEST"}, ValueError),
+        ({"X-Gufo-HTTP": b"TE\nST"}, ValueError),
+        ({"X-Gufo-HTTP": "TEST"}, TypeError),
+        ({1: b"TEST"}, TypeError),
+    ],
+)
+def test_request_headers_invalid(
+    headers: Dict[Any, Any], exc: Type[BaseException]
+) -> None:
+    with pytest.raises(exc):
+        RequestHeaders(headers)
+
+
+@pytest.mark.parametrize(
+    ("obj", "expected"),
+    [
+        (None, b"null"),
+        (True, b"true"),
+        (False, b"false"),
+        (1, b"1"),
+        (-1, b"-1"),
+        (2**64, b"18446744073709551616"),
+        (-(2**64), b"-18446744073709551616"),
+        (1.5, b"1.5"),
+        ("text", b'"text"'),
+        ('"\n', b'"\\"\\n"'),
+        ("\u00fc", '"\u00fc"'.encode()),
+        ([], b"[]"),
+        ([1, (2, "3")], b'[1,[2,"3"]]'),
+        ({}, b"{}"),
+        ({"b": {"a": [None]}, "a": 1}, b'{"b":{"a":[null]},"a":1}'),
+    ],
+)
+def test_json_body(obj: Any, expected: bytes) -> None:
+    body = JsonBody(obj)
+    assert bytes(body) == expected
+    assert len(body) == len(expected)
+
+
+def _nested(depth: int) -> List[Any]:
+    r: List[Any] = []
+    for _ in range(depth):
+        r = [r]
+    return r
+
+
+def test_json_body_nested() -> None:
+    JsonBody(_nested(100))
+    with pytest.raises(ValueError):
+        JsonBody(_nested(1000))
+
+
+@pytest.mark.parametrize(
+    ("obj", "exc"),
+    [
+        ({1: 2}, TypeError),
+        (b"bytes", TypeError),
+        ({"x": object()}, TypeError),
+        (float("nan"), ValueError),
+        (float("inf"), ValueError),
+    ],
+)
+def test_json_body_invalid(obj: Any, exc: Type[BaseException]) -> None:
+    with pytest.raises(exc):
+        JsonBody(obj)
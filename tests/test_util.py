@@ -6,13 +6,14 @@
 # ---------------------------------------------------------------------
 
 # Python modules
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 
 # Third-party modules
 import pytest
 
 # Gufo HTTP modules
-from gufo.http.util import merge_dict
+from gufo.http import JsonBody
+from gufo.http.util import NO_JSON, merge_dict, to_body, to_ns
 
 
 @pytest.mark.parametrize(
@@ -35,3 +36,34 @@ def test_merge_dict(
 ) -> None:
     r = merge_dict(x, y)
     assert r == expected
+
+
+@pytest.mark.parametrize(
+    ("seconds", "expected"),
+    [(None, None), (0, 0), (1, 1_000_000_000), (0.2, 200_000_000)],
+)
+def test_to_ns(seconds: Optional[float], expected: Optional[int]) -> None:
+    assert to_ns(seconds) == expected
+
+
+@pytest.mark.parametrize("body", [None, b"TEST"])
+def test_to_body(body: Optional[bytes]) -> None:
+    assert to_body(body) is body
+    assert to_body(body, NO_JSON) is body
+
+
+@pytest.mark.parametrize("json", [{"x": 1}, [], 0, "", None])
+def test_to_body_json(json: Any) -> None:
+    r = to_body(None, json)
+    assert isinstance(r, JsonBody)
+
+
+def test_to_body_json_null() -> None:
+    r = to_body(None, None)
+    assert isinstance(r, JsonBody)
+    assert bytes(r) == b"null"
+
+
+def test_to_body_both() -> None:
+    with pytest.raises(ValueError):
+        to_body(b"TEST", {"x": 1})
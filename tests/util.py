@@ -15,6 +15,8 @@ HTTPD_ADDRESS = "127.0.0.1"
 UNROUTABLE_URL = "http://192.0.2.1/"
 UNROUTABLE_PROXY = "http://192.0.2.1:3128/"
 TEXT_PLAIN = "text/plain"
+INVALID_PATH = "/tmpxxxxxx/yyyyy/zzzzzz"  # noqa: S108
+JSON_DATA = {"z": [1, -2, 1.5, "a"], "a": {"t": True, "n": None}}
 
 
 @contextlib.contextmanager